@@ -1,49 +1,144 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Blueprint, Flask, Response, current_app, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
-from models import db, Job, User
+from models import db, Job, User, ensure_schema
 from config import Config
-from resume_parser import parse_resume
-from csv_importer import import_jobs_from_csv, get_import_status
-from core_logic import get_job_recommendations, initialize_vectorstore_from_db, get_vectorstore
-import os
+from resume_parser import parse_resume, get_parse_cache_stats
+from csv_importer import import_jobs_from_csv, get_import_status, ensure_job_skills, ensure_job_fields
+from core_logic import get_job_recommendations, get_job_recommendations_batch, get_vectorstore, get_embeddings, get_lexical_index, get_skill_index, vectorstore_loaded, after_fork, get_embedding_cache_stats, get_recommendation_cache_stats, load_jobs_by_ids, find_jobs_by_skills, RETRIEVAL_MODES, SKILL_MATCH_MODES
+from search_index import ensure_search_index, search_jobs as search_job_ids
 import json
-from werkzeug.utils import secure_filename
+import math
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from task_queue import TaskQueue, QueueFullError, TERMINAL_STATUSES
+from summary_service import get_summary_service
+from upload_store import get_upload_store
+from warmup import WarmUp
 
-app = Flask(__name__)
-app.config.from_object(Config)
-CORS(app, resources={r"/api/*": {"origins": "*"}})
+api = Blueprint('api', __name__)
 
-db.init_app(app)
+# Set up by create_app()
+task_queue = None
+upload_store = None
+warm_up = None
 
-with app.app_context():
-    db.create_all()
-    # Check if jobs exist, if not, import from CSV
-    if get_import_status() == 0:
-        print("No jobs found in database, importing from CSV...")
-        import_jobs_from_csv()
-    else:
-        print(f"{get_import_status()} jobs already in database.")
-    
-    # Initialize the vector store on app startup
-    initialize_vectorstore_from_db()
-    print("Application context initialized.")
+# Whether this process has made sure the jobs table is populated (see ensure_catalog)
+_catalog_checked = False
+_catalog_lock = threading.Lock()
+
+# Endpoints that don't need the catalog, so never wait for its import
+CATALOG_EXEMPT_ENDPOINTS = {'api.index', 'api.readiness', 'api.admin_import_jobs'}
 
 def allowed_file(filename):
     return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+           filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
+
+def is_truthy(value):
+    return str(value).lower() in ('1', 'true', 'yes')
+
+def invalid_choice_response(name, value, choices):
+    """400 response for a parameter outside its allowed values, or None if it is fine"""
+    if value and value not in choices:
+        return jsonify({'success': False, 'error': f"{name} must be one of {', '.join(choices)}"}), 400
+    return None
+
+def parse_list(value):
+    """Values of a comma-separated string or a JSON list"""
+    items = value if isinstance(value, list) else str(value or '').split(',')
+    return [str(item).strip() for item in items if str(item).strip()]
 
-@app.route('/')
+def get_top_n(body=None):
+    """top_n of a recommendation request (default 10), clamped to 1..RECOMMEND_MAX_TOP_N"""
+    value = request.values.get('top_n', (body or {}).get('top_n'))
+    try:
+        top_n = int(value) if value not in (None, '') else 10
+    except (TypeError, ValueError):
+        top_n = 10
+    return min(max(1, top_n), current_app.config['RECOMMEND_MAX_TOP_N'])
+
+def get_filters(body=None):
+    """
+    Retrieval mode, skill filter and job filters of a recommendation request.
+
+    Job filters: location (comma-separated, any of), min_stipend,
+    min_duration and max_duration (months).
+
+    Returns:
+        (filters dict, None) or (None, 400 response)
+    """
+    body = body or {}
+    
+    def value(name):
+        return request.values.get(name, body.get(name))
+    
+    job_filters = {'locations': parse_list(value('location'))}
+    for name in ('min_stipend', 'min_duration', 'max_duration'):
+        if value(name) in (None, ''):
+            continue
+        try:
+            job_filters[name] = float(value(name))
+        except (TypeError, ValueError):
+            job_filters[name] = math.nan
+        # nan and inf parse as floats but would make every comparison fail
+        if not math.isfinite(job_filters[name]):
+            return None, (jsonify({'success': False, 'error': f'{name} must be a number'}), 400)
+    
+    filters = {
+        'mode': value('mode'),
+        'skills': parse_list(value('skills')),
+        'skill_match': value('skill_match') or 'any',
+        'filters': job_filters
+    }
+    invalid = (
+        invalid_choice_response('mode', filters['mode'], RETRIEVAL_MODES) or
+        invalid_choice_response('skill_match', filters['skill_match'], SKILL_MATCH_MODES)
+    )
+    if invalid:
+        return None, invalid
+    return filters, None
+
+def process_resume_task(app, payload, timings):
+    """Task queue handler: parse an uploaded resume and match it against jobs"""
+    parsed_resume_data = {"error": "Resume parsing failed"}
+    try:
+        parsed_resume_data = parse_resume(payload['filepath'], timings=timings)
+    finally:
+        # The queue needs the upload on disk until the task runs; after that
+        # it is kept or removed according to the upload policy
+        failed = "error" in parsed_resume_data
+        upload_store.finish(payload['filepath'], None if failed else parsed_resume_data)
+    if "error" in parsed_resume_data:
+        return {'error': parsed_resume_data["error"]}
+    
+    started = time.perf_counter()
+    with app.app_context():
+        ensure_catalog()
+        recommendations = get_job_recommendations(
+            parsed_resume_data,
+            top_n=payload['top_n'],
+            include_description=payload['include_description'],
+            **payload.get('filters', {})
+        )
+    timings['search_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    if isinstance(recommendations, dict):
+        return recommendations
+    
+    return {'parsed_resume': parsed_resume_data, 'recommendations': recommendations}
+
+@api.route('/')
 def index():
     return jsonify({"message": "Welcome to the Job Recommender API!"})
 
-@app.route('/api/jobs', methods=['GET'])
+@api.route('/api/jobs', methods=['GET'])
 def get_jobs():
     """Get all jobs with pagination"""
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
         
-        pagination = Job.query.paginate(page=page, per_page=per_page, error_out=False)
+        pagination = Job.active().paginate(page=page, per_page=per_page, error_out=False)
         
         jobs = [job.to_dict() for job in pagination.items]
         
@@ -57,40 +152,99 @@ def get_jobs():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/jobs/<int:job_id>', methods=['GET'])
+@api.route('/api/jobs/<int:job_id>', methods=['GET'])
 def get_job(job_id):
     """Get specific job by ID"""
     try:
         job = Job.query.get(job_id)
-        if not job:
+        if not job or not job.is_active:
             return jsonify({'success': False, 'error': 'Job not found'}), 404
         
         return jsonify({'success': True, 'job': job.to_dict()})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/jobs/search', methods=['GET'])
+@api.route('/api/jobs/search', methods=['GET'])
 def search_jobs():
-    """Search jobs by title, company, or skills"""
+    """Full-text search over job titles, companies and skills, ranked by relevance"""
     try:
         query = request.args.get('q', '', type=str)
         
         if not query:
             return jsonify({'success': False, 'error': 'Search query required'}), 400
         
-        jobs = Job.query.filter(
-            db.or_(
-                Job.internship_title.ilike(f'%{query}%'),
-                Job.company_name.ilike(f'%{query}%'),
-                Job.required_skills.ilike(f'%{query}%')
-            )
-        ).all()
+        page = max(1, request.args.get('page', 1, type=int))
+        per_page = min(max(1, request.args.get('per_page', 20, type=int)), current_app.config['SEARCH_MAX_PER_PAGE'])
+        include_description = is_truthy(request.args.get('include_description', 'false'))
+        
+        # Results beyond SEARCH_MAX_RESULTS are never returned
+        offset = (page - 1) * per_page
+        limit = min(per_page, current_app.config['SEARCH_MAX_RESULTS'] - offset)
+        if limit <= 0:
+            return jsonify({'success': True, 'jobs': [], 'page': page, 'per_page': per_page, 'has_more': False})
+        
+        # Fetch one extra id to know whether another page exists
+        job_ids = search_job_ids(query, limit + 1, offset)
+        has_more = len(job_ids) > limit and offset + limit < current_app.config['SEARCH_MAX_RESULTS']
+        job_ids = job_ids[:limit]
+        
+        jobs_by_id = load_jobs_by_ids(job_ids, include_description=include_description)
+        jobs = [jobs_by_id[job_id] for job_id in job_ids if job_id in jobs_by_id]
+        
+        return jsonify({
+            'success': True,
+            'jobs': jobs,
+            'page': page,
+            'per_page': per_page,
+            'has_more': has_more
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@api.route('/api/jobs/by-skills', methods=['GET'])
+def jobs_by_skills():
+    """Jobs requiring any/all of the given skills, ranked by skill overlap"""
+    try:
+        skills = parse_list(request.args.get('skills'))
+        if not skills:
+            return jsonify({'success': False, 'error': 'skills required'}), 400
+        
+        match = request.args.get('match', 'any')
+        invalid = invalid_choice_response('match', match, SKILL_MATCH_MODES)
+        if invalid:
+            return invalid
+        
+        page = max(1, request.args.get('page', 1, type=int))
+        per_page = min(max(1, request.args.get('per_page', 20, type=int)), current_app.config['SEARCH_MAX_PER_PAGE'])
+        include_description = is_truthy(request.args.get('include_description', 'false'))
         
-        return jsonify({'success': True, 'jobs': [job.to_dict() for job in jobs]})
+        ranked = find_jobs_by_skills(skills, match)
+        offset = (page - 1) * per_page
+        page_hits = ranked[offset:offset + per_page]
+        
+        jobs_by_id = load_jobs_by_ids([job_id for job_id, _, _ in page_hits], include_description=include_description)
+        jobs = []
+        for job_id, matched, coverage in page_hits:
+            if job_id not in jobs_by_id:
+                continue
+            job = dict(jobs_by_id[job_id])
+            job['matched_skills'] = matched
+            job['skill_overlap'] = round(matched / len(skills), 4)
+            job['skill_coverage'] = round(coverage, 4)
+            jobs.append(job)
+        
+        return jsonify({
+            'success': True,
+            'jobs': jobs,
+            'total': len(ranked),
+            'page': page,
+            'per_page': per_page,
+            'has_more': offset + per_page < len(ranked)
+        })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/recommend', methods=['POST'])
+@api.route('/api/recommend', methods=['POST'])
 def recommend_jobs():
     """Upload resume, parse it, and get job recommendations"""
     try:
@@ -102,21 +256,23 @@ def recommend_jobs():
         if file.filename == '':
             return jsonify({'success': False, 'error': 'No selected file'}), 400
         
+        filters, invalid = get_filters()
+        if invalid:
+            return invalid
+        
         if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            
-            print(f"Resume saved to {filepath}")
-            
-            # Parse resume
-            parsed_resume_data = parse_resume(filepath)
+            # Parse straight from memory; persisting the upload happens off the request path
+            data = file.read()
+            parsed_resume_data = parse_resume(data, filename=file.filename)
             
             if "error" in parsed_resume_data:
+                upload_store.save(file.filename, data)
                 return jsonify({'success': False, 'error': parsed_resume_data["error"]}), 500
+            upload_store.save(file.filename, data, parsed_resume_data)
             
             # Get recommendations
-            recommendations = get_job_recommendations(parsed_resume_data)
+            include_description = is_truthy(request.values.get('include_description', 'false'))
+            recommendations = get_job_recommendations(parsed_resume_data, top_n=get_top_n(), include_description=include_description, **filters)
             
             return jsonify({
                 'success': True,
@@ -130,7 +286,164 @@ def recommend_jobs():
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/user/profile', methods=['GET', 'POST'])
+@api.route('/api/recommend/batch', methods=['POST'])
+def recommend_jobs_batch():
+    """
+    Get recommendations for many resumes in one request.
+
+    Accepts uploaded files under 'resumes' and/or a JSON body
+    {"profiles": [...parsed resumes...]}. Results are streamed back as
+    newline-delimited JSON, one object per resume, as soon as that resume
+    is ranked: profiles first, then uploads as they finish parsing (those
+    finishing together are ranked in one batch).
+    """
+    files = request.files.getlist('resumes')
+    body = request.get_json(silent=True) or {}
+    profiles = body.get('profiles') or []
+    top_n = get_top_n(body)
+    include_description = is_truthy(request.values.get('include_description', body.get('include_description', 'false')))
+    filters, invalid = get_filters(body)
+    if invalid:
+        return invalid
+    
+    if not files and not profiles:
+        return jsonify({'success': False, 'error': 'No resumes or profiles provided'}), 400
+    if len(files) + len(profiles) > current_app.config['MAX_BATCH_RESUMES']:
+        return jsonify({'success': False, 'error': f"At most {current_app.config['MAX_BATCH_RESUMES']} resumes per batch"}), 400
+    
+    # Read uploads now; the request stream is not available once the response starts
+    uploads = []
+    for file in files:
+        if not file.filename or not allowed_file(file.filename):
+            uploads.append((file.filename, None))
+            continue
+        uploads.append((file.filename, file.read()))
+    
+    def ranked(items):
+        results = get_job_recommendations_batch(
+            [item['parsed_resume'] for item in items],
+            top_n=top_n,
+            include_description=include_description,
+            **filters
+        )
+        for i, item in enumerate(items):
+            if isinstance(results, dict):
+                item.update({'success': False, 'error': results['error']})
+            else:
+                item.update({'success': True, 'recommendations': results[i]})
+            yield json.dumps(item) + '\n'
+    
+    def generate():
+        if profiles:
+            yield from ranked([{'index': i, 'parsed_resume': p} for i, p in enumerate(profiles)])
+        
+        # Parse uploads concurrently; every round ranks the resumes parsed so far
+        offset = len(profiles)
+        with ThreadPoolExecutor(max_workers=current_app.config['BATCH_PARSE_WORKERS']) as pool:
+            futures = {}
+            for i, (filename, data) in enumerate(uploads):
+                if data is None:
+                    yield json.dumps({'index': offset + i, 'filename': filename, 'success': False, 'error': 'Invalid file type'}) + '\n'
+                    continue
+                futures[pool.submit(parse_resume, data, filename=filename)] = (offset + i, filename, data)
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                items = []
+                for future in done:
+                    index, filename, data = futures[future]
+                    try:
+                        parsed = future.result()
+                    except Exception as e:
+                        parsed = {'error': str(e)}
+                    upload_store.save(filename, data, None if 'error' in parsed else parsed)
+                    if 'error' in parsed:
+                        yield json.dumps({'index': index, 'filename': filename, 'success': False, 'error': parsed['error']}) + '\n'
+                    else:
+                        items.append({'index': index, 'filename': filename, 'parsed_resume': parsed})
+                if items:
+                    yield from ranked(items)
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@api.route('/api/recommend/async', methods=['POST'])
+def recommend_jobs_async():
+    """Upload a resume and queue it for processing; returns a task id immediately"""
+    try:
+        if 'resume' not in request.files:
+            return jsonify({'success': False, 'error': 'No resume file part'}), 400
+        
+        file = request.files['resume']
+        
+        if file.filename == '':
+            return jsonify({'success': False, 'error': 'No selected file'}), 400
+        if not allowed_file(file.filename):
+            return jsonify({'success': False, 'error': 'Invalid file type'}), 400
+        filters, invalid = get_filters()
+        if invalid:
+            return invalid
+        
+        # Refuse before touching the disk when the queue is already full
+        if task_queue.pending_count() >= task_queue.max_pending:
+            raise QueueFullError("Task queue is full")
+        
+        # The durable queue outlives the request, so this upload does go to disk
+        filepath = upload_store.new_path(file.filename)
+        file.save(filepath)
+        
+        task_id = task_queue.submit({
+            'filepath': filepath,
+            'top_n': get_top_n(),
+            'include_description': is_truthy(request.values.get('include_description', 'false')),
+            'filters': filters
+        })
+        return jsonify({
+            'success': True,
+            'task_id': task_id,
+            'status_url': f'/api/tasks/{task_id}'
+        }), 202
+    except QueueFullError as e:
+        response = jsonify({'success': False, 'error': str(e)})
+        response.headers['Retry-After'] = '5'
+        return response, 429
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@api.route('/api/tasks/<task_id>', methods=['GET'])
+def get_task(task_id):
+    """Task status and result; ?wait=N long-polls up to N seconds for completion"""
+    wait = min(request.args.get('wait', 0, type=float), current_app.config['TASK_MAX_WAIT_SECONDS'])
+    task = task_queue.wait(task_id, wait) if wait > 0 else task_queue.get(task_id)
+    if task is None:
+        return jsonify({'success': False, 'error': 'Task not found'}), 404
+    return jsonify({'success': True, 'task': task})
+
+@api.route('/api/tasks/<task_id>/events', methods=['GET'])
+def stream_task(task_id):
+    """Server-sent events with the task status until it finishes"""
+    if task_queue.get(task_id) is None:
+        return jsonify({'success': False, 'error': 'Task not found'}), 404
+    
+    max_wait = current_app.config['TASK_MAX_WAIT_SECONDS']
+    
+    def generate():
+        last_status = None
+        deadline = time.monotonic() + max_wait
+        while True:
+            task = task_queue.wait(task_id, 1.0)
+            if task is None:
+                # Purged by the retention clean-up while the stream was open
+                yield f"event: gone\ndata: {json.dumps({'task_id': task_id, 'status': 'gone'})}\n\n"
+                return
+            if task['status'] != last_status or task['status'] in TERMINAL_STATUSES:
+                last_status = task['status']
+                yield f"data: {json.dumps(task)}\n\n"
+            if task['status'] in TERMINAL_STATUSES or time.monotonic() >= deadline:
+                return
+    
+    return Response(generate(), mimetype='text/event-stream')
+
+@api.route('/api/user/profile', methods=['GET', 'POST'])
 def user_profile():
     """Get or update user profile"""
     try:
@@ -180,7 +493,7 @@ def user_profile():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/stats', methods=['GET'])
+@api.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get application statistics"""
     try:
@@ -191,23 +504,156 @@ def get_stats():
             'success': True,
             'stats': {
                 'total_jobs': job_count,
-                'total_users': user_count
+                'total_users': user_count,
+                'embedding_cache': get_embedding_cache_stats(),
+                'parse_cache': get_parse_cache_stats(),
+                'recommendation_cache': get_recommendation_cache_stats(),
+                'ai_summary': get_summary_service().stats(),
+                'uploads': upload_store.stats()
             }
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/admin/import-jobs', methods=['POST'])
+@api.route('/api/admin/import-jobs', methods=['POST'])
 def admin_import_jobs():
-    """Manually trigger CSV job import"""
+    """Manually trigger CSV job import (?mode=incremental|replace)"""
     try:
-        result = import_jobs_from_csv()
+        mode = request.args.get('mode')
+        if mode not in (None, 'incremental', 'replace'):
+            return jsonify({'success': False, 'error': 'mode must be incremental or replace'}), 400
+        result = import_jobs_from_csv(mode=mode)
         if result:
-            return jsonify({'success': True, 'message': 'Jobs imported successfully and vector store reinitialized'})
+            report = {k: v for k, v in result.items() if not k.endswith('_ids')}
+            report['changed'] = len(result['changed_ids'])
+            report['removed'] = len(result['removed_ids'])
+            if result['warnings']:
+                message = 'Jobs imported successfully; the vector store update failed and is retried on next use'
+            else:
+                message = 'Jobs imported successfully and vector store updated'
+            return jsonify({'success': True, 'message': message, 'report': report})
         else:
             return jsonify({'success': False, 'error': 'Failed to import jobs from CSV'}), 500
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@api.route('/api/ready', methods=['GET'])
+def readiness():
+    """Readiness probe: 200 once the catalog, model and indexes are loaded, 503 until then"""
+    if warm_up is not None:
+        status = warm_up.status()
+        ready = warm_up.ready
+    else:
+        ready = vectorstore_loaded()
+        status = {'status': 'ready' if ready else 'lazy'}
+    return jsonify({'success': True, 'ready': ready, **status}), 200 if ready else 503
+
+def ensure_catalog():
+    """
+    Import the jobs CSV into an empty database, once per process.
+
+    Run by the warm-up, or else by the first request (or task) that needs
+    the catalog; concurrent callers wait for the import. A failed import is
+    not retried automatically, use /api/admin/import-jobs.
+    """
+    global _catalog_checked
+    if _catalog_checked:
+        return
+    with _catalog_lock:
+        if _catalog_checked:
+            return
+        job_count = get_import_status()
+        if job_count == 0:
+            print("No jobs found in database, importing from CSV...")
+            import_jobs_from_csv()
+        else:
+            print(f"{job_count} jobs already in database.")
+        _catalog_checked = True
+
+@api.before_app_request
+def load_catalog_on_first_use():
+    if request.endpoint not in CATALOG_EXEMPT_ENDPOINTS:
+        ensure_catalog()
+
+def create_app(config_class=Config, warm_up_on_start=None, prefork=False):
+    """
+    Application factory.
+
+    Only cheap set-up happens here (config, tables, backfills of derived
+    job columns, task queue); the catalog import of an empty database, the
+    embedding model and the indexes are loaded by a background warm-up (see
+    WARM_UP_ON_START) or lazily by the first request that needs them.
+
+    prefork=True is for a server that loads the app once and forks workers
+    from it (gunicorn.conf.py): the warm-up always runs, in the calling
+    thread, so workers inherit the loaded model and indexes, and threads
+    and connections are only started per worker by init_worker().
+    """
+    global task_queue, upload_store, warm_up, _catalog_checked
+    
+    app = Flask(__name__)
+    app.config.from_object(config_class)
+    CORS(app, resources={r"/api/*": {"origins": "*"}})
+    
+    db.init_app(app)
+    app.register_blueprint(api)
+    
+    with app.app_context():
+        db.create_all()
+        ensure_schema()
+        ensure_search_index()
+        # Derived job tables/columns missing from databases created by older versions
+        ensure_job_skills()
+        ensure_job_fields()
+    
+    task_queue = TaskQueue(
+        app.config['TASK_DB_PATH'],
+        partial(process_resume_task, app),
+        workers=app.config['TASK_WORKERS'],
+        max_pending=app.config['TASK_MAX_PENDING']
+    )
+    task_queue.purge(app.config['TASK_RETENTION_HOURS'] * 3600)
+    if prefork:
+        task_queue.requeue_interrupted()
+    else:
+        task_queue.start()
+    
+    upload_store = get_upload_store()
+    # Uploads of queued or running tasks are still needed, however old
+    upload_store.in_use = lambda: {payload['filepath'] for payload in task_queue.pending_payloads()}
+    upload_store.purge()
+    
+    _catalog_checked = False
+    if warm_up_on_start is None:
+        warm_up_on_start = app.config['WARM_UP_ON_START']
+    warm_up = None
+    if warm_up_on_start or prefork:
+        warm_up = WarmUp(app, [
+            ('catalog', ensure_catalog),
+            ('embedding_model', get_embeddings),
+            ('vector_index', get_vectorstore),
+            ('lexical_index', get_lexical_index),
+            ('skill_index', get_skill_index),
+        ])
+        warm_up.start(background=not prefork)
+    
+    print("Application created.")
+    return app
+
+def init_worker(app):
+    """
+    Per-process set-up of a worker forked from a create_app(prefork=True) process.
+
+    Database connections, the embedding cache connection and the task
+    queue threads of the parent must not be used across the fork, so they
+    are recreated here; everything the warm-up loaded is kept.
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
+    after_fork()
+    task_queue.after_fork()
+    # Also re-queues the tasks of a worker that died; live workers' tasks are left alone
+    task_queue.start()
+
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    create_app().run(debug=True)
\ No newline at end of file
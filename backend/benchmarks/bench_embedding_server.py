@@ -0,0 +1,82 @@
+"""
+Query embedding under concurrent load: in-process model vs the micro-batching embedding server.
+
+    python benchmarks/bench_embedding_server.py [--concurrency 1 8 32] [--requests 256]
+                                                [--max-batch-size 64] [--max-wait-ms 5]
+
+Each request embeds one resume of the corpus, like a recommendation does on
+an embedding cache miss. "in-process" calls the model from every request
+thread; "server" sends the same requests through RemoteEmbeddings to an
+embedding server started in this process on an ephemeral port.
+"""
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import common  # noqa: F401  (sets up sys.path)
+from common import load_corpus, print_table
+
+from config import Config
+from embedding_backends import load_embedding_model
+from embedding_server import MicroBatcher, RemoteEmbeddings, create_server
+
+
+def run_load(embed_query, texts, concurrency):
+    """(requests/s, p50 ms, p95 ms) of embedding texts from `concurrency` threads"""
+    latencies = []
+
+    def one(text):
+        started = time.perf_counter()
+        embed_query(text)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, texts))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return (
+        len(texts) / elapsed,
+        statistics.median(latencies) * 1000,
+        latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="directory of .txt resumes (default: bundled sample corpus)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=256)
+    parser.add_argument("--max-batch-size", type=int, default=Config.EMBEDDING_BATCH_MAX_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=Config.EMBEDDING_BATCH_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    resumes = load_corpus(args.corpus)
+    # Distinct texts, so nothing is served from a cache along the way
+    texts = [f"{resumes[i % len(resumes)]}\n#{i}" for i in range(args.requests)]
+    model = load_embedding_model(Config.EMBEDDING_MODEL_NAME, Config.EMBEDDING_BACKEND,
+                                 Config.EMBEDDING_THREADS or None, args.max_batch_size)
+    model.embed_documents(["warm up"])
+    print(f"{Config.EMBEDDING_MODEL_NAME}, {len(texts)} requests per run\n")
+
+    rows = []
+    for concurrency in args.concurrency:
+        rps, p50, p95 = run_load(model.embed_query, texts, concurrency)
+        rows.append([concurrency, "in-process", f"{rps:.1f}", f"{p50:.1f}", f"{p95:.1f}", "1.00"])
+
+        batcher = MicroBatcher(model.embed_documents, args.max_batch_size, args.max_wait_ms)
+        server = create_server(batcher, Config.EMBEDDING_MODEL_NAME, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = RemoteEmbeddings(f"http://127.0.0.1:{server.server_address[1]}", Config.EMBEDDING_MODEL_NAME)
+        rps, p50, p95 = run_load(client.embed_query, texts, concurrency)
+        server.shutdown()
+        server.server_close()
+        rows.append([concurrency, "server", f"{rps:.1f}", f"{p50:.1f}", f"{p95:.1f}",
+                     f"{batcher.stats()['avg_batch_size']:.2f}"])
+    print_table(["concurrency", "mode", "requests/s", "p50 ms", "p95 ms", "avg batch"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Embedding inference backends: ranking parity with the torch model, latency and throughput.
+
+    python benchmarks/bench_embeddings.py [--backends torch torch-int8 onnx onnx-int8]
+                                          [--threads N] [--k 10] [--catalog CSV] [--corpus DIR]
+
+Every backend embeds the job catalog and a set of queries: the resume
+corpus plus each job's skill list. Parity compares each backend with the
+torch backend: overlap of the top-k jobs per query, agreement on the top
+job, and cosine similarity between the two vectors of the same job. Speed
+is single-query latency (one text per call, as a recommendation embeds a
+resume) and batch throughput over the catalog.
+"""
+import argparse
+import csv
+import statistics
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+import common  # noqa: F401  (sets up sys.path)
+from common import BACKEND_DIR, load_corpus, print_table
+
+from config import Config
+from core_logic import _job_document_text
+from embedding_backends import EMBEDDING_BACKENDS, load_embedding_model
+
+
+def load_catalog(path):
+    with open(path, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    return [_job_document_text(SimpleNamespace(**row)) for row in rows], [row["required_skills"] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backends", nargs="+", choices=EMBEDDING_BACKENDS, default=list(EMBEDDING_BACKENDS))
+    parser.add_argument("--threads", type=int, default=Config.EMBEDDING_THREADS or None)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--catalog", default=str(BACKEND_DIR / "data" / "jobs.csv"), help="jobs CSV")
+    parser.add_argument("--corpus", help="directory of .txt resumes (default: bundled sample corpus)")
+    parser.add_argument("--seconds", type=float, default=2.0, help="minimum time per latency measurement")
+    args = parser.parse_args()
+
+    documents, skill_lists = load_catalog(args.catalog)
+    queries = load_corpus(args.corpus) + skill_lists
+    k = min(args.k, len(documents))
+    backends = ["torch"] + [backend for backend in args.backends if backend != "torch"]
+    print(f"{Config.EMBEDDING_MODEL_NAME}: {len(documents)} jobs, {len(queries)} queries, "
+          f"threads={args.threads or 'default'}\n")
+
+    rows = []
+    baseline = None
+    for backend in backends:
+        started = time.perf_counter()
+        model = load_embedding_model(Config.EMBEDDING_MODEL_NAME, backend, args.threads)
+        load_seconds = time.perf_counter() - started
+        model.embed_documents(["warm up"])
+
+        started = time.perf_counter()
+        doc_vectors = np.asarray(model.embed_documents(documents), dtype=np.float32)
+        docs_per_second = len(documents) / (time.perf_counter() - started)
+
+        latencies = []
+        started = time.perf_counter()
+        while time.perf_counter() - started < args.seconds:
+            for query in queries:
+                call_started = time.perf_counter()
+                model.embed_query(query)
+                latencies.append(time.perf_counter() - call_started)
+        latencies.sort()
+
+        query_vectors = np.asarray([model.embed_query(query) for query in queries], dtype=np.float32)
+        top = np.argsort(-(query_vectors @ doc_vectors.T), axis=1)[:, :k]
+        if baseline is None:
+            baseline = (doc_vectors, top)
+        base_vectors, base_top = baseline
+        overlap = np.mean([len(set(a) & set(b)) / k for a, b in zip(top, base_top)])
+        top1 = np.mean(top[:, 0] == base_top[:, 0])
+        cosine = (doc_vectors * base_vectors).sum(axis=1) / (
+            np.linalg.norm(doc_vectors, axis=1) * np.linalg.norm(base_vectors, axis=1)
+        )
+        rows.append([
+            backend,
+            f"{load_seconds:.1f}",
+            f"{statistics.median(latencies) * 1000:.2f}",
+            f"{latencies[int(len(latencies) * 0.95) - 1] * 1000:.2f}",
+            f"{docs_per_second:.0f}",
+            f"{overlap:.3f}",
+            f"{top1:.3f}",
+            f"{cosine.min():.4f}",
+        ])
+    print_table(["backend", "load s", "query p50 ms", "query p95 ms", "docs/s",
+                 f"overlap@{k}", "top-1 agree", "min cos"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Resume section parser benchmark: original multi-pass parser vs the single-pass tokenizer.
+
+    python benchmarks/bench_parser.py [--corpus DIR] [--repeat 1 10]
+
+Measures sectioning plus name/education/experience/projects extraction
+(skills, contacts and the AI summary are benchmarked or cached elsewhere).
+--repeat concatenates each resume with itself to show how both parsers
+scale with document length. Both parsers must produce identical output.
+"""
+import argparse
+
+import common  # noqa: F401  (sets up sys.path)
+from common import load_corpus, print_table, time_per_call
+
+import legacy_parser
+from resume_parser import _extract_emails, _parse_structure
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="directory of .txt resumes (default: bundled sample corpus)")
+    parser.add_argument("--repeat", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--seconds", type=float, default=1.0, help="minimum time per measurement")
+    args = parser.parse_args()
+
+    resumes = load_corpus(args.corpus)
+    print(f"{len(resumes)} resumes, {sum(map(len, resumes))} characters\n")
+
+    rows = []
+    for repeat in args.repeat:
+        docs = [("\n".join([text] * repeat), None) for text in resumes]
+        docs = [(text, _extract_emails(text)) for text, _ in docs]
+        for text, emails in docs:
+            if legacy_parser.parse_structure(text, emails) != _parse_structure(text, emails):
+                raise SystemExit(f"Parsers disagree on: {text.splitlines()[0]!r}")
+
+        legacy = time_per_call(lambda doc: legacy_parser.parse_structure(*doc), docs, args.seconds)
+        current = time_per_call(lambda doc: _parse_structure(*doc), docs, args.seconds)
+        rows.append([
+            repeat,
+            f"{sum(len(text) for text, _ in docs) // len(docs)}",
+            f"{1 / legacy:.0f}",
+            f"{1 / current:.0f}",
+            f"{legacy / current:.1f}x",
+        ])
+    print_table(["repeat", "chars/doc", "legacy docs/s", "single-pass docs/s", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Skill extraction benchmark: original difflib scan vs the precompiled SkillMatcher.
+
+    python benchmarks/bench_skills.py [--corpus DIR] [--extra-skills 0 1000 5000]
+
+--extra-skills grows the master list with synthetic skill names to show
+how both implementations scale with the size of the skill list.
+"""
+import argparse
+
+import common  # noqa: F401  (sets up sys.path)
+from common import load_corpus, print_table, time_per_call
+
+import legacy_parser
+from resume_parser import SKILLS_MASTER, SKILL_ALIASES
+from skill_matcher import SkillMatcher
+
+
+def synthetic_skills(n):
+    syllables = ["ka", "zu", "mi", "tor", "flex", "quar", "dyn", "lo", "rex", "vin"]
+    names = []
+    for i in range(n):
+        a, b, c = syllables[i % 10], syllables[(i // 10) % 10], syllables[(i // 100) % 10]
+        names.append(f"{a}{b}{c}{i // 1000}")
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="directory of .txt resumes (default: bundled sample corpus)")
+    parser.add_argument("--extra-skills", type=int, nargs="+", default=[0, 1000, 5000])
+    parser.add_argument("--seconds", type=float, default=1.0, help="minimum time per measurement")
+    args = parser.parse_args()
+
+    resumes = load_corpus(args.corpus)
+    print(f"{len(resumes)} resumes, {sum(map(len, resumes))} characters\n")
+
+    rows = []
+    for extra in args.extra_skills:
+        master = SKILLS_MASTER + synthetic_skills(extra)
+        matcher = SkillMatcher(master, SKILL_ALIASES)
+        legacy = time_per_call(lambda text: legacy_parser.extract_skills(text, master), resumes, args.seconds)
+
+        def cold(text):
+            # Clear the per-token fuzzy cache so every document pays full price
+            matcher.fuzzy_match.cache_clear()
+            return matcher.extract(text)
+
+        current = time_per_call(cold, resumes, args.seconds)
+        warm = time_per_call(matcher.extract, resumes, args.seconds)
+        rows.append([
+            len(master),
+            f"{legacy * 1000:.2f}",
+            f"{current * 1000:.3f}",
+            f"{warm * 1000:.3f}",
+            f"{legacy / current:.1f}x",
+        ])
+    print_table(["skills", "legacy ms/doc", "matcher ms/doc", "warm cache ms/doc", "speedup"], rows)
+
+    print("\nSkills found per resume (legacy | matcher):")
+    matcher = SkillMatcher(SKILLS_MASTER, SKILL_ALIASES)
+    for text in resumes:
+        name = text.strip().splitlines()[0]
+        legacy, current = set(legacy_parser.extract_skills(text)), set(matcher.extract(text))
+        print(f"- {name}: {len(legacy)} | {len(current)}")
+        print(f"    only legacy: {sorted(legacy - current)}")
+        print(f"    only matcher: {sorted(current - legacy)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Startup benchmark: import time, app creation and time to first request / readiness.
+
+    python benchmarks/bench_startup.py [--runs 3] [--timeout 300]
+
+Every run is a fresh interpreter started in the backend directory, so it
+uses that directory's database, vector store and embedding cache like the
+app itself. Three start-up modes are compared:
+
+- blocking: create the app and wait for the warm-up before serving, which
+  is what importing app.py used to do
+- background: serve right away while the warm-up runs (the default)
+- lazy: no warm-up; the first request that needs the model loads it
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+import common  # noqa: F401  (sets up sys.path)
+from common import BACKEND_DIR, print_table
+
+CHILD = r"""
+import json, os, sys, time
+mode, timeout = sys.argv[1], float(sys.argv[2])
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+flask_app = app.create_app(warm_up_on_start=mode != "lazy")
+created = time.perf_counter()
+if mode == "blocking":
+    app.warm_up.wait(timeout)
+client = flask_app.test_client()
+client.get("/api/jobs?per_page=1")
+first_request = time.perf_counter()
+ready = None
+deadline = time.perf_counter() + timeout
+while mode != "lazy" and time.perf_counter() < deadline:
+    response = client.get("/api/ready")
+    if response.status_code == 200:
+        ready = time.perf_counter()
+        break
+    if (response.get_json() or {}).get("status") == "failed":
+        break
+    time.sleep(0.05)
+print("RESULT " + json.dumps({
+    "import": imported - started,
+    "create": created - imported,
+    "first_request": first_request - started,
+    "ready": ready - started if ready else None,
+}))
+sys.stdout.flush()
+os._exit(0)
+"""
+
+
+def run_once(mode, timeout):
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, mode, str(timeout)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=timeout + 60
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[len("RESULT "):])
+    raise RuntimeError(f"{mode} run failed:\n{result.stdout[-2000:]}\n{result.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=300, help="seconds to wait for readiness")
+    parser.add_argument("--modes", nargs="+", default=["blocking", "background", "lazy"],
+                        choices=["blocking", "background", "lazy"])
+    args = parser.parse_args()
+
+    def ms(values):
+        values = [v for v in values if v is not None]
+        return f"{statistics.median(values) * 1000:.0f}" if values else "-"
+
+    rows = []
+    for mode in args.modes:
+        runs = [run_once(mode, args.timeout) for _ in range(args.runs)]
+        rows.append([
+            mode,
+            ms(r["import"] for r in runs),
+            ms(r["create"] for r in runs),
+            ms(r["first_request"] for r in runs),
+            ms(r["ready"] for r in runs),
+        ])
+    print(f"median of {args.runs} runs, milliseconds since interpreter start (import/create: duration)\n")
+    print_table(["mode", "import app", "create_app", "first request", "ready"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Numpy index vector storage: float32 vs int8 / product-quantized codes with exact re-rank.
+
+    python benchmarks/bench_vector_storage.py [--jobs 100000] [--storage float32 int8 pq]
+                                              [--rerank 0 50 200] [--k 10] [--vectors FILE.npy]
+
+Builds a NumpyBackend per storage mode and reports build time, memory,
+single-query latency and recall@k against exact float32 search. "search MB"
+is what every query scans (ids, filter columns, and the float32 matrix or
+the codes), i.e. what has to stay in RAM for fast searches; "rerank KB" is
+the float32 rows a query reads back from disk for its shortlist.
+
+By default the vectors are synthetic: clusters in a low-rank subspace plus
+noise, normalized, which is closer to sentence embeddings than uniform
+random vectors. Pass --vectors with an (n, dim) .npy of real embeddings
+(e.g. vectors.npy of an index generation) to measure on those; queries are
+then held-out rows.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+import common  # noqa: F401  (sets up sys.path)
+from common import print_table
+
+from retrieval import NumpyBackend, normalize_rows
+
+
+def synthetic_embeddings(n, dim, seed=0, topics=256, rank=64):
+    # The topics and subspace are fixed, so every seed samples the same distribution
+    structure = np.random.default_rng(0)
+    projection = structure.standard_normal((rank, dim)).astype(np.float32)
+    centers = structure.standard_normal((topics, rank)).astype(np.float32)
+    rng = np.random.default_rng(seed + 1)
+    latent = centers[rng.integers(topics, size=n)] + 0.7 * rng.standard_normal((n, rank)).astype(np.float32)
+    return normalize_rows(latent @ projection + 0.5 * rng.standard_normal((n, dim)).astype(np.float32))
+
+
+def directory_mb(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file()) / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--storage", nargs="+", choices=NumpyBackend.STORAGE_MODES,
+                        default=list(NumpyBackend.STORAGE_MODES))
+    parser.add_argument("--rerank", type=int, nargs="+", default=[0, 50, 200],
+                        help="shortlist sizes re-scored exactly (0 = only the top k)")
+    parser.add_argument("--pq-subspaces", type=int, default=48)
+    parser.add_argument("--vectors", help="(n, dim) .npy of real embeddings")
+    parser.add_argument("--seconds", type=float, default=1.0, help="minimum time per latency measurement")
+    args = parser.parse_args()
+
+    if args.vectors:
+        data = normalize_rows(np.load(args.vectors))
+        vectors, queries = data[:-args.queries], data[-args.queries:]
+    else:
+        vectors = synthetic_embeddings(args.jobs, args.dim)
+        queries = synthetic_embeddings(args.queries, args.dim, seed=1)
+    print(f"{len(vectors)} jobs x {vectors.shape[1]} dims, {len(queries)} queries, k={args.k}\n")
+
+    exact = np.argsort(-(queries @ vectors.T), axis=1)[:, :args.k]
+    ids = [str(i) for i in range(len(vectors))]
+    metadatas = [{"content_hash": ""}] * len(vectors)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for storage in args.storage:
+            backend = NumpyBackend(os.path.join(tmp, storage), storage=storage, pq_subspaces=args.pq_subspaces)
+            started = time.perf_counter()
+            for start in range(0, len(vectors), 10000):
+                backend.upsert(ids[start:start + 10000], vectors[start:start + 10000], metadatas[start:start + 10000])
+            backend.flush()
+            build_seconds = time.perf_counter() - started
+
+            job_ids, _, matrix, columns, quantized = backend._data
+            scanned = job_ids.nbytes + sum(column.nbytes for column in columns.values())
+            if quantized is None:
+                scanned += matrix.nbytes
+            else:
+                quantizer, codes = quantized
+                scanned += codes.nbytes + sum(arr.nbytes for arr in quantizer.arrays().values())
+            disk_mb = directory_mb(os.path.join(tmp, storage, f"gen-{backend._generation:06d}"))
+
+            for rerank in (args.rerank if quantized is not None else [0]):
+                backend.rerank_candidates = rerank
+                found = backend.search_many(list(queries), args.k)
+                recall = np.mean([
+                    len({job_id for job_id, _ in result} & set(truth.tolist())) / args.k
+                    for result, truth in zip(found, exact)
+                ])
+                latencies = []
+                started = time.perf_counter()
+                while time.perf_counter() - started < args.seconds:
+                    for query in queries:
+                        call_started = time.perf_counter()
+                        backend.search(query, args.k)
+                        latencies.append(time.perf_counter() - call_started)
+                shortlist = max(rerank, args.k) if quantized is not None else 0
+                rows.append([
+                    storage,
+                    rerank if quantized is not None else "-",
+                    f"{build_seconds:.1f}",
+                    f"{scanned / 2 ** 20:.1f}",
+                    f"{shortlist * matrix.shape[1] * 4 / 1024:.0f}",
+                    f"{disk_mb:.1f}",
+                    f"{statistics.median(latencies) * 1000:.2f}",
+                    f"{recall:.3f}",
+                ])
+    print_table(["storage", "rerank", "build s", "search MB", "rerank KB", "disk MB", "p50 ms",
+                 f"recall@{args.k}"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Shared helpers for the benchmark scripts"""
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+
+# Make the backend modules importable when a script is run directly
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+def corpus_files(corpus_dir=None) -> List[Path]:
+    """Resume files of the sample corpus (or any directory passed in)"""
+    root = Path(corpus_dir) if corpus_dir else CORPUS_DIR
+    return sorted(p for p in root.rglob("*") if p.suffix.lower() in (".txt", ".pdf", ".docx"))
+
+
+def load_corpus(corpus_dir=None) -> List[str]:
+    """Plain-text resumes of the corpus"""
+    return [p.read_text(encoding="utf-8", errors="ignore") for p in corpus_files(corpus_dir) if p.suffix.lower() == ".txt"]
+
+
+def time_per_call(fn: Callable, inputs: list, min_seconds: float = 1.0) -> float:
+    """Average seconds per call of fn over the inputs, repeating for at least min_seconds"""
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        for item in inputs:
+            fn(item)
+        calls += len(inputs)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return elapsed / calls
+
+
+def print_table(headers: List[str], rows: List[list]):
+    widths = [max(len(str(x)) for x in col) for col in zip(headers, *rows)]
+    line = "  ".join(f"{{:<{w}}}" for w in widths)
+    print(line.format(*headers))
+    print(line.format(*("-" * w for w in widths)))
+    for row in rows:
+        print(line.format(*row))
@@ -0,0 +1,257 @@
+"""
+Frozen copies of the original resume parser routines.
+
+The benchmarks compare the current implementation against these; do not
+update them when the parser changes.
+"""
+import re
+from difflib import get_close_matches
+from typing import Dict, List, Optional
+
+from resume_parser import HEADINGS, SKILLS_MASTER
+
+DURATION_PATTERN = r"\(([^)]*(?:20\d{2}|Present|current)[^)]*)\)"
+
+
+def extract_skills(text: str, master_list: List[str] = SKILLS_MASTER, cutoff=0.8) -> List[str]:
+    text_lower = text.lower()
+    found = set()
+
+    for skill in master_list:
+        if skill.lower() in text_lower:
+            found.add(skill)
+
+    words = re.findall(r"[a-zA-Z\+\#\.\-]{2,}", text_lower)
+    uniq = sorted(set(words), key=lambda x: -len(x))
+    for w in uniq:
+        matches = get_close_matches(w, master_list, n=3, cutoff=cutoff)
+        for m in matches:
+            found.add(m)
+
+    tech_patterns = re.findall(r"(React\.js|Node\.js|Next\.js|MongoDB|PostgreSQL|MySQL|Firebase|TensorFlow|PyTorch|scikit-learn)", text, re.I)
+    for tp in tech_patterns:
+        clean = tp.lower().replace('.js', '').capitalize()
+        found.add(clean)
+
+    return sorted(found)
+
+
+def find_heading_positions(text: str) -> List[Dict]:
+    lines = text.splitlines()
+    positions = []
+    for idx, line in enumerate(lines):
+        normalized = re.sub(r'[^a-zA-Z ]', ' ', line).strip().lower()
+        for h in HEADINGS:
+            if normalized.startswith(h):
+                positions.append({"heading": h, "line_index": idx, "raw_heading": line.strip()})
+                break
+    return positions
+
+
+def segment_by_headings(text: str) -> Dict[str, str]:
+    lines = text.splitlines()
+    headings = find_heading_positions(text)
+    if not headings:
+        return {"summary": text.strip()}
+
+    sections = {}
+    for i, item in enumerate(headings):
+        start = item["line_index"]
+        end = headings[i + 1]["line_index"] if i + 1 < len(headings) else len(lines)
+        section_text = "\n".join(lines[start:end]).strip()
+        sections[item["heading"]] = section_text
+
+    first_idx = headings[0]["line_index"]
+    if first_idx > 0:
+        summary = "\n".join(lines[:first_idx]).strip()
+        if summary:
+            sections.setdefault("summary", summary)
+    return sections
+
+
+def extract_name_candidate(text: str, emails: List[str]) -> Optional[str]:
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    if lines:
+        first = lines[0]
+        if 1 <= len(first.split()) <= 4 and any(c.isalpha() for c in first):
+            return first
+    if emails:
+        local = emails[0].split("@")[0]
+        local = re.sub(r"[\.\_\-\d]+", " ", local).strip()
+        return " ".join([w.capitalize() for w in local.split() if w])
+    return None
+
+
+def extract_education(text: str) -> List[Dict]:
+    lines = text.splitlines()
+    education_entries = []
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        if re.search(r"(B\.?\s?Tech|Intermediate|Bachelor|Master|B\.?Sc|M\.?Tech)", line, re.I):
+            degree_line = line
+            if i + 1 < len(lines):
+                inst_line = lines[i + 1].strip()
+                cgpa_match = re.search(r"[\d\.]+(?:\s?CGPA|%|percent)", degree_line, re.I)
+                cgpa = cgpa_match.group(0) if cgpa_match else None
+                
+                year_match = re.search(r"\(([^)]*(?:20\d{2}|Present)[^)]*)\)", inst_line)
+                if not year_match:
+                     year_match = re.search(r"\(([^)]*(?:20\d{2}|Present)[^)]*)\)", degree_line)
+                
+                year = year_match.group(1) if year_match else None
+                institution = re.sub(r"\s*\([^)]*\)\s*$", "", inst_line).strip()
+                
+                education_entries.append({
+                    "degree": degree_line,
+                    "institution": institution,
+                    "cgpa_or_percentage": cgpa,
+                    "duration": year
+                })
+                i += 2
+                continue
+        i += 1
+    return education_entries
+
+
+def split_experience_blocks(section_text: str) -> List[Dict]:
+    lines = [ln.strip() for ln in section_text.splitlines() if ln.strip()]
+    blocks = []
+    current_role = None
+    current_bullets = []
+
+    for ln in lines:
+        is_new_role = re.search(r"(Intern|Engineer|Developer|Analyst|Manager|Researcher)", ln, re.I) and re.search(DURATION_PATTERN, ln)
+        
+        if is_new_role:
+            if current_role:
+                blocks.append({
+                    "role_line": current_role,
+                    "bullets": current_bullets
+                })
+            current_role = ln
+            current_bullets = []
+        elif ln.startswith(("•", "-", "*")):
+            bullet = ln.lstrip("•-* ").strip()
+            current_bullets.append(bullet)
+        else:
+            if current_bullets:
+                current_bullets[-1] += " " + ln.strip()
+            elif current_role:
+                current_role += " " + ln.strip()
+
+    if current_role:
+        blocks.append({
+            "role_line": current_role,
+            "bullets": current_bullets
+        })
+
+    return blocks
+
+
+def extract_experience(section_text: str) -> List[Dict]:
+    blocks = split_experience_blocks(section_text)
+    exps = []
+
+    for block in blocks:
+        role_line = block["role_line"]
+        bullets = block["bullets"]
+
+        title, company, duration = None, None, None
+
+        dur_match = re.search(r"\(([^)]+)\)", role_line)
+        if dur_match:
+            duration = dur_match.group(1)
+            role_line = role_line.replace(f"({duration})", "").strip()
+
+        if " – " in role_line:
+            parts = role_line.split(" – ", 1)
+            title = parts[0].strip()
+            company = parts[1].strip()
+        elif " - " in role_line:
+            parts = role_line.split(" - ", 1)
+            title = parts[0].strip()
+            company = parts[1].strip()
+        else:
+            title = role_line.strip()
+            company = None
+
+        if company and (',' in company or '|' in company):
+            company = company.split(',')[0].split('|')[0].strip()
+
+        exps.append({
+            "title": title or "N/A",
+            "company": company or "N/A",
+            "duration": duration,
+            "bullets": bullets
+        })
+
+    return exps
+
+
+def extract_projects(section_text: str) -> List[Dict]:
+    lines = [ln.strip() for ln in section_text.splitlines() if ln.strip()]
+    projects = []
+    current_proj = None
+
+    for ln in lines:
+        if re.match(r"^\d+\.", ln) or re.match(r"^[A-Z][a-zA-Z\s]+:", ln):
+            if current_proj:
+                projects.append(current_proj)
+            title = ln.split(':')[0].strip() if ':' in ln else ln.strip()
+            description = ln.split(':', 1)[1].strip() if ':' in ln else ""
+            current_proj = {"title": title, "bullets": []}
+            if description:
+                 current_proj["bullets"].append(description)
+        elif ln.startswith(("•", "-", "*")):
+            if current_proj is not None:
+                bullet = ln.lstrip("•-* ").strip()
+                current_proj["bullets"].append(bullet)
+        else:
+            if current_proj:
+                if current_proj["bullets"]:
+                    current_proj["bullets"][-1] += " " + ln.strip()
+                else:
+                    current_proj["title"] += " " + ln.strip()
+
+    if current_proj:
+        projects.append(current_proj)
+
+    return projects
+
+
+def parse_structure(text: str, emails: List[str]) -> Dict:
+    """Sections, name and entities the way the original parse_resume assembled them"""
+    sections = segment_by_headings(text)
+    name = extract_name_candidate(text, emails)
+
+    skills_text = ""
+    for k in ("skills", "technical skills", "expertise"):
+        if k in sections:
+            skills_text = sections[k]
+            break
+    if not skills_text:
+        skills_text = text
+
+    education, experience, projects = [], [], []
+    for k, v in sections.items():
+        if "education" in k:
+            education.extend(extract_education(v))
+        elif "experience" in k or "employment" in k or "work" in k:
+            experience.extend(extract_experience(v))
+        elif "project" in k:
+            projects.extend(extract_projects(v))
+
+    if not education:
+        education.extend(extract_education(text))
+    if not experience:
+        experience.extend(extract_experience(text))
+
+    return {
+        "name": name,
+        "sections": sections,
+        "skills_text": skills_text,
+        "education": education,
+        "experience": experience,
+        "projects": projects,
+    }
@@ -0,0 +1,322 @@
+"""
+Bulk resume parsing for backfills.
+
+    python bulk_parse.py SOURCE OUTPUT [--format jsonl|parquet] [--state FILE]
+                         [--workers N] [--checkpoint-every N] [--force]
+                         [--ai-summary] [--embed]
+
+SOURCE is a directory (searched recursively), a .zip or a tar archive
+(.tar, .tar.gz, .tgz, ...). Files are parsed on a process pool and written
+to OUTPUT: a JSONL file that is appended to, or, for --format parquet, a
+directory that receives one part file per checkpoint (requires pyarrow).
+
+Progress is checkpointed to a SQLite state file: an interrupted run picks
+up where it stopped, and files whose content hash was already parsed by
+the current PARSER_VERSION are skipped (--force re-parses everything);
+files that failed are retried.
+Output is at-least-once: files parsed after the last checkpoint of an
+interrupted run are written again by the next run.
+
+--embed embeds each profile's search text through the shared embedding
+cache and stores the vector with the record, so later matching of these
+profiles needs no model call.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sqlite3
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from config import Config
+from resume_parser import PARSER_VERSION, parse_resume
+
+RESUME_SUFFIXES = tuple(f".{ext}" for ext in Config.ALLOWED_EXTENSIONS)
+
+
+def iter_resume_files(source: str) -> Iterator[Tuple[str, bytes]]:
+    """(name, bytes) of every resume file in a directory, zip or tar archive"""
+    path = Path(source)
+    if path.is_dir():
+        for file in sorted(path.rglob("*")):
+            if file.is_file() and file.suffix.lower() in RESUME_SUFFIXES:
+                yield file.relative_to(path).as_posix(), file.read_bytes()
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(RESUME_SUFFIXES):
+                    yield info.filename, archive.read(info)
+    elif tarfile.is_tarfile(path):
+        with tarfile.open(path, "r:*") as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(RESUME_SUFFIXES):
+                    yield member.name, archive.extractfile(member).read()
+    else:
+        raise ValueError(f"{source} is not a directory, zip or tar archive")
+
+
+class BulkState:
+    """
+    Per-file progress of bulk runs: content hash, parser version and outcome.
+
+    Only successful parses count as current; failed files are retried by
+    the next run.
+    """
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                name TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                parser_version INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+        self._done = {
+            name: (sha256, version)
+            for name, sha256, version
+            in self._conn.execute("SELECT name, sha256, parser_version FROM files WHERE status = 'done'")
+        }
+
+    def is_current(self, name: str, sha256: str) -> bool:
+        return self._done.get(name) == (sha256, PARSER_VERSION)
+
+    def record(self, name: str, sha256: str, error: Optional[str] = None):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (name, sha256, parser_version, status, error, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (name, sha256, PARSER_VERSION, "failed" if error else "done", error, time.time())
+        )
+        if error:
+            self._done.pop(name, None)
+        else:
+            self._done[name] = (sha256, PARSER_VERSION)
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+
+class JsonlWriter:
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, records: List[Dict]):
+        for record in records:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """One part file per checkpoint; nested resume fields are stored as a JSON string"""
+
+    def __init__(self, directory: str):
+        if pyarrow is None:
+            raise RuntimeError("pyarrow is required for --format parquet (pip install pyarrow)")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._records: List[Dict] = []
+        self._run = time.strftime("%Y%m%d-%H%M%S")
+        self._parts = 0
+
+    def write(self, records: List[Dict]):
+        for record in records:
+            parsed = record["parsed"]
+            row = {
+                "file": record["file"],
+                "sha256": record["sha256"],
+                "parser_version": record["parser_version"],
+                "name": parsed.get("name"),
+                "skills": parsed.get("skills", []),
+                "location_guess": parsed.get("location_guess"),
+                "parsed": json.dumps(parsed, ensure_ascii=False),
+            }
+            if "embedding" in record:
+                row["embedding"] = record["embedding"]
+            self._records.append(row)
+
+    def flush(self):
+        if not self._records:
+            return
+        self._parts += 1
+        path = os.path.join(self.directory, f"part-{self._run}-{self._parts:05d}.parquet")
+        pyarrow.parquet.write_table(pyarrow.Table.from_pylist(self._records), path)
+        self._records = []
+
+    def close(self):
+        self.flush()
+
+
+def _parse_file(name: str, data: bytes, summarize: bool) -> Dict:
+    return parse_resume(data, filename=name, summarize=summarize)
+
+
+class ProfileEmbedder:
+    """Embeds parsed resumes' search text through the shared embedding cache"""
+
+    def __init__(self):
+        # Imported here so runs without --embed don't load the model stack
+        from core_logic import build_resume_query_text, get_embeddings
+        from indexing import EmbeddingPipeline
+        self._query_text = build_resume_query_text
+        self._pipeline = EmbeddingPipeline(
+            get_embeddings(),
+            model_name=Config.EMBEDDING_MODEL_NAME,
+            backend=Config.EMBEDDING_BACKEND,
+            batch_size=Config.EMBED_BATCH_SIZE,
+            workers=Config.EMBED_WORKERS
+        )
+
+    def add_embeddings(self, records: List[Dict]):
+        vectors = self._pipeline.embed([self._query_text(record["parsed"]) for record in records])
+        for record, vector in zip(records, vectors):
+            record["embedding"] = [round(float(x), 6) for x in vector]
+
+    def close(self):
+        self._pipeline.close()
+
+
+def run(source: str, output: str, output_format: str = "jsonl", state_path: Optional[str] = None,
+        workers: Optional[int] = None, checkpoint_every: int = 200, force: bool = False,
+        summarize: bool = False, embed: bool = False) -> Dict:
+    """
+    Parse every resume under source into output.
+
+    Returns:
+        Counters: parsed, failed, skipped, and the elapsed seconds
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    state = BulkState(state_path or f"{output.rstrip('/')}.state.sqlite3")
+    writer = ParquetWriter(output) if output_format == "parquet" else JsonlWriter(output)
+    embedder = ProfileEmbedder() if embed else None
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) if workers > 0 else None
+    counts = {"parsed": 0, "failed": 0, "skipped": 0}
+    started = time.perf_counter()
+    records: List[Dict] = []
+    outcomes: List[Tuple[str, str, Optional[str]]] = []
+
+    def checkpoint():
+        # Output first, then state: a crash in between re-parses, never loses, files
+        if embedder is not None and records:
+            embedder.add_embeddings(records)
+        writer.write(records)
+        writer.flush()
+        for name, sha256, error in outcomes:
+            state.record(name, sha256, error)
+        state.commit()
+        records.clear()
+        outcomes.clear()
+        elapsed = time.perf_counter() - started
+        print(f"📦 {counts['parsed']} parsed, {counts['failed']} failed, {counts['skipped']} skipped "
+              f"({counts['parsed'] / elapsed if elapsed else 0.0:.1f} files/s)")
+
+    def collect(name, sha256, parsed):
+        if "error" in parsed:
+            counts["failed"] += 1
+            outcomes.append((name, sha256, parsed["error"]))
+        else:
+            counts["parsed"] += 1
+            records.append({"file": name, "sha256": sha256, "parser_version": PARSER_VERSION, "parsed": parsed})
+            outcomes.append((name, sha256, None))
+        if len(outcomes) >= checkpoint_every:
+            checkpoint()
+
+    def finish(future, name, sha256):
+        try:
+            parsed = future.result()
+        except Exception as e:
+            parsed = {"error": str(e)}
+        collect(name, sha256, parsed)
+
+    # Bounded number of files in flight so archives of any size stream through
+    max_in_flight = max(1, workers) * 4
+    in_flight = {}
+    try:
+        for name, data in iter_resume_files(source):
+            sha256 = hashlib.sha256(data).hexdigest()
+            if not force and state.is_current(name, sha256):
+                counts["skipped"] += 1
+                continue
+            if pool is None:
+                collect(name, sha256, _parse_file(name, data, summarize))
+                continue
+            in_flight[pool.submit(_parse_file, name, data, summarize)] = (name, sha256)
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(future, *in_flight.pop(future))
+        for future in list(in_flight):
+            finish(future, *in_flight.pop(future))
+    except KeyboardInterrupt:
+        print("⏹️ Interrupted, saving progress")
+        for future in in_flight:
+            future.cancel()
+    finally:
+        checkpoint()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if embedder is not None:
+            embedder.close()
+        writer.close()
+        state.close()
+
+    return {**counts, "seconds": round(time.perf_counter() - started, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("source", help="directory, .zip or tar archive of resumes")
+    parser.add_argument("output", help="JSONL file, or directory for --format parquet")
+    parser.add_argument("--format", choices=("jsonl", "parquet"), default="jsonl")
+    parser.add_argument("--state", help="checkpoint file (default: OUTPUT.state.sqlite3)")
+    parser.add_argument("--workers", type=int, help="parser processes (default: CPU count, 0 = in-process)")
+    parser.add_argument("--checkpoint-every", type=int, default=200, help="files per checkpoint")
+    parser.add_argument("--force", action="store_true", help="re-parse files even if their hash is unchanged")
+    parser.add_argument("--ai-summary", action="store_true",
+                        help="ask the summary model for every resume (default: extractive summaries)")
+    parser.add_argument("--embed", action="store_true", help="store an embedding of each profile")
+    args = parser.parse_args()
+
+    result = run(
+        args.source,
+        args.output,
+        output_format=args.format,
+        state_path=args.state,
+        workers=args.workers,
+        checkpoint_every=args.checkpoint_every,
+        force=args.force,
+        summarize=args.ai_summary,
+        embed=args.embed
+    )
+    print(f"✅ Done: {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,122 @@ class Config:
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt'}
     
+    # Uploads are parsed from memory; keeping the original file and the parsed
+    # JSON in UPLOAD_FOLDER is optional, done off the request path, and
+    # files are deleted after UPLOAD_RETENTION_HOURS
+    PERSIST_UPLOADS = (os.environ.get('PERSIST_UPLOADS') or 'true').lower() in ('1', 'true', 'yes')
+    UPLOAD_RETENTION_HOURS = float(os.environ.get('UPLOAD_RETENTION_HOURS') or 24)
+    
+    # Import the catalog (if empty), load the embedding model and build the
+    # indexes in a background thread when the app is created; /api/ready
+    # reports when that is done. Off: each of them loads on first use (the
+    # catalog import on the first request).
+    WARM_UP_ON_START = (os.environ.get('WARM_UP_ON_START') or 'true').lower() in ('1', 'true', 'yes')
+    
+    # /api/jobs/search limits
+    SEARCH_MAX_PER_PAGE = int(os.environ.get('SEARCH_MAX_PER_PAGE') or 50)
+    SEARCH_MAX_RESULTS = int(os.environ.get('SEARCH_MAX_RESULTS') or 1000)
+    
+    # Largest top_n the recommend endpoints accept
+    RECOMMEND_MAX_TOP_N = int(os.environ.get('RECOMMEND_MAX_TOP_N') or 50)
+    
+    # /api/recommend/batch limits
+    MAX_BATCH_RESUMES = int(os.environ.get('MAX_BATCH_RESUMES') or 200)
+    BATCH_PARSE_WORKERS = int(os.environ.get('BATCH_PARSE_WORKERS') or 4)
+    
+    # Background resume processing (/api/recommend/async)
+    TASK_DB_PATH = os.environ.get('TASK_DB_PATH') or 'data/tasks.sqlite3'
+    TASK_WORKERS = int(os.environ.get('TASK_WORKERS') or 2)
+    TASK_MAX_PENDING = int(os.environ.get('TASK_MAX_PENDING') or 50)
+    TASK_MAX_WAIT_SECONDS = int(os.environ.get('TASK_MAX_WAIT_SECONDS') or 60)
+    TASK_RETENTION_HOURS = int(os.environ.get('TASK_RETENTION_HOURS') or 24)
+    
+    # PDF text extraction: engine ('auto' = pdfium text-only if installed, else
+    # pdfplumber), per-document page/time caps, characters after which the
+    # remaining pages are skipped, and the page-range process pool (0 = read
+    # in-process; pdfium needs ~1-2 ms per page, so the pool mostly pays off
+    # with the pdfplumber engine)
+    PDF_TEXT_ENGINE = os.environ.get('PDF_TEXT_ENGINE') or 'auto'
+    PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES') or 30)
+    PDF_MAX_SECONDS = float(os.environ.get('PDF_MAX_SECONDS') or 10)
+    PDF_TARGET_CHARS = int(os.environ.get('PDF_TARGET_CHARS') or 20000)
+    PDF_WORKERS = int(os.environ.get('PDF_WORKERS') or 0)
+    PDF_PAGES_PER_TASK = int(os.environ.get('PDF_PAGES_PER_TASK') or 4)
+    
+    # In-process result caches (entries, seconds): parsed resumes keyed by file
+    # content, recommendations keyed by query text + options
+    PARSE_CACHE_SIZE = int(os.environ.get('PARSE_CACHE_SIZE') or 256)
+    PARSE_CACHE_TTL_SECONDS = int(os.environ.get('PARSE_CACHE_TTL_SECONDS') or 3600)
+    RECOMMENDATION_CACHE_SIZE = int(os.environ.get('RECOMMENDATION_CACHE_SIZE') or 1024)
+    RECOMMENDATION_CACHE_TTL_SECONDS = int(os.environ.get('RECOMMENDATION_CACHE_TTL_SECONDS') or 600)
+    
     # CSV file path
     CSV_FILE = 'data/Internship details.csv'
+    CSV_IMPORT_CHUNK_SIZE = int(os.environ.get('CSV_IMPORT_CHUNK_SIZE') or 5000)
+    # 'incremental' upserts by natural key and soft-deletes missing rows; 'replace' wipes the table
+    CSV_IMPORT_MODE = os.environ.get('CSV_IMPORT_MODE') or 'incremental'
+    # Optional CSV column holding a stable id for each posting
+    CSV_SOURCE_ID_COLUMN = os.environ.get('CSV_SOURCE_ID_COLUMN') or 'source_id'
+
+    # Embeddings / vector store
+    EMBEDDING_MODEL_NAME = os.environ.get('EMBEDDING_MODEL_NAME') or 'sentence-transformers/all-MiniLM-L6-v2'
+    # Retrieval backend: 'chroma' (HNSW) or 'numpy' (exact search over a memory-mapped matrix)
+    RETRIEVAL_BACKEND = os.environ.get('RETRIEVAL_BACKEND') or 'chroma'
+    VECTORSTORE_DIR = os.environ.get('VECTORSTORE_DIR') or 'data/vectorstore'
+    NUMPY_INDEX_DIR = os.environ.get('NUMPY_INDEX_DIR') or 'data/numpy_index'
+    VECTORSTORE_COLLECTION = os.environ.get('VECTORSTORE_COLLECTION') or 'jobs'
+    # Seconds between checks for a newer index generation written by another
+    # process (numpy backend, e.g. an import handled by another worker)
+    INDEX_REFRESH_SECONDS = float(os.environ.get('INDEX_REFRESH_SECONDS') or 5)
+    EMBEDDING_CACHE_PATH = os.environ.get('EMBEDDING_CACHE_PATH') or 'data/embedding_cache.sqlite3'
+    EMBEDDING_CACHE_MEMORY_MB = int(os.environ.get('EMBEDDING_CACHE_MEMORY_MB') or 64)
+    
+    # Numpy index storage: 'float32', or compact 'int8' / 'pq' (product
+    # quantization, PQ_SUBSPACES bytes per job) codes whose best VECTOR_RERANK_CANDIDATES
+    # matches are re-scored exactly against the float32 vectors kept on disk
+    VECTOR_STORAGE = os.environ.get('VECTOR_STORAGE') or 'float32'
+    VECTOR_RERANK_CANDIDATES = int(os.environ.get('VECTOR_RERANK_CANDIDATES') or 200)
+    PQ_SUBSPACES = int(os.environ.get('PQ_SUBSPACES') or 48)
+    
+    # Embedding inference: 'torch', 'torch-int8' (dynamic int8), 'onnx' or 'onnx-int8'
+    # (ONNX Runtime; needs onnxruntime, plus onnx for the one-time export into
+    # EMBEDDING_ONNX_DIR), and intra-op threads per model (0 = one per core)
+    EMBEDDING_BACKEND = os.environ.get('EMBEDDING_BACKEND') or 'torch'
+    EMBEDDING_THREADS = int(os.environ.get('EMBEDDING_THREADS') or 0)
+    EMBEDDING_ONNX_DIR = os.environ.get('EMBEDDING_ONNX_DIR') or 'data/onnx'
+    
+    # Optional embedding server (python embedding_server.py): when set, the app
+    # sends texts there instead of loading the model; micro-batch size and the
+    # longest a request waits for a batch to fill (server side)
+    EMBEDDING_SERVER_URL = os.environ.get('EMBEDDING_SERVER_URL') or None
+    EMBEDDING_SERVER_TIMEOUT_SECONDS = float(os.environ.get('EMBEDDING_SERVER_TIMEOUT_SECONDS') or 10)
+    EMBEDDING_BATCH_MAX_SIZE = int(os.environ.get('EMBEDDING_BATCH_MAX_SIZE') or 64)
+    EMBEDDING_BATCH_MAX_WAIT_MS = float(os.environ.get('EMBEDDING_BATCH_MAX_WAIT_MS') or 5)
+    
+    # Recommendation ranking: 'dense' (vectors only) or 'hybrid' (vectors fused with BM25
+    # over titles/skills via 'rrf' or 'weighted' fusion over HYBRID_CANDIDATES per signal)
+    RETRIEVAL_MODE = os.environ.get('RETRIEVAL_MODE') or 'dense'
+    HYBRID_FUSION = os.environ.get('HYBRID_FUSION') or 'rrf'
+    HYBRID_DENSE_WEIGHT = float(os.environ.get('HYBRID_DENSE_WEIGHT') or 0.5)
+    HYBRID_CANDIDATES = int(os.environ.get('HYBRID_CANDIDATES') or 100)
+
+    # Index build pipeline: jobs per DB page, texts per model call, and
+    # embedding worker processes (0 = embed in the web process)
+    INDEX_PAGE_SIZE = int(os.environ.get('INDEX_PAGE_SIZE') or 1000)
+    EMBED_BATCH_SIZE = int(os.environ.get('EMBED_BATCH_SIZE') or 64)
+    EMBED_WORKERS = int(os.environ.get('EMBED_WORKERS') or 0)
     
     # Gemini API Key (Replace with your actual key)
     GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY') or 'replace key'
+    GEMINI_MODEL_NAME = os.environ.get('GEMINI_MODEL_NAME') or 'gemini-1.5-flash'
+    
+    # AI summaries: seconds a parse waits for the model (retries included)
+    # before using an extractive summary, retries per call, cache and pool sizes
+    AI_SUMMARY_BUDGET_SECONDS = float(os.environ.get('AI_SUMMARY_BUDGET_SECONDS') or 4.0)
+    AI_SUMMARY_RETRIES = int(os.environ.get('AI_SUMMARY_RETRIES') or 1)
+    AI_SUMMARY_CACHE_SIZE = int(os.environ.get('AI_SUMMARY_CACHE_SIZE') or 1024)
+    AI_SUMMARY_CACHE_TTL_SECONDS = int(os.environ.get('AI_SUMMARY_CACHE_TTL_SECONDS') or 86400)
+    AI_SUMMARY_WORKERS = int(os.environ.get('AI_SUMMARY_WORKERS') or 4)
     
     # Create upload folder if it doesn't exist
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
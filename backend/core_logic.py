@@ -1,93 +1,523 @@
 import os
-import pandas as pd
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain.vectorstores import Chroma
-from langchain.docstore.document import Document
-from models import Job
+import math
+import hashlib
+import threading
+import time
+from models import db, Job, JobSkill, JOB_CARD_COLUMNS
+from config import Config
+from embedding_cache import EmbeddingCache, CachedEmbeddings
+from embedding_backends import embedding_model_id, load_embedding_model
+from indexing import EmbeddingPipeline, iter_job_pages
+from retrieval import create_backend
+from lexical_index import BM25Index, job_terms, resume_terms, fuse_rankings
+from skill_index import SkillIndex
+from job_fields import normalize_location
+from resume_parser import normalize_skill
+from result_cache import TTLCache, cache_key
 
 # Initialize embeddings model (singleton pattern)
 _embeddings = None
 _vectorstore = None
+_embedding_cache = None
+_lexical_index = None
+_skill_index = None
+
+# Serializes the lazy creation of the model and the vector store, so a
+# request arriving during the background warm-up waits for it instead of
+# loading a second copy
+_init_lock = threading.RLock()
+_last_refresh_check = 0.0
+
+# Bumped whenever the job catalog changes; part of every recommendation cache key
+_catalog_version = 0
+_recommendation_cache = TTLCache(Config.RECOMMENDATION_CACHE_SIZE, Config.RECOMMENDATION_CACHE_TTL_SECONDS)
+
+RETRIEVAL_MODES = ('dense', 'hybrid')
+SKILL_MATCH_MODES = ('any', 'all')
+
+def _invalidate_recommendations():
+    """
+    Discard cached recommendations after a catalog change.
+
+    The version bump also keeps searches that were already running from
+    caching results computed against the old catalog.
+    """
+    global _catalog_version
+    _catalog_version += 1
+    _recommendation_cache.clear()
+
+def _reset_job_indexes():
+    """Drop the in-memory state derived from the jobs table; indexes are rebuilt on next use"""
+    global _lexical_index, _skill_index
+    _lexical_index = None
+    _skill_index = None
+    _invalidate_recommendations()
+
+def get_recommendation_cache_stats():
+    return _recommendation_cache.stats()
+
+def get_embedding_cache():
+    """Get or initialize the embedding cache shared by indexing and search"""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(
+            db_path=Config.EMBEDDING_CACHE_PATH,
+            max_memory_bytes=Config.EMBEDDING_CACHE_MEMORY_MB * 1024 * 1024
+        )
+    return _embedding_cache
+
+def get_embedding_cache_stats():
+    """Hit/miss counters of the embedding cache"""
+    return get_embedding_cache().stats()
 
 def get_embeddings():
-    """Get or initialize embeddings model"""
+    """Get or initialize embeddings model (wrapped in the embedding cache)"""
     global _embeddings
     if _embeddings is None:
-        try:
-            _embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-            print("✅ Hugging Face Embeddings Model loaded.")
-        except Exception as e:
-            print(f"❌ Error loading embeddings: {e}")
-            raise
+        with _init_lock:
+            if _embeddings is None:
+                try:
+                    model_id = embedding_model_id(Config.EMBEDDING_MODEL_NAME, Config.EMBEDDING_BACKEND)
+                    if Config.EMBEDDING_SERVER_URL:
+                        from embedding_server import RemoteEmbeddings
+                        model = RemoteEmbeddings(
+                            Config.EMBEDDING_SERVER_URL,
+                            model_id,
+                            timeout=Config.EMBEDDING_SERVER_TIMEOUT_SECONDS
+                        )
+                        print(f"✅ Using embedding server at {Config.EMBEDDING_SERVER_URL}.")
+                    else:
+                        # Libraries are imported on first use: langchain and torch take seconds to import
+                        model = load_embedding_model(
+                            Config.EMBEDDING_MODEL_NAME,
+                            Config.EMBEDDING_BACKEND,
+                            threads=Config.EMBEDDING_THREADS or None
+                        )
+                        print(f"✅ Embeddings model loaded ({Config.EMBEDDING_BACKEND} backend).")
+                    _embeddings = CachedEmbeddings(model, model_id, get_embedding_cache())
+                except Exception as e:
+                    print(f"❌ Error loading embeddings: {e}")
+                    raise
     return _embeddings
 
+def _job_document_text(job):
+    """Text that gets embedded for a job"""
+    return (
+        f"Title: {job.internship_title}\n"
+        f"Company: {job.company_name}\n"
+        f"Description: {job.full_description}\n"
+        f"Skills: {job.required_skills}"
+    )
+
+def _content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _filter_metadata(job):
+    """Values searches can filter on; unknown values are left out (Chroma metadata can't be None)"""
+    values = {
+        "location_key": job.location_key,
+        "stipend_min": job.stipend_min,
+        "duration_months_min": job.duration_months_min,
+    }
+    return {key: value for key, value in values.items() if value is not None}
+
+def _document_hash(content, filter_metadata):
+    # Filter values are part of the hash so a changed stipend or location is re-synced;
+    # so is a non-default inference backend, so switching backends re-embeds the catalog
+    key = content + "\x1f" + repr(sorted(filter_metadata.items()))
+    if Config.EMBEDDING_BACKEND != "torch":
+        key += "\x1f" + Config.EMBEDDING_BACKEND
+    return _content_hash(key)
+
+def _job_metadata(job, content_hash, filter_metadata):
+    # Only what syncing and filtered searches need: recommendations load the
+    # jobs themselves from the database by id
+    return {
+        "id": job.id,
+        "content_hash": content_hash,
+        **filter_metadata,
+    }
+
+def sync_vectorstore(vectorstore, job_ids=None, removed_ids=None):
+    """
+    Bring the persisted retrieval backend in line with the jobs table.
+
+    Documents are keyed by job id and carry a hash of the embedded text and
+    filter metadata, so only new or changed jobs are (re)written and
+    deleted jobs are dropped.
+    Jobs are streamed from the database page by page and every page is
+    embedded in batches and written to the store before the next one is
+    read, which keeps memory flat for large catalogs.
+
+    Passing job_ids/removed_ids (e.g. from an import) limits the sync to
+    those rows instead of comparing the whole table.
+
+    Returns:
+        Dictionary with added/removed/unchanged counts
+    """
+    targeted = job_ids is not None
+    indexed_hashes = {} if targeted else vectorstore.indexed_hashes()
+    added = 0
+
+    pipeline = EmbeddingPipeline(
+        get_embeddings(),
+        model_name=Config.EMBEDDING_MODEL_NAME,
+        backend=Config.EMBEDDING_BACKEND,
+        batch_size=Config.EMBED_BATCH_SIZE,
+        workers=Config.EMBED_WORKERS
+    )
+    current_ids = set()
+    with pipeline:
+        for jobs in _iter_jobs_to_sync(job_ids):
+            ids, texts, metadatas = [], [], []
+            for job in jobs:
+                doc_id = str(job.id)
+                current_ids.add(doc_id)
+                content = _job_document_text(job)
+                filter_metadata = _filter_metadata(job)
+                content_hash = _document_hash(content, filter_metadata)
+                if indexed_hashes.get(doc_id) != content_hash:
+                    ids.append(doc_id)
+                    texts.append(content)
+                    metadatas.append(_job_metadata(job, content_hash, filter_metadata))
+
+            if ids:
+                vectors = pipeline.embed(texts)
+                vectorstore.upsert(ids, vectors, metadatas)
+                added += len(ids)
+                print(f"Indexed {added} jobs...")
+
+    if targeted:
+        removed_ids = [str(job_id) for job_id in (removed_ids or [])]
+        # Requested ids that no longer exist are dropped as well
+        removed_ids += [str(job_id) for job_id in job_ids if str(job_id) not in current_ids]
+    else:
+        removed_ids = [doc_id for doc_id in indexed_hashes if doc_id not in current_ids]
+    vectorstore.delete(removed_ids)
+    vectorstore.flush()
+
+    return {
+        "added": added,
+        "removed": len(removed_ids),
+        "unchanged": len(current_ids) - added,
+    }
+
+def _iter_jobs_to_sync(job_ids):
+    """Pages of jobs to sync: the whole table, or just the given ids"""
+    if job_ids is None:
+        yield from iter_job_pages(Config.INDEX_PAGE_SIZE)
+        return
+    job_ids = sorted(job_ids)
+    for i in range(0, len(job_ids), Config.INDEX_PAGE_SIZE):
+        chunk = job_ids[i:i + Config.INDEX_PAGE_SIZE]
+        yield from iter_job_pages(Config.INDEX_PAGE_SIZE, Job.active().filter(Job.id.in_(chunk)))
+
 def initialize_vectorstore_from_db():
-    """Initialize vector store from database jobs"""
+    """Open the retrieval backend selected by RETRIEVAL_BACKEND and sync it with database jobs"""
     global _vectorstore
     
-    try:
-        embeddings = get_embeddings()
-        
-        # Get all jobs from database
-        jobs = Job.query.all()
-        
-        if not jobs:
-            print("⚠️ No jobs found in database")
-            return None
-        
-        print(f"📊 Loading {len(jobs)} jobs into vector store...")
-        
-        # Create documents
-        docs = []
-        for job in jobs:
-            content = (
-                f"Title: {job.internship_title}\n"
-                f"Company: {job.company_name}\n"
-                f"Description: {job.full_description}\n"
-                f"Skills: {job.required_skills}"
-            )
-            doc = Document(
-                page_content=content,
-                metadata={
-                    "id": job.id,
-                    "internship_title": job.internship_title,
-                    "company_name": job.company_name,
-                    "location": job.location,
-                    "full_description": job.full_description,
-                    "required_skills": job.required_skills,
-                    "stipend_inr": job.stipend_inr,
-                    "duration_months": job.duration_months,
-                }
+    with _init_lock:
+        _reset_job_indexes()
+        try:
+            vectorstore = create_backend(Config.RETRIEVAL_BACKEND, Config)
+            
+            print(f"📊 Syncing {vectorstore.name} vector store...")
+            stats = sync_vectorstore(vectorstore)
+            print(
+                f"✅ Vector store synced: {stats['added']} embedded, "
+                f"{stats['removed']} removed, {stats['unchanged']} unchanged."
             )
-            docs.append(doc)
-        
-        # Create vector store
-        _vectorstore = Chroma.from_documents(
-            documents=docs,
-            embedding=embeddings,
-            persist_directory=None
-        )
-        print("✅ Vector store created successfully.")
-        return _vectorstore
-        
-    except Exception as e:
-        print(f"❌ Error creating vector store: {e}")
-        raise
+            print(f"🗃️ Embedding cache: {get_embedding_cache_stats()}")
+            
+            if stats["added"] + stats["unchanged"] == 0:
+                print("⚠️ No jobs found in database")
+                _vectorstore = None
+                return None
+            
+            _vectorstore = vectorstore
+            _invalidate_recommendations()
+            return _vectorstore
+            
+        except Exception as e:
+            print(f"❌ Error creating vector store: {e}")
+            raise
 
 def get_vectorstore():
     """Get or initialize vector store"""
     global _vectorstore
     if _vectorstore is None:
-        _vectorstore = initialize_vectorstore_from_db()
+        with _init_lock:
+            if _vectorstore is None:
+                _vectorstore = initialize_vectorstore_from_db()
+    else:
+        _refresh_vectorstore()
     return _vectorstore
 
-def get_job_recommendations(resume_summary_data, top_n=10):
+def _refresh_vectorstore():
+    """Swap in an index generation written by another process, at most every INDEX_REFRESH_SECONDS"""
+    global _last_refresh_check
+    now = time.monotonic()
+    if now - _last_refresh_check < Config.INDEX_REFRESH_SECONDS:
+        return
+    _last_refresh_check = now
+    vectorstore = _vectorstore
+    if vectorstore is not None and vectorstore.refresh():
+        # The catalog changed elsewhere, so the job indexes and cached results are stale too
+        _reset_job_indexes()
+        print(f"🔄 Loaded a newer vector index ({vectorstore.count()} jobs).")
+
+def after_fork():
+    """
+    Reset per-process state in a worker forked from a process that loaded
+    the model and indexes (see gunicorn.conf.py).
+
+    The model, a fork-safe vector index and the job indexes stay shared
+    with the parent; the embedding cache gets its own SQLite connection and
+    other backends are reopened, without re-embedding, on first use.
+    """
+    global _vectorstore
+    if _embedding_cache is not None:
+        _embedding_cache.reopen()
+    if _vectorstore is not None and not _vectorstore.fork_safe:
+        _vectorstore = None
+
+def vectorstore_loaded():
+    """Whether the vector store has been opened and synced (without triggering it)"""
+    return _vectorstore is not None
+
+def get_lexical_index():
+    """Get or build the BM25 index over active job titles and skills"""
+    global _lexical_index
+    if _lexical_index is None:
+        rows = (
+            db.session.query(Job.id, Job.internship_title, Job.required_skills)
+            .filter(Job.is_active.is_(True))
+            .order_by(Job.id)
+            .yield_per(Config.INDEX_PAGE_SIZE)
+        )
+        _lexical_index = BM25Index().build(
+            (job_id, job_terms(title, skills, normalize_skill)) for job_id, title, skills in rows
+        )
+        print(f"✅ Lexical index built for {len(_lexical_index)} jobs.")
+    return _lexical_index
+
+def get_skill_index():
+    """Get or build the skill -> jobs bitset index over active jobs"""
+    global _skill_index
+    if _skill_index is None:
+        rows = (
+            db.session.query(JobSkill.job_id, JobSkill.skill)
+            .join(Job, Job.id == JobSkill.job_id)
+            .filter(Job.is_active.is_(True))
+            .order_by(JobSkill.job_id)
+            .yield_per(Config.INDEX_PAGE_SIZE)
+        )
+        _skill_index = SkillIndex().build(rows)
+        print(f"✅ Skill index built: {len(_skill_index.skills)} skills over {len(_skill_index)} jobs.")
+    return _skill_index
+
+def find_jobs_by_skills(skills, match='any'):
+    """
+    Active jobs requiring any/all of the given skills, ranked by overlap.
+
+    Skills are normalized like resume skills, so aliases match (e.g. "React.js").
+
+    Returns:
+        List of (job_id, matched skill count, share of the job's skills covered)
+    """
+    return get_skill_index().overlap([normalize_skill(skill) for skill in skills], match)
+
+def _skill_candidates(skills, match):
+    """Job ids allowed by a skill filter, or None when there is no filter"""
+    if not skills:
+        return None
+    return get_skill_index().match([normalize_skill(skill) for skill in skills], match)
+
+def normalize_job_filters(filters):
+    """
+    Canonical job filters, or None when nothing is filtered.
+
+    Accepts {"locations": [...], "min_stipend": ..., "min_duration": ...,
+    "max_duration": ...}; locations are folded like the imported
+    location_key column ("Bengaluru" -> "bangalore").
+    """
+    filters = filters or {}
+    normalized = {}
+    locations = [normalize_location(location) for location in filters.get('locations') or []]
+    if any(locations):
+        normalized['locations'] = sorted({location for location in locations if location})
+    # Types match the stored metadata: Chroma compares ints and floats separately
+    if filters.get('min_stipend') is not None:
+        normalized['min_stipend'] = int(math.ceil(float(filters['min_stipend'])))
+    for key in ('min_duration', 'max_duration'):
+        if filters.get(key) is not None:
+            normalized[key] = float(filters[key])
+    return normalized or None
+
+def _filtered_job_ids(candidate_ids, filters):
+    """
+    Candidate ids narrowed by the job filters using the indexed filter columns.
+
+    Used to restrict indexes that do not carry the filter metadata (BM25);
+    None means unrestricted.
+    """
+    if not filters:
+        return candidate_ids
+    query = db.session.query(Job.id).filter(Job.is_active.is_(True))
+    if filters.get('locations'):
+        query = query.filter(Job.location_key.in_(filters['locations']))
+    if filters.get('min_stipend') is not None:
+        query = query.filter(Job.stipend_min >= filters['min_stipend'])
+    if filters.get('min_duration') is not None:
+        query = query.filter(Job.duration_months_min >= filters['min_duration'])
+    if filters.get('max_duration') is not None:
+        query = query.filter(Job.duration_months_min <= filters['max_duration'])
+    job_ids = [job_id for (job_id,) in query]
+    if candidate_ids is not None:
+        allowed = set(candidate_ids)
+        job_ids = [job_id for job_id in job_ids if job_id in allowed]
+    return job_ids
+
+def build_resume_query_text(resume_summary_data):
+    """Build the search text for a parsed resume"""
+    resume_text_parts = []
+    
+    # Add AI summary if available
+    if resume_summary_data.get('ai_summary'):
+        resume_text_parts.append(resume_summary_data['ai_summary'])
+    
+    # Add skills
+    if resume_summary_data.get('skills'):
+        skills_text = "Skills: " + ", ".join(resume_summary_data['skills'])
+        resume_text_parts.append(skills_text)
+    
+    # Add experience
+    if resume_summary_data.get('experience'):
+        for exp in resume_summary_data['experience'][:3]:  # Top 3 experiences
+            exp_text = f"Experience: {exp.get('title', '')} at {exp.get('company', '')}"
+            if exp.get('bullets'):
+                exp_text += " - " + " ".join(exp['bullets'][:2])
+            resume_text_parts.append(exp_text)
+    
+    # Add projects
+    if resume_summary_data.get('projects'):
+        for proj in resume_summary_data['projects'][:2]:  # Top 2 projects
+            proj_text = f"Project: {proj.get('title', '')}"
+            if proj.get('bullets'):
+                proj_text += " - " + " ".join(proj['bullets'][:2])
+            resume_text_parts.append(proj_text)
+    
+    # Add education
+    if resume_summary_data.get('education'):
+        for edu in resume_summary_data['education'][:2]:
+            edu_text = f"Education: {edu.get('degree', '')} from {edu.get('institution', '')}"
+            resume_text_parts.append(edu_text)
+    
+    # Combine all parts
+    resume_text = "\n".join(resume_text_parts)
+    
+    if not resume_text.strip():
+        resume_text = "Looking for internship opportunities"
+    return resume_text
+
+def load_jobs_by_ids(job_ids, include_description=False):
+    """
+    Fetch jobs with a single query and return a dict of job id -> job dict.
+
+    Without include_description only the card columns are selected, so
+    full_description is neither loaded nor shipped. Unknown and soft-deleted
+    ids are skipped.
+    """
+    if not job_ids:
+        return {}
+    
+    if include_description:
+        return {job.id: job.to_dict() for job in Job.active().filter(Job.id.in_(job_ids)).all()}
+    
+    by_id = {}
+    rows = db.session.query(*JOB_CARD_COLUMNS).filter(Job.id.in_(job_ids), Job.is_active.is_(True)).all()
+    for row in rows:
+        card = row._asdict()
+        card['created_at'] = card['created_at'].isoformat() if card['created_at'] else None
+        by_id[card['id']] = card
+    return by_id
+
+def _rank(dense_hits, resume_summary_data, top_n, mode, lexical_candidates=None):
+    """
+    Final ranking as (job_id, cosine similarity or None, signals or None).
+
+    In hybrid mode the dense candidates are fused with BM25 hits over job
+    titles and skills (restricted to lexical_candidates when given); signals
+    then carries the per-signal scores and ranks.
+    """
+    if mode == 'dense':
+        return [(job_id, similarity, None) for job_id, similarity in dense_hits[:top_n]]
+    if mode != 'hybrid':
+        raise ValueError(f"Unknown retrieval mode: {mode}")
+    
+    lexical_hits = get_lexical_index().search(
+        resume_terms(resume_summary_data, normalize_skill),
+        max(top_n, Config.HYBRID_CANDIDATES),
+        lexical_candidates
+    )
+    fused = fuse_rankings(
+        dense_hits,
+        lexical_hits,
+        method=Config.HYBRID_FUSION,
+        dense_weight=Config.HYBRID_DENSE_WEIGHT
+    )
+    return [(job_id, signals['dense'], signals) for job_id, signals in fused[:top_n]]
+
+def _build_recommendations(ranked, jobs_by_id):
+    """Turn ranked (job_id, cosine similarity, signals) tuples into job dicts, keeping the order"""
+    recommendations = []
+    for job_id, similarity, signals in ranked:
+        job = jobs_by_id.get(job_id)
+        if job is None:
+            continue
+        job_dict = dict(job)
+        if similarity is not None:
+            job_dict['similarity_score'] = round(max(0.0, min(100.0, similarity * 100)), 2)
+            job_dict['cosine_similarity'] = round(similarity, 4)
+        else:
+            # Lexical-only hit in hybrid mode: not among the dense candidates
+            job_dict['similarity_score'] = None
+            job_dict['cosine_similarity'] = None
+        if signals is not None:
+            job_dict['scores'] = {
+                key: round(value, 6) if isinstance(value, float) else value
+                for key, value in signals.items()
+            }
+        recommendations.append(job_dict)
+    return recommendations
+
+def _recommendation_key(resume_summary_data, resume_text, top_n, include_description, mode,
+                        skills, skill_match, filters):
+    """Cache key of one recommendation request against the current catalog"""
+    # Hybrid ranking also reads the skills/titles directly, not just the query text
+    terms = sorted(resume_terms(resume_summary_data, normalize_skill)) if mode == 'hybrid' else None
+    return cache_key(
+        _catalog_version, resume_text, terms, top_n, include_description, mode,
+        sorted(normalize_skill(skill) for skill in skills or []), skill_match, filters
+    )
+
+def get_job_recommendations(resume_summary_data, top_n=10, include_description=False, mode=None,
+                            skills=None, skill_match='any', filters=None):
     """
     Get job recommendations based on resume summary using semantic search
     
+    Results are cached by query text and options until the catalog changes.
+    
     Args:
         resume_summary_data: Dictionary containing parsed resume information
         top_n: Number of recommendations to return
+        include_description: Include each job's full_description
+        mode: 'dense' (vector search) or 'hybrid' (vector + BM25 fusion);
+            defaults to RETRIEVAL_MODE
+        skills: Only consider jobs requiring these skills
+        skill_match: 'any' or 'all' of the skills
+        filters: Job filters applied inside the retrieval backend, see
+            normalize_job_filters
     
     Returns:
         List of recommended jobs with similarity scores
@@ -98,69 +528,38 @@ def get_job_recommendations(resume_summary_data, top_n=10):
         if vectorstore is None:
             return {"error": "Vector store not initialized"}
         
-        # Build resume text for search
-        resume_text_parts = []
-        
-        # Add AI summary if available
-        if resume_summary_data.get('ai_summary'):
-            resume_text_parts.append(resume_summary_data['ai_summary'])
-        
-        # Add skills
-        if resume_summary_data.get('skills'):
-            skills_text = "Skills: " + ", ".join(resume_summary_data['skills'])
-            resume_text_parts.append(skills_text)
-        
-        # Add experience
-        if resume_summary_data.get('experience'):
-            for exp in resume_summary_data['experience'][:3]:  # Top 3 experiences
-                exp_text = f"Experience: {exp.get('title', '')} at {exp.get('company', '')}"
-                if exp.get('bullets'):
-                    exp_text += " - " + " ".join(exp['bullets'][:2])
-                resume_text_parts.append(exp_text)
-        
-        # Add projects
-        if resume_summary_data.get('projects'):
-            for proj in resume_summary_data['projects'][:2]:  # Top 2 projects
-                proj_text = f"Project: {proj.get('title', '')}"
-                if proj.get('bullets'):
-                    proj_text += " - " + " ".join(proj['bullets'][:2])
-                resume_text_parts.append(proj_text)
-        
-        # Add education
-        if resume_summary_data.get('education'):
-            for edu in resume_summary_data['education'][:2]:
-                edu_text = f"Education: {edu.get('degree', '')} from {edu.get('institution', '')}"
-                resume_text_parts.append(edu_text)
-        
-        # Combine all parts
-        resume_text = "\n".join(resume_text_parts)
-        
-        if not resume_text.strip():
-            resume_text = "Looking for internship opportunities"
+        resume_text = build_resume_query_text(resume_summary_data)
+        mode = mode or Config.RETRIEVAL_MODE
+        filters = normalize_job_filters(filters)
+        
+        key = _recommendation_key(resume_summary_data, resume_text, top_n, include_description,
+                                  mode, skills, skill_match, filters)
+        cached = _recommendation_cache.get(key)
+        if cached is not None:
+            print("⚡ Recommendations served from cache")
+            return cached
         
         print(f"🔍 Searching with resume text (length: {len(resume_text)} chars)")
         
-        # Perform semantic search with scores
-        matched_docs_and_scores = vectorstore.similarity_search_with_score(resume_text, k=top_n)
+        candidates = max(top_n, Config.HYBRID_CANDIDATES) if mode == 'hybrid' else top_n
         
-        print(f"✅ Found {len(matched_docs_and_scores)} matches")
+        # Narrow the search to jobs passing the skill filter
+        candidate_ids = _skill_candidates(skills, skill_match)
+        if candidate_ids is not None and not candidate_ids:
+            return []
+        lexical_candidates = _filtered_job_ids(candidate_ids, filters) if mode == 'hybrid' else None
         
-        # Build recommendations
-        recommendations = []
-        for doc, score in matched_docs_and_scores:
-            meta = doc.metadata
-            
-            # Get the full job object from database for complete data
-            job = Job.query.get(meta.get('id'))
-            if job:
-                job_dict = job.to_dict()
-                # Convert distance score to similarity percentage (lower distance = higher similarity)
-                # Chroma returns L2 distance, so we invert it
-                similarity_percentage = max(0, min(100, (1 - score) * 100))
-                job_dict['similarity_score'] = round(similarity_percentage, 2)
-                job_dict['raw_distance'] = round(float(score), 4)
-                recommendations.append(job_dict)
+        # Perform semantic search with cosine similarities
+        query_vector = get_embeddings().embed_query(resume_text)
+        hits = vectorstore.search(query_vector, candidates, candidate_ids, filters)
+        ranked = _rank(hits, resume_summary_data, top_n, mode, lexical_candidates)
         
+        print(f"✅ Found {len(ranked)} matches")
+        
+        # Fetch every matched job in one query
+        jobs_by_id = load_jobs_by_ids([job_id for job_id, _, _ in ranked], include_description=include_description)
+        recommendations = _build_recommendations(ranked, jobs_by_id)
+        _recommendation_cache.put(key, recommendations)
         return recommendations
         
     except Exception as e:
@@ -169,8 +568,97 @@ def get_job_recommendations(resume_summary_data, top_n=10):
         traceback.print_exc()
         return {"error": str(e)}
 
+def get_job_recommendations_batch(resume_summaries, top_n=10, include_description=False, mode=None,
+                                  skills=None, skill_match='any', filters=None):
+    """
+    Get job recommendations for many parsed resumes at once
+    
+    Cached resumes are answered from the recommendation cache; the rest
+    are embedded in one model call, searched with one batched backend
+    query, and the matched jobs are loaded with one database query.
+    
+    Args:
+        resume_summaries: List of dictionaries containing parsed resume information
+        top_n: Number of recommendations per resume
+        include_description: Include each job's full_description
+        mode: 'dense' or 'hybrid'; defaults to RETRIEVAL_MODE
+        skills: Only consider jobs requiring these skills
+        skill_match: 'any' or 'all' of the skills
+        filters: Job filters applied inside the retrieval backend, see
+            normalize_job_filters
+    
+    Returns:
+        List with one recommendation list per resume, in input order
+    """
+    try:
+        vectorstore = get_vectorstore()
+        
+        if vectorstore is None:
+            return {"error": "Vector store not initialized"}
+        if not resume_summaries:
+            return []
+        
+        mode = mode or Config.RETRIEVAL_MODE
+        filters = normalize_job_filters(filters)
+        resume_texts = [build_resume_query_text(summary) for summary in resume_summaries]
+        keys = [
+            _recommendation_key(summary, text, top_n, include_description, mode, skills, skill_match, filters)
+            for summary, text in zip(resume_summaries, resume_texts)
+        ]
+        results = [_recommendation_cache.get(key) for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        
+        print(f"🔍 Batch search for {len(pending)} resumes ({len(results) - len(pending)} cached)")
+        if not pending:
+            return results
+        
+        candidates = max(top_n, Config.HYBRID_CANDIDATES) if mode == 'hybrid' else top_n
+        
+        candidate_ids = _skill_candidates(skills, skill_match)
+        if candidate_ids is not None and not candidate_ids:
+            return [[] for _ in resume_summaries]
+        lexical_candidates = _filtered_job_ids(candidate_ids, filters) if mode == 'hybrid' else None
+        
+        query_vectors = get_embeddings().embed_documents([resume_texts[i] for i in pending])
+        hits_per_resume = vectorstore.search_many(query_vectors, candidates, candidate_ids, filters)
+        ranked_per_resume = [
+            _rank(hits, resume_summaries[i], top_n, mode, lexical_candidates)
+            for hits, i in zip(hits_per_resume, pending)
+        ]
+        
+        job_ids = {job_id for ranked in ranked_per_resume for job_id, _, _ in ranked}
+        jobs_by_id = load_jobs_by_ids(list(job_ids), include_description=include_description)
+        for ranked, i in zip(ranked_per_resume, pending):
+            results[i] = _build_recommendations(ranked, jobs_by_id)
+            _recommendation_cache.put(keys[i], results[i])
+        return results
+        
+    except Exception as e:
+        print(f"❌ Error in batch recommendation logic: {e}")
+        import traceback
+        traceback.print_exc()
+        return {"error": str(e)}
+
+def update_vectorstore(changed_ids, removed_ids):
+    """Re-index only the given jobs (e.g. after an import)"""
+    _reset_job_indexes()
+    if _vectorstore is None:
+        return initialize_vectorstore_from_db()
+    stats = sync_vectorstore(_vectorstore, job_ids=changed_ids, removed_ids=removed_ids)
+    # Again, for anything cached while the sync was running
+    _invalidate_recommendations()
+    print(f"✅ Vector store updated: {stats['added']} embedded, {stats['removed']} removed.")
+    return _vectorstore
+
+def mark_vectorstore_stale():
+    """Drop the open vector store after a failed update; the next use re-syncs it with the jobs table"""
+    global _vectorstore
+    with _init_lock:
+        _vectorstore = None
+        _reset_job_indexes()
+
 def reinitialize_vectorstore():
-    """Force reinitialize vector store (useful after database updates)"""
+    """Re-sync vector store with the database (useful after database updates)"""
     global _vectorstore
     _vectorstore = None
     return initialize_vectorstore_from_db()
\ No newline at end of file
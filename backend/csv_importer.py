@@ -1,63 +1,369 @@
-import pandas as pd
-from models import db, Job
+import csv
+import hashlib
+import io
+import time
+from datetime import datetime
+
+from sqlalchemy import delete, update
+from models import db, Job, JobSkill
 from config import Config
+from resume_parser import normalize_skill
+from skill_index import parse_required_skills
+from job_fields import normalize_location, parse_stipend, parse_duration_months
+
+# CSV columns copied into the jobs table
+JOB_COLUMNS = [
+    'internship_title', 'company_name', 'location', 'full_description',
+    'required_skills', 'stipend_inr', 'duration_months'
+]
+REQUIRED_COLUMNS = ('internship_title', 'company_name')
+# Filter columns parsed from the text columns (see _derived_fields)
+DERIVED_COLUMNS = ('location_key', 'stipend_min', 'duration_months_min')
+
+# Keep IN (...) lists well below database parameter limits
+_ID_CHUNK_SIZE = 500
+
+def _iter_csv_chunks(csv_path, chunksize):
+    """Stream the CSV as DataFrames of string columns"""
+    import pandas as pd
+    for chunk in pd.read_csv(csv_path, encoding="utf-8", dtype=str, chunksize=chunksize):
+        chunk = chunk.fillna("N/A")
+        for column in JOB_COLUMNS:
+            if column not in chunk.columns:
+                chunk[column] = ''
+        yield chunk
+
+def _source_key(record, source_id=None):
+    """Natural key of a job: the source id column if present, else title + company + location"""
+    if source_id not in (None, '', 'N/A'):
+        key = f"id:{source_id}"
+    else:
+        key = "|".join(record[column].strip().lower() for column in ('internship_title', 'company_name', 'location'))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def _row_hash(record):
+    return hashlib.sha256("\x1f".join(record[column] for column in JOB_COLUMNS).encode('utf-8')).hexdigest()
+
+def _derived_fields(record):
+    return {
+        'location_key': normalize_location(record['location']),
+        'stipend_min': parse_stipend(record['stipend_inr']),
+        'duration_months_min': parse_duration_months(record['duration_months']),
+    }
+
+def _prepare_chunk(chunk):
+    """
+    Validate a chunk and turn it into job records with source key, content
+    hash and the parsed filter columns.
+
+    Returns:
+        (records, number of rejected rows)
+    """
+    import pandas as pd
+    source_ids = chunk[Config.CSV_SOURCE_ID_COLUMN] if Config.CSV_SOURCE_ID_COLUMN in chunk.columns else None
+    chunk = chunk[JOB_COLUMNS].apply(lambda col: col.str.strip())
+    valid = pd.Series(True, index=chunk.index)
+    for column in REQUIRED_COLUMNS:
+        valid &= ~chunk[column].isin(['', 'N/A'])
+    # Truncate to the column sizes so one long value can't fail the whole transaction
+    for column in JOB_COLUMNS:
+        length = getattr(Job.__table__.c[column].type, 'length', None)
+        if length:
+            chunk[column] = chunk[column].str.slice(0, length)
+
+    records = []
+    for index, record in zip(chunk.index[valid], chunk[valid].to_dict('records')):
+        record['source_key'] = _source_key(record, source_ids[index] if source_ids is not None else None)
+        record['content_hash'] = _row_hash(record)
+        record.update(_derived_fields(record))
+        records.append(record)
+    return records, int((~valid).sum())
+
+def _bulk_insert(records):
+    """Insert job records with COPY on PostgreSQL and executemany elsewhere"""
+    if not records:
+        return
+    if db.engine.dialect.name == 'postgresql':
+        columns = list(records[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+        for record in records:
+            writer.writerow([record[column] for column in columns])
+        buffer.seek(0)
+        raw_connection = db.session.connection().connection
+        # Everything is quoted, so NULLs of the parsed columns arrive as "" and need FORCE_NULL
+        force_null = [column for column in columns if column in DERIVED_COLUMNS]
+        options = f", FORCE_NULL ({', '.join(force_null)})" if force_null else ""
+        with raw_connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {Job.__tablename__} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv{options})",
+                buffer
+            )
+    else:
+        db.session.execute(Job.__table__.insert(), records)
+
+def _ids_for_keys(source_keys):
+    ids = []
+    for i in range(0, len(source_keys), _ID_CHUNK_SIZE):
+        chunk = source_keys[i:i + _ID_CHUNK_SIZE]
+        ids.extend(job_id for (job_id,) in db.session.query(Job.id).filter(Job.source_key.in_(chunk)))
+    return ids
 
-def import_jobs_from_csv(csv_path=None):
-    """Import jobs from CSV file into database"""
-    if csv_path is None:
-        csv_path = Config.CSV_FILE
-    
+def _write_job_skills(job_ids):
+    """Replace the job_skills rows of the given jobs with their parsed required_skills"""
+    skill_length = JobSkill.__table__.c.skill.type.length
+    for i in range(0, len(job_ids), _ID_CHUNK_SIZE):
+        chunk = job_ids[i:i + _ID_CHUNK_SIZE]
+        db.session.execute(delete(JobSkill).where(JobSkill.job_id.in_(chunk)))
+        rows = []
+        for job_id, required_skills in db.session.query(Job.id, Job.required_skills).filter(Job.id.in_(chunk)):
+            skills = dict.fromkeys(skill[:skill_length] for skill in parse_required_skills(required_skills, normalize_skill))
+            rows.extend({'job_id': job_id, 'skill': skill} for skill in skills)
+        if rows:
+            db.session.execute(JobSkill.__table__.insert(), rows)
+
+def ensure_job_skills():
+    """Fill job_skills for databases imported before the skill index existed"""
+    if db.session.query(JobSkill.job_id).first() is not None:
+        return 0
+    missing = [job_id for (job_id,) in db.session.query(Job.id)]
+    if not missing:
+        return 0
+    try:
+        _write_job_skills(missing)
+        db.session.commit()
+        print(f"Indexed skills for {len(missing)} jobs")
+    except Exception as e:
+        print(f"Error indexing job skills: {e}")
+        db.session.rollback()
+    return len(missing)
+
+def ensure_job_fields():
+    """Parse the filter columns for jobs imported before they existed"""
+    rows = (
+        db.session.query(Job.id, Job.location, Job.stipend_inr, Job.duration_months)
+        .filter(Job.location_key.is_(None), Job.stipend_min.is_(None), Job.duration_months_min.is_(None))
+        .all()
+    )
+    updates = []
+    for job_id, location, stipend, duration in rows:
+        fields = _derived_fields({'location': location, 'stipend_inr': stipend, 'duration_months': duration})
+        if any(value is not None for value in fields.values()):
+            updates.append({'id': job_id, **fields})
+    if not updates:
+        return 0
     try:
-        # Read CSV file
-        df = pd.read_csv(csv_path, encoding="utf-8").fillna("N/A")
-        
-        print(f"Found {len(df)} jobs in CSV file")
-        
-        # Clear existing jobs (optional - remove if you want to keep existing data)
-        Job.query.delete()
-        
-        # Import each job
-        imported_count = 0
-        for index, row in df.iterrows():
-            try:
-                job = Job(
-                    internship_title=str(row.get('internship_title', '')),
-                    company_name=str(row.get('company_name', '')),
-                    location=str(row.get('location', '')),
-                    full_description=str(row.get('full_description', '')),
-                    required_skills=str(row.get('required_skills', '')),
-                    stipend_inr=str(row.get('stipend_inr', '')),
-                    duration_months=str(row.get('duration_months', ''))
-                )
-                db.session.add(job)
-                imported_count += 1
-                
-                # Commit in batches of 100
-                if imported_count % 100 == 0:
-                    db.session.commit()
-                    print(f"Imported {imported_count} jobs...")
-                    
-            except Exception as e:
-                print(f"Error importing row {index}: {e}")
+        db.session.execute(update(Job), updates)
+        db.session.commit()
+        print(f"Parsed location/stipend/duration for {len(updates)} jobs")
+    except Exception as e:
+        print(f"Error parsing job fields: {e}")
+        db.session.rollback()
+    return len(updates)
+
+def _backfill_source_keys(now):
+    """
+    Give rows imported before incremental imports existed a source key and hash.
+
+    Older imports kept duplicate rows, which would share a key; the first
+    row (lowest id) of each key keeps it, the others are soft-deleted
+    without a key.
+
+    Returns:
+        Ids of the deactivated duplicates
+    """
+    legacy = (
+        db.session.query(Job.id, *(getattr(Job, column) for column in JOB_COLUMNS))
+        .filter(Job.source_key.is_(None), Job.is_active.is_(True))
+        .order_by(Job.id)
+        .all()
+    )
+    if not legacy:
+        return []
+    taken = {key for (key,) in db.session.query(Job.source_key).filter(Job.source_key.isnot(None))}
+    updates, duplicate_ids = [], []
+    for row in legacy:
+        record = {column: getattr(row, column) or '' for column in JOB_COLUMNS}
+        key = _source_key(record)
+        if key in taken:
+            duplicate_ids.append(row.id)
+            continue
+        taken.add(key)
+        updates.append({'id': row.id, 'source_key': key, 'content_hash': _row_hash(record)})
+    if updates:
+        db.session.execute(update(Job), updates)
+        print(f"Backfilled source keys for {len(updates)} jobs")
+    for i in range(0, len(duplicate_ids), _ID_CHUNK_SIZE):
+        db.session.execute(
+            update(Job)
+            .where(Job.id.in_(duplicate_ids[i:i + _ID_CHUNK_SIZE]))
+            .values(is_active=False, updated_at=now)
+        )
+    if duplicate_ids:
+        print(f"Deactivated {len(duplicate_ids)} duplicate legacy jobs")
+    return duplicate_ids
+
+def _import_replace(csv_path, chunksize, now):
+    """Delete every job and insert the CSV contents"""
+    removed_ids = [job_id for (job_id,) in db.session.query(Job.id)]
+    JobSkill.query.delete()
+    Job.query.delete()
+
+    stats = {'rows_read': 0, 'inserted': 0, 'invalid': 0, 'duplicates': 0}
+    seen = set()
+    for chunk in _iter_csv_chunks(csv_path, chunksize):
+        records, invalid = _prepare_chunk(chunk)
+        unique = []
+        for record in records:
+            if record['source_key'] in seen:
+                stats['duplicates'] += 1
+                continue
+            seen.add(record['source_key'])
+            record.update(created_at=now, updated_at=now, is_active=True)
+            unique.append(record)
+        _bulk_insert(unique)
+
+        stats['rows_read'] += len(chunk)
+        stats['inserted'] += len(unique)
+        stats['invalid'] += invalid
+        print(f"Imported {stats['inserted']} jobs ({stats['rows_read']} rows read, {stats['invalid']} invalid)...")
+
+    changed_ids = [job_id for (job_id,) in db.session.query(Job.id)]
+    # SQLite reuses freed ids, so an id can be both removed and added
+    added = set(changed_ids)
+    removed_ids = [job_id for job_id in removed_ids if job_id not in added]
+    return stats, changed_ids, removed_ids
+
+def _import_incremental(csv_path, chunksize, now):
+    """
+    Upsert the CSV contents by natural key.
+
+    New rows are inserted, rows whose content hash changed are updated,
+    unchanged rows are left alone, and active rows missing from the CSV are
+    soft-deleted.
+    """
+    duplicate_ids = _backfill_source_keys(now)
+    existing = {
+        source_key: (job_id, content_hash, is_active)
+        for source_key, job_id, content_hash, is_active
+        in db.session.query(Job.source_key, Job.id, Job.content_hash, Job.is_active)
+        .filter(Job.source_key.isnot(None))
+    }
+
+    stats = {'rows_read': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0,
+             'deactivated': 0, 'invalid': 0, 'duplicates': 0}
+    changed_ids = []
+    seen = set()
+    for chunk in _iter_csv_chunks(csv_path, chunksize):
+        records, invalid = _prepare_chunk(chunk)
+        inserts, updates = [], []
+        for record in records:
+            key = record['source_key']
+            if key in seen:
+                stats['duplicates'] += 1
                 continue
-        
-        # Final commit
+            seen.add(key)
+
+            current = existing.get(key)
+            if current is None:
+                record.update(created_at=now, updated_at=now, is_active=True)
+                inserts.append(record)
+            elif current[1] != record['content_hash'] or not current[2]:
+                record.update(id=current[0], updated_at=now, is_active=True)
+                updates.append(record)
+            else:
+                stats['unchanged'] += 1
+
+        _bulk_insert(inserts)
+        if updates:
+            db.session.execute(update(Job), updates)
+        changed_ids.extend(_ids_for_keys([record['source_key'] for record in inserts]))
+        changed_ids.extend(record['id'] for record in updates)
+
+        stats['rows_read'] += len(chunk)
+        stats['inserted'] += len(inserts)
+        stats['updated'] += len(updates)
+        stats['invalid'] += invalid
+        print(f"Processed {stats['rows_read']} rows: {stats['inserted']} new, {stats['updated']} updated, {stats['unchanged']} unchanged...")
+
+    removed_ids = [job_id for key, (job_id, _, is_active) in existing.items() if is_active and key not in seen]
+    for i in range(0, len(removed_ids), _ID_CHUNK_SIZE):
+        db.session.execute(
+            update(Job)
+            .where(Job.id.in_(removed_ids[i:i + _ID_CHUNK_SIZE]))
+            .values(is_active=False, updated_at=now)
+        )
+    removed_ids.extend(duplicate_ids)
+    stats['deactivated'] = len(removed_ids)
+    return stats, changed_ids, removed_ids
+
+def import_jobs_from_csv(csv_path=None, chunksize=None, mode=None):
+    """
+    Import jobs from the CSV file.
+
+    The file is streamed in chunks, validated, and written with bulk
+    statements (COPY on PostgreSQL, executemany elsewhere) inside a single
+    transaction, so a failed import leaves the previous catalog untouched.
+
+    Modes:
+        'incremental': upsert by natural key (source id column, or title +
+            company + location) and row hash; missing rows are soft-deleted.
+            Unchanged rows cost neither a write nor a re-embedding.
+        'replace': wipe the table and insert everything.
+
+    The normalized skills of changed rows are written to job_skills in the
+    same transaction, and only the rows that changed are then (re)indexed
+    in the vector store. If that fails the import still succeeds, with a
+    warning, and the vector store is re-synced on its next use.
+
+    Returns:
+        Import report dict, or False if the import failed
+    """
+    csv_path = csv_path or Config.CSV_FILE
+    chunksize = chunksize or Config.CSV_IMPORT_CHUNK_SIZE
+    mode = mode or Config.CSV_IMPORT_MODE
+    if mode not in ('incremental', 'replace'):
+        raise ValueError(f"Unknown import mode: {mode}")
+
+    started = time.perf_counter()
+    try:
+        now = datetime.utcnow()
+        if mode == 'replace':
+            stats, changed_ids, removed_ids = _import_replace(csv_path, chunksize, now)
+        else:
+            stats, changed_ids, removed_ids = _import_incremental(csv_path, chunksize, now)
+        _write_job_skills(changed_ids)
         db.session.commit()
-        print(f"Successfully imported {imported_count} jobs!")
-        
-        # Reinitialize vector store after import
-        from core_logic import reinitialize_vectorstore
-        reinitialize_vectorstore()
-        print("✅ Vector store reinitialized with new data!")
-        
-        return True
-        
+        print(f"Successfully imported jobs ({mode}): {stats}")
+
     except Exception as e:
-        print(f"Error reading CSV file: {e}")
+        print(f"Error importing CSV file: {e}")
         db.session.rollback()
         return False
 
+    # Update the vector store for just the rows that changed. The jobs are
+    # committed by now, so a failure here doesn't fail the import.
+    warnings = []
+    if changed_ids or removed_ids:
+        from core_logic import update_vectorstore, mark_vectorstore_stale
+        try:
+            update_vectorstore(changed_ids=changed_ids, removed_ids=removed_ids)
+            print("✅ Vector store updated with new data!")
+        except Exception as e:
+            print(f"⚠️ Jobs imported, but updating the vector store failed: {e}")
+            mark_vectorstore_stale()
+            warnings.append(f"Vector store update failed ({e}); it is re-synced on next use")
+
+    return {
+        'mode': mode,
+        **stats,
+        'changed_ids': changed_ids,
+        'removed_ids': removed_ids,
+        'warnings': warnings,
+        'seconds': round(time.perf_counter() - started, 2)
+    }
+
 def get_import_status():
-    """Check how many jobs are in database"""
-    count = Job.query.count()
-    return count
\ No newline at end of file
+    """Check how many active jobs are in database"""
+    count = Job.active().count()
+    return count
@@ -0,0 +1,217 @@
+"""
+Inference backends for the sentence-transformers embedding model.
+
+- torch: HuggingFaceEmbeddings, as before
+- torch-int8: the same model with its Linear layers dynamically quantized to int8
+- onnx: the transformer exported to ONNX and run with ONNX Runtime; pooling
+  and normalization repeat the sentence-transformers pipeline in NumPy
+- onnx-int8: the ONNX export with dynamically quantized int8 weights
+
+ONNX exports are built on first use (this needs torch and
+sentence-transformers once) and kept under EMBEDDING_ONNX_DIR; after that
+the onnx backends only need onnxruntime and tokenizers.
+"""
+import inspect
+import json
+import os
+import shutil
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from config import Config
+
+EMBEDDING_BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+# Pooling modes of the sentence-transformers Pooling module that OnnxEmbeddings reproduces
+ONNX_POOLING_MODES = ("mean", "cls", "max")
+
+
+def embedding_model_id(model_name: str, backend: str) -> str:
+    """
+    Name that embeddings from a model/backend pair are cached under.
+
+    Quantized and exported models produce slightly different vectors, so
+    each backend gets its own cache entries; the default backend keeps the
+    bare model name and with it every existing cache entry.
+    """
+    return model_name if backend == "torch" else f"{model_name}#{backend}"
+
+
+def _set_torch_threads(threads: Optional[int]):
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+
+
+def _pooling_mode(pooling) -> str:
+    # sentence-transformers 2.x names the mode with a method, later versions with an attribute
+    if hasattr(pooling, "get_pooling_mode_str"):
+        return pooling.get_pooling_mode_str()
+    return pooling.pooling_mode
+
+
+def export_onnx(model_name: str, directory: str):
+    """Export the model's transformer, tokenizer and pooling settings to directory"""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device="cpu")
+    module_types = [type(module).__name__ for module in model]
+    if module_types[0] != "Transformer" or "Pooling" not in module_types:
+        raise ValueError(f"{model_name} is not a Transformer + Pooling model ({module_types})")
+    pooling = _pooling_mode(model[module_types.index("Pooling")])
+    if pooling not in ONNX_POOLING_MODES:
+        raise ValueError(f"Pooling mode {pooling} is not supported by the onnx backend")
+    transformer, tokenizer = model[0].auto_model, model[0].tokenizer
+
+    tmp_dir = directory + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    sample = tokenizer(["export"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names + ["last_hidden_state"]}
+
+    class Encoder(torch.nn.Module):
+        """Positional inputs -> token embeddings, whatever the model's forward() signature"""
+
+        def __init__(self):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, *inputs):
+            return self.transformer(**dict(zip(input_names, inputs)))[0]
+
+    export_kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        # Newer torch defaults to the dynamo exporter, which needs onnxscript
+        export_kwargs["dynamo"] = False
+    with torch.no_grad():
+        torch.onnx.export(
+            Encoder().eval(),
+            tuple(sample[name] for name in input_names),
+            os.path.join(tmp_dir, "model.onnx"),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+            **export_kwargs
+        )
+    tokenizer.save_pretrained(tmp_dir)
+    with open(os.path.join(tmp_dir, "embedding.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "model_name": model_name,
+            "inputs": input_names,
+            "pooling": pooling,
+            "normalize": "Normalize" in module_types,
+            "max_seq_length": model.max_seq_length,
+            "pad_token": tokenizer.pad_token,
+        }, f, indent=2)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_dir, directory)
+
+
+def quantize_onnx(directory: str):
+    """Write model_int8.onnx next to model.onnx (dynamic int8 weight quantization)"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    tmp_path = os.path.join(directory, "model_int8.onnx.tmp")
+    quantize_dynamic(os.path.join(directory, "model.onnx"), tmp_path, weight_type=QuantType.QInt8)
+    os.replace(tmp_path, os.path.join(directory, "model_int8.onnx"))
+
+
+class OnnxEmbeddings(Embeddings):
+    """Embeddings from an export_onnx() directory, run with ONNX Runtime on the CPU"""
+
+    def __init__(self, directory: str, quantized: bool = False, threads: Optional[int] = None,
+                 batch_size: int = 32):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(directory, "embedding.json"), encoding="utf-8") as f:
+            self.settings = json.load(f)
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        model_file = "model_int8.onnx" if quantized else "model.onnx"
+        self._session = onnxruntime.InferenceSession(
+            os.path.join(directory, model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self._tokenizer = Tokenizer.from_file(os.path.join(directory, "tokenizer.json"))
+        self._tokenizer.enable_truncation(self.settings["max_seq_length"])
+        pad_token = self.settings["pad_token"]
+        self._tokenizer.enable_padding(pad_id=self._tokenizer.token_to_id(pad_token), pad_token=pad_token)
+        self.batch_size = batch_size
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self._tokenizer.encode_batch(texts)
+        columns = {
+            "input_ids": [e.ids for e in encodings],
+            "attention_mask": [e.attention_mask for e in encodings],
+            "token_type_ids": [e.type_ids for e in encodings],
+        }
+        feeds = {name: np.array(columns[name], dtype=np.int64) for name in self.settings["inputs"]}
+        hidden = self._session.run(["last_hidden_state"], feeds)[0]
+        mask = feeds["attention_mask"][:, :, None].astype(hidden.dtype)
+        pooling = self.settings["pooling"]
+        if pooling == "mean":
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        elif pooling == "cls":
+            pooled = hidden[:, 0]
+        else:
+            pooled = np.where(mask > 0, hidden, -1e9).max(axis=1)
+        if self.settings["normalize"]:
+            norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+            pooled = pooled / np.clip(norms, 1e-12, None)
+        return pooled.astype(np.float32)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        # Batch texts of similar length together to keep padding short, like sentence-transformers
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        vectors = np.empty((len(texts), 0), dtype=np.float32)
+        for start in range(0, len(order), self.batch_size):
+            rows = order[start:start + self.batch_size]
+            batch = self._embed_batch([texts[i] for i in rows])
+            if vectors.shape[1] == 0:
+                vectors = np.empty((len(texts), batch.shape[1]), dtype=np.float32)
+            vectors[rows] = batch
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed_batch([text])[0].tolist()
+
+
+def load_embedding_model(model_name: str, backend: str = "torch", threads: Optional[int] = None,
+                         batch_size: Optional[int] = None, onnx_dir: Optional[str] = None) -> Embeddings:
+    """
+    The embedding model run by the given backend (see EMBEDDING_BACKENDS).
+
+    threads caps the intra-op threads of torch or ONNX Runtime (None keeps
+    their default of one per core); batch_size is texts per forward pass.
+    """
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend} (expected one of {', '.join(EMBEDDING_BACKENDS)})")
+
+    if backend.startswith("onnx"):
+        directory = os.path.join(onnx_dir or Config.EMBEDDING_ONNX_DIR, model_name.replace("/", "--"))
+        if not os.path.exists(os.path.join(directory, "embedding.json")):
+            print(f"📦 Exporting {model_name} to ONNX in {directory}...")
+            export_onnx(model_name, directory)
+        quantized = backend == "onnx-int8"
+        if quantized and not os.path.exists(os.path.join(directory, "model_int8.onnx")):
+            print(f"📦 Quantizing the ONNX export of {model_name} to int8...")
+            quantize_onnx(directory)
+        return OnnxEmbeddings(directory, quantized=quantized, threads=threads, batch_size=batch_size or 32)
+
+    _set_torch_threads(threads)
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+    encode_kwargs = {"batch_size": batch_size} if batch_size else {}
+    model = HuggingFaceEmbeddings(model_name=model_name, encode_kwargs=encode_kwargs)
+    if backend == "torch-int8":
+        import torch
+        model.client = torch.ao.quantization.quantize_dynamic(model.client, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
@@ -0,0 +1,295 @@
+"""
+Local embedding server with dynamic micro-batching.
+
+    python embedding_server.py [--host 127.0.0.1] [--port 8765]
+                               [--max-batch-size N] [--max-wait-ms MS]
+                               [--backend torch|torch-int8|onnx|onnx-int8] [--threads N]
+
+Loads EMBEDDING_MODEL_NAME once and serves it over HTTP. Concurrent
+requests, from any number of web workers and threads, are gathered into
+micro-batches that run as one forward pass. Point the web app (and
+bulk_parse.py --embed) at it with EMBEDDING_SERVER_URL=http://127.0.0.1:8765
+and they embed through RemoteEmbeddings instead of loading the model;
+their embedding cache still answers repeated texts locally.
+
+    POST /embed   {"texts": [...]} -> {"model", "dim", "embeddings": base64 float32 rows}
+    GET  /stats   queue depth, batch size histogram, queue wait and forward pass times
+    GET  /health
+"""
+import argparse
+import base64
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from config import Config
+from embedding_backends import EMBEDDING_BACKENDS, embedding_model_id, load_embedding_model
+
+
+class EmbeddingServerError(RuntimeError):
+    """The embedding server could not be reached or refused the request"""
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent embedding requests into batches.
+
+    One thread takes the oldest waiting request and keeps adding requests
+    until max_batch_size texts are gathered or that request has waited
+    max_wait_ms, then embeds all their texts with a single call. A request
+    with more than max_batch_size texts runs as a batch of its own.
+    """
+
+    BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+    def __init__(self, embed: Callable[[List[str]], List[List[float]]], max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0):
+        self._embed = embed
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._waiting_requests = 0
+        self._waiting_texts = 0
+        self._counters = {"requests": 0, "texts": 0, "batches": 0, "errors": 0}
+        self._largest_batch = 0
+        self._wait_seconds = 0.0
+        self._forward_seconds = 0.0
+        self._batch_sizes = {self._bucket(size): 0 for size in self.BATCH_SIZE_BUCKETS}
+        self._batch_sizes[self._bucket(self.BATCH_SIZE_BUCKETS[-1] + 1)] = 0
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def _bucket(self, size: int) -> str:
+        for bound in self.BATCH_SIZE_BUCKETS:
+            if size <= bound:
+                return f"<={bound}"
+        return f">{self.BATCH_SIZE_BUCKETS[-1]}"
+
+    def embed(self, texts: List[str], timeout: Optional[float] = None) -> np.ndarray:
+        """Embed texts as part of the next batch; blocks until that batch has run"""
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        future = Future()
+        with self._lock:
+            self._waiting_requests += 1
+            self._waiting_texts += len(texts)
+        self._queue.put((texts, future, time.perf_counter()))
+        return future.result(timeout)
+
+    def _run(self):
+        carried = None
+        while True:
+            first = carried or self._queue.get()
+            carried = None
+            batch, size = [first], len(first[0])
+            # The deadline counts from the first request's arrival, so time it
+            # spent queued behind the previous batch is not added again; past
+            # it, requests that are already waiting still join the batch
+            deadline = first[2] + self.max_wait
+            while size < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if size + len(item[0]) > self.max_batch_size:
+                    carried = item
+                    break
+                batch.append(item)
+                size += len(item[0])
+            self._run_batch(batch, size)
+
+    def _run_batch(self, batch, size: int):
+        started = time.perf_counter()
+        with self._lock:
+            self._waiting_requests -= len(batch)
+            self._waiting_texts -= size
+            self._wait_seconds += sum(started - enqueued for _, _, enqueued in batch)
+        try:
+            vectors = np.asarray(self._embed([text for texts, _, _ in batch for text in texts]), dtype=np.float32)
+        except Exception as e:
+            with self._lock:
+                self._counters["errors"] += 1
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        elapsed = time.perf_counter() - started
+        offset = 0
+        for texts, future, _ in batch:
+            future.set_result(vectors[offset:offset + len(texts)])
+            offset += len(texts)
+        with self._lock:
+            self._counters["requests"] += len(batch)
+            self._counters["texts"] += size
+            self._counters["batches"] += 1
+            self._largest_batch = max(self._largest_batch, size)
+            self._forward_seconds += elapsed
+            self._batch_sizes[self._bucket(size)] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            batches, requests = self._counters["batches"], self._counters["requests"]
+            return {
+                "queue_depth": self._waiting_requests,
+                "queued_texts": self._waiting_texts,
+                **self._counters,
+                "avg_batch_size": round(self._counters["texts"] / batches, 2) if batches else 0.0,
+                "max_batch_size": self._largest_batch,
+                "batch_sizes": dict(self._batch_sizes),
+                "avg_queue_wait_ms": round(self._wait_seconds / requests * 1000, 2) if requests else 0.0,
+                "avg_forward_ms": round(self._forward_seconds / batches * 1000, 2) if batches else 0.0,
+            }
+
+
+def create_server(batcher: MicroBatcher, model_name: str, host: str = "127.0.0.1", port: int = 8765,
+                  request_timeout: float = 30.0) -> ThreadingHTTPServer:
+    """HTTP server answering /embed through the batcher (call serve_forever() to run it)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, so clients reuse one connection per thread; headers and
+        # body are separate writes, which Nagle's algorithm would delay
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _send(self, status: int, body: Dict):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok", "model": model_name})
+            elif self.path == "/stats":
+                self._send(200, {"model": model_name, **batcher.stats()})
+            else:
+                self._send(404, {"error": "Not found"})
+
+        def do_POST(self):
+            if self.path != "/embed":
+                self._send(404, {"error": "Not found"})
+                return
+            try:
+                texts = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))["texts"]
+                if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                    raise TypeError
+            except (ValueError, KeyError, TypeError):
+                self._send(400, {"error": 'Body must be {"texts": [<string>, ...]}'})
+                return
+            try:
+                vectors = batcher.embed(texts, timeout=request_timeout)
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+                return
+            self._send(200, {
+                "model": model_name,
+                "dim": int(vectors.shape[1]) if len(texts) else 0,
+                "embeddings": base64.b64encode(np.ascontiguousarray(vectors, dtype="<f4").tobytes()).decode("ascii"),
+            })
+
+        def log_message(self, format, *args):
+            # One line per request would flood the log at the rates this serves
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+class RemoteEmbeddings(Embeddings):
+    """LangChain embeddings served by a running embedding_server.py, so this process never loads the model"""
+
+    def __init__(self, url: str, model_name: str, timeout: float = 10.0):
+        self.url = url
+        self.model_name = model_name
+        self.timeout = timeout
+        parts = urlsplit(url)
+        self._host, self._port = parts.hostname, parts.port or 80
+        self._local = threading.local()
+
+    def _connection(self):
+        # One keep-alive connection per thread; a forked child opens its own
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = http.client.HTTPConnection(self._host, self._port, timeout=self.timeout)
+            self._local.conn, self._local.pid = conn, os.getpid()
+            self._local.reused = False
+        return conn
+
+    def _post(self, texts: List[str]) -> np.ndarray:
+        body = json.dumps({"texts": texts})
+        for attempt in (1, 2):
+            conn = self._connection()
+            reused = self._local.reused
+            try:
+                conn.request("POST", "/embed", body, {"Content-Type": "application/json"})
+                response = conn.getresponse()
+                payload = json.loads(response.read())
+                self._local.reused = True
+                break
+            except (OSError, http.client.HTTPException, ValueError) as e:
+                conn.close()
+                self._local.conn = None
+                # A kept-alive connection the server has since closed gets one retry
+                if attempt == 1 and reused:
+                    continue
+                raise EmbeddingServerError(f"Embedding server at {self.url} is unavailable: {e}") from e
+
+        if response.status != 200:
+            raise EmbeddingServerError(f"Embedding server error: {payload.get('error', response.status)}")
+        if payload["model"] != self.model_name:
+            # Vectors of another model would poison the embedding cache and the index
+            raise EmbeddingServerError(f"Embedding server runs {payload['model']}, expected {self.model_name}")
+        vectors = np.frombuffer(base64.b64decode(payload["embeddings"]), dtype="<f4")
+        return vectors.reshape(len(texts), payload["dim"])
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self._post(list(texts)).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._post([text])[0].tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch-size", type=int, default=Config.EMBEDDING_BATCH_MAX_SIZE,
+                        help="texts per forward pass")
+    parser.add_argument("--max-wait-ms", type=float, default=Config.EMBEDDING_BATCH_MAX_WAIT_MS,
+                        help="longest a request waits for others to join its batch")
+    parser.add_argument("--backend", choices=EMBEDDING_BACKENDS, default=Config.EMBEDDING_BACKEND)
+    parser.add_argument("--threads", type=int, default=Config.EMBEDDING_THREADS or None,
+                        help="intra-op threads (default: one per core)")
+    args = parser.parse_args()
+
+    # A whole micro-batch goes through the model as one encode batch
+    model = load_embedding_model(Config.EMBEDDING_MODEL_NAME, args.backend, args.threads, args.max_batch_size)
+    model.embed_documents(["warm up"])
+    model_id = embedding_model_id(Config.EMBEDDING_MODEL_NAME, args.backend)
+    batcher = MicroBatcher(model.embed_documents, args.max_batch_size, args.max_wait_ms)
+    server = create_server(batcher, model_id, args.host, args.port)
+    print(f"✅ Embedding server for {model_id} listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("⏹️ Embedding server stopped")
+
+
+if __name__ == "__main__":
+    main()
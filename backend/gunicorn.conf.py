@@ -0,0 +1,38 @@
+"""
+Gunicorn settings for running the API with several worker processes.
+
+    gunicorn -c gunicorn.conf.py
+
+The app is created once in the master (preload_app) with the catalog,
+embedding model, vector index and job indexes loaded before any worker is
+forked, so workers share those pages copy-on-write instead of each loading
+its own copy. Use RETRIEVAL_BACKEND=numpy: its memory-mapped matrix is
+shared through the page cache and index updates written by one worker are
+picked up by the others (INDEX_REFRESH_SECONDS) without re-embedding.
+A Chroma index can't cross a fork and is reopened by every worker.
+"""
+import gc
+import os
+
+bind = os.environ.get('GUNICORN_BIND') or '0.0.0.0:5000'
+workers = int(os.environ.get('GUNICORN_WORKERS') or 2)
+threads = int(os.environ.get('GUNICORN_THREADS') or 4)
+timeout = int(os.environ.get('GUNICORN_TIMEOUT') or 120)
+
+preload_app = True
+wsgi_app = 'app:create_app(prefork=True)'
+
+# The tokenizer's thread pool doesn't survive a fork; without this it
+# warns and disables itself in every worker
+os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+
+
+def pre_fork(server, worker):
+    # Keep everything loaded so far out of the cyclic GC: collections in the
+    # workers would otherwise write to (and so copy) the shared pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    import app
+    app.init_worker(server.app.wsgi())
@@ -0,0 +1,96 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from models import db, Job
+
+# Per-process model used by pool workers (see _init_worker)
+_worker_model = None
+
+
+def iter_job_pages(page_size: int, query=None) -> Iterator[List[Job]]:
+    """
+    Yield jobs page by page using keyset pagination on the primary key.
+
+    Each page is detached from the session once the caller is done with it,
+    so memory stays flat no matter how large the jobs table is.
+    """
+    if query is None:
+        query = Job.active()
+    last_id = 0
+    while True:
+        page = query.filter(Job.id > last_id).order_by(Job.id).limit(page_size).all()
+        if not page:
+            return
+        yield page
+        last_id = page[-1].id
+        for job in page:
+            db.session.expunge(job)
+
+
+def _init_worker(model_name: str, backend: str, threads: int):
+    global _worker_model
+    from embedding_backends import load_embedding_model
+    _worker_model = load_embedding_model(model_name, backend, threads=threads)
+
+
+def _embed_in_worker(texts: List[str]) -> List[List[float]]:
+    return _worker_model.embed_documents(texts)
+
+
+class EmbeddingPipeline:
+    """
+    Embeds texts in fixed-size batches through the embedding cache.
+
+    With workers > 0, cache misses are spread over a process pool where each
+    worker holds its own copy of the model; otherwise the already loaded
+    in-process model is used. The pool is only started once there is
+    something to embed, so a sync with no changes never spawns it.
+    """
+
+    def __init__(self, embeddings, model_name: str, batch_size: int = 256, workers: int = 0,
+                 backend: str = "torch"):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.backend = backend
+        self.batch_size = max(1, batch_size)
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Split the cores between workers instead of letting each torch
+            # instance grab all of them
+            threads = max(1, (os.cpu_count() or 1) // self.workers)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_name, self.backend, threads)
+            )
+        return self._pool
+
+    def _compute(self, texts: List[str]) -> List[List[float]]:
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if self.workers > 0:
+            results = self._get_pool().map(_embed_in_worker, batches)
+        else:
+            results = (self.embeddings.underlying.embed_documents(batch) for batch in batches)
+        return [vec for batch_vectors in results for vec in batch_vectors]
+
+    def embed(self, texts: List[str]) -> List[np.ndarray]:
+        return self.embeddings.embed_documents_with(texts, self._compute)
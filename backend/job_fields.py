@@ -0,0 +1,53 @@
+import re
+from typing import Optional
+
+# Spellings folded into one location key
+LOCATION_ALIASES = {
+    "bengaluru": "bangalore",
+    "gurugram": "gurgaon",
+    "new delhi": "delhi",
+    "bombay": "mumbai",
+    "madras": "chennai",
+    "vizag": "visakhapatnam",
+    "work from home": "remote",
+    "wfh": "remote",
+}
+
+_NUMBER_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(k\b)?", re.IGNORECASE)
+_WEEKS_PER_MONTH = 52 / 12
+
+
+def normalize_location(location: str) -> Optional[str]:
+    """Lowercase location key used for exact-match filters ("Bengaluru " -> "bangalore")"""
+    key = " ".join(re.findall(r"[a-z]+", (location or "").lower()))
+    if not key or key == "n a":
+        return None
+    return LOCATION_ALIASES.get(key, key)
+
+
+def parse_stipend(stipend: str) -> Optional[int]:
+    """
+    Lower bound of a stipend string in INR.
+
+    "15000", "10,000 - 15,000", "12k /month" and "Unpaid" give 15000,
+    10000, 12000 and 0; values without a number give None.
+    """
+    text = (stipend or "").replace(",", "")
+    amounts = [float(value) * (1000 if k else 1) for value, k in _NUMBER_RE.findall(text)]
+    if amounts:
+        return int(min(amounts))
+    if "unpaid" in text.lower():
+        return 0
+    return None
+
+
+def parse_duration_months(duration: str) -> Optional[float]:
+    """Lower bound of a duration string in months ("3-6", "6 Months", "8 weeks")"""
+    text = (duration or "").lower()
+    values = [float(value) for value, _ in _NUMBER_RE.findall(text)]
+    if not values:
+        return None
+    months = min(values)
+    if "week" in text:
+        months /= _WEEKS_PER_MONTH
+    return round(months, 2)
@@ -0,0 +1,132 @@
+import math
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from skill_index import parse_required_skills
+from skill_matcher import tokenize
+
+
+class BM25Index:
+    """
+    In-memory BM25 inverted index over job titles and required skills.
+
+    Each required skill is indexed as one normalized term (so "REST APIs"
+    and "Machine Learning" match as phrases), alongside the individual words
+    of the title. Postings are stored as numpy arrays, and a query touches
+    only the postings of its own terms.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.job_ids = np.empty(0, dtype=np.int64)
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._idf: Dict[str, float] = {}
+        self._length_norm = np.empty(0, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def build(self, documents: Iterable[Tuple[int, List[str]]]):
+        """Index (job_id, terms) pairs"""
+        job_ids, lengths = [], []
+        postings = defaultdict(lambda: ([], []))
+        for ordinal, (job_id, terms) in enumerate(documents):
+            job_ids.append(job_id)
+            lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                postings[term][0].append(ordinal)
+                postings[term][1].append(tf)
+
+        n = len(job_ids)
+        self.job_ids = np.array(job_ids, dtype=np.int64)
+        lengths = np.array(lengths, dtype=np.float32)
+        avg_length = float(lengths.mean()) if n else 1.0
+        # Per-document part of the BM25 denominator, precomputed once
+        self._length_norm = self.k1 * (1 - self.b + self.b * lengths / max(avg_length, 1e-9))
+        self._postings = {
+            term: (np.array(ordinals, dtype=np.int64), np.array(tfs, dtype=np.float32))
+            for term, (ordinals, tfs) in postings.items()
+        }
+        self._idf = {
+            term: math.log(1 + (n - len(ordinals) + 0.5) / (len(ordinals) + 0.5))
+            for term, (ordinals, _) in self._postings.items()
+        }
+        return self
+
+    def search(self, terms: Iterable[str], k: int, candidate_ids: Optional[Sequence[int]] = None) -> List[Tuple[int, float]]:
+        """Top-k (job_id, bm25 score) for the query terms, best first, optionally among candidate_ids only"""
+        if k <= 0 or not len(self.job_ids):
+            return []
+        scores = np.zeros(len(self.job_ids), dtype=np.float32)
+        for term in set(terms):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            ordinals, tfs = posting
+            scores[ordinals] += self._idf[term] * tfs * (self.k1 + 1) / (tfs + self._length_norm[ordinals])
+        if candidate_ids is not None:
+            scores[~np.isin(self.job_ids, np.asarray(candidate_ids, dtype=np.int64))] = 0
+
+        matched = np.flatnonzero(scores)
+        if not len(matched):
+            return []
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        matched = matched[np.argsort(-scores[matched])]
+        return [(int(self.job_ids[i]), float(scores[i])) for i in matched]
+
+
+def job_terms(title: str, required_skills: str, normalize) -> List[str]:
+    """Index terms of a job: title words plus each pipe-delimited skill as one term"""
+    return tokenize(title or "") + parse_required_skills(required_skills, normalize)
+
+
+def resume_terms(resume_summary_data: Dict, normalize) -> List[str]:
+    """Query terms of a parsed resume: its skills plus the words of its job titles"""
+    terms = [normalize(skill) for skill in resume_summary_data.get("skills") or []]
+    for exp in (resume_summary_data.get("experience") or [])[:3]:
+        terms.extend(tokenize(exp.get("title") or ""))
+    return terms
+
+
+def fuse_rankings(dense_hits: List[Tuple[int, float]], lexical_hits: List[Tuple[int, float]],
+                  method: str = "rrf", dense_weight: float = 0.5, rrf_k: int = 60) -> List[Tuple[int, Dict]]:
+    """
+    Merge dense and lexical rankings into one.
+
+    'rrf' is weighted reciprocal rank fusion. 'weighted' mixes the cosine
+    similarity with the BM25 score scaled by the best lexical hit; jobs
+    missing from the dense candidates get the lowest dense score seen.
+
+    Returns:
+        List of (job_id, signals) sorted by the fused score, where signals
+        holds dense/lexical scores and ranks plus the fused score
+    """
+    signals: Dict[int, Dict] = defaultdict(lambda: {"dense": None, "dense_rank": None,
+                                                    "lexical": None, "lexical_rank": None})
+    for rank, (job_id, score) in enumerate(dense_hits, start=1):
+        signals[job_id].update(dense=score, dense_rank=rank)
+    for rank, (job_id, score) in enumerate(lexical_hits, start=1):
+        signals[job_id].update(lexical=score, lexical_rank=rank)
+
+    lexical_weight = 1.0 - dense_weight
+    if method == "rrf":
+        for s in signals.values():
+            s["fused"] = (
+                (dense_weight / (rrf_k + s["dense_rank"]) if s["dense_rank"] else 0.0) +
+                (lexical_weight / (rrf_k + s["lexical_rank"]) if s["lexical_rank"] else 0.0)
+            )
+    elif method == "weighted":
+        dense_floor = min((score for _, score in dense_hits), default=0.0)
+        lexical_max = max((score for _, score in lexical_hits), default=0.0) or 1.0
+        for s in signals.values():
+            dense = s["dense"] if s["dense"] is not None else dense_floor
+            lexical = (s["lexical"] or 0.0) / lexical_max
+            s["fused"] = dense_weight * dense + lexical_weight * lexical
+    else:
+        raise ValueError(f"Unknown fusion method: {method}")
+
+    return sorted(signals.items(), key=lambda item: -item[1]["fused"])
@@ -1,4 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, text
 from datetime import datetime
 import json
 
@@ -17,6 +18,23 @@ class Job(db.Model):
     duration_months = db.Column(db.String(50))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Incremental import bookkeeping: natural key of the source row, hash of
+    # its content, and a soft-delete flag for rows missing from the last import
+    source_key = db.Column(db.String(64), unique=True, index=True)
+    content_hash = db.Column(db.String(64))
+    is_active = db.Column(db.Boolean, default=True, nullable=False, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Filterable values parsed from the free-text columns at import time
+    location_key = db.Column(db.String(200), index=True)
+    stipend_min = db.Column(db.Integer, index=True)
+    duration_months_min = db.Column(db.Float, index=True)
+    
+    @classmethod
+    def active(cls):
+        """Query over jobs that have not been soft-deleted"""
+        return cls.query.filter(cls.is_active.is_(True))
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -30,6 +48,19 @@ class Job(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+class JobSkill(db.Model):
+    """One normalized skill from a job's pipe-delimited required_skills"""
+    __tablename__ = 'job_skills'
+    
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True)
+    skill = db.Column(db.String(100), primary_key=True, index=True)
+
+# Columns returned for lightweight job cards (everything but full_description)
+JOB_CARD_COLUMNS = (
+    Job.id, Job.internship_title, Job.company_name, Job.location,
+    Job.required_skills, Job.stipend_inr, Job.duration_months, Job.created_at
+)
+
 class User(db.Model):
     __tablename__ = 'users'
     
@@ -55,4 +86,33 @@ class User(db.Model):
             'education': self.education,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }
+
+def ensure_schema():
+    """
+    Add columns and indexes introduced after the tables were first created.
+
+    db.create_all() only creates missing tables, so databases created by an
+    older version would otherwise miss newer columns.
+    """
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        with db.engine.begin() as conn:
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                if column.default is not None and column.default.is_scalar:
+                    conn.execute(
+                        text(f'UPDATE {table.name} SET {column.name} = :value'),
+                        {'value': column.default.arg}
+                    )
+                print(f"Added column {table.name}.{column.name}")
+        existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(db.engine)
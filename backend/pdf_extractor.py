@@ -0,0 +1,183 @@
+import importlib
+import importlib.util
+import io
+import multiprocessing
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple, Union
+
+ENGINES = ("auto", "pdfium", "pdfplumber")
+
+# Engine -> module. Availability is checked without importing; the modules
+# themselves are imported on first use, off the startup path.
+_ENGINE_MODULES = {"pdfium": "pypdfium2", "pdfplumber": "pdfplumber"}
+_AVAILABLE = {engine: importlib.util.find_spec(module) is not None for engine, module in _ENGINE_MODULES.items()}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# pdfium is not thread-safe; calls within one process are serialized
+_pdfium_lock = threading.Lock()
+
+
+def resolve_engine(engine: str) -> Optional[str]:
+    """
+    Concrete extractor for a configured engine, or None if none is installed.
+
+    'auto' prefers pdfium's text-only extraction, which is much faster than
+    pdfplumber's layout analysis and keeps the line structure the resume
+    parser needs.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown PDF engine: {engine}")
+    if engine in ("auto", "pdfium") and _AVAILABLE["pdfium"]:
+        return "pdfium"
+    if engine in ("auto", "pdfplumber") and _AVAILABLE["pdfplumber"]:
+        return "pdfplumber"
+    return None
+
+
+def _engine_module(engine: str):
+    return importlib.import_module(_ENGINE_MODULES[engine])
+
+
+def _plumber_input(source: Union[str, bytes]):
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def count_pages(source: Union[str, bytes]) -> int:
+    # pdfium reads the page count without parsing the pages, so it is used
+    # whenever it is installed
+    if _AVAILABLE["pdfium"]:
+        with _pdfium_lock:
+            pdf = _engine_module("pdfium").PdfDocument(source)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+    with _engine_module("pdfplumber").open(_plumber_input(source)) as pdf:
+        return len(pdf.pages)
+
+
+def extract_page_range(source: Union[str, bytes], engine: str, start: int, stop: int) -> List[Tuple[int, str, float]]:
+    """Text of pages [start, stop) of a PDF path or bytes as (page index, text, milliseconds) tuples"""
+    results = []
+    if engine == "pdfium":
+        with _pdfium_lock:
+            pdf = _engine_module("pdfium").PdfDocument(source)
+            try:
+                for index in range(start, stop):
+                    started = time.perf_counter()
+                    page = pdf[index]
+                    textpage = page.get_textpage()
+                    text = textpage.get_text_range().replace("\r\n", "\n").replace("\r", "\n")
+                    textpage.close()
+                    page.close()
+                    results.append((index, text, (time.perf_counter() - started) * 1000))
+            finally:
+                pdf.close()
+    else:
+        with _engine_module("pdfplumber").open(_plumber_input(source), pages=list(range(start + 1, stop + 1))) as pdf:
+            for index, page in zip(range(start, stop), pdf.pages):
+                started = time.perf_counter()
+                text = page.extract_text() or ""
+                page.flush_cache()
+                results.append((index, text, (time.perf_counter() - started) * 1000))
+    return results
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: the web process runs threads, which don't mix with fork
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def extract_pdf_text(source: Union[str, bytes], engine: str = "auto", max_pages: int = 30, max_seconds: float = 10.0,
+                     target_chars: int = 20000, workers: int = 2, pages_per_task: int = 4) -> Tuple[str, Dict]:
+    """
+    Extract the text of a PDF path or bytes, page ranges in parallel, with early stop and caps.
+
+    Only the first max_pages pages are considered. Documents longer than
+    one range are split into ranges of pages_per_task pages that run on a
+    process pool (shorter ones are read in-process). Pages are consumed in
+    order and extraction stops once target_chars characters have been
+    collected or max_seconds have passed; pending ranges are cancelled.
+
+    Returns:
+        (text, report) where report has the engine, page counts, why
+        extraction stopped, and per-page timings in milliseconds
+    """
+    started = time.perf_counter()
+    deadline = started + max_seconds
+    engine = resolve_engine(engine)
+    if engine is None:
+        raise RuntimeError("No PDF text extractor installed (pypdfium2 or pdfplumber)")
+
+    pages_total = count_pages(source)
+    page_limit = min(pages_total, max_pages)
+    ranges = [(start, min(start + pages_per_task, page_limit)) for start in range(0, page_limit, pages_per_task)]
+
+    pages: Dict[int, Tuple[str, float]] = {}
+    stopped = "complete" if page_limit == pages_total else "page_limit"
+
+    def enough_text():
+        # Only count the contiguous prefix: that is the text that will be returned
+        chars = 0
+        for index in range(page_limit):
+            if index not in pages:
+                break
+            chars += len(pages[index][0])
+        return chars >= target_chars
+
+    if workers <= 0 or len(ranges) <= 1:
+        for start, stop in ranges:
+            for index, text, ms in extract_page_range(source, engine, start, stop):
+                pages[index] = (text, ms)
+            if stop == page_limit:
+                break
+            if enough_text():
+                stopped = "target_chars"
+                break
+            if time.perf_counter() >= deadline:
+                stopped = "time_limit"
+                break
+    else:
+        pool = _get_pool(workers)
+        pending = {pool.submit(extract_page_range, source, engine, start, stop) for start, stop in ranges}
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=max(0.0, deadline - time.perf_counter()),
+                                     return_when=FIRST_COMPLETED)
+                if not done:
+                    stopped = "time_limit"
+                    break
+                for future in done:
+                    for index, text, ms in future.result():
+                        pages[index] = (text, ms)
+                if pending and enough_text():
+                    stopped = "target_chars"
+                    break
+        finally:
+            for future in pending:
+                future.cancel()
+
+    # Keep the pages in order and drop anything after a gap left by a cancelled range
+    ordered = []
+    for index in range(page_limit):
+        if index not in pages:
+            break
+        ordered.append((index, *pages[index]))
+
+    report = {
+        "engine": engine,
+        "pages_total": pages_total,
+        "pages_read": len(ordered),
+        "stopped": stopped,
+        "page_ms": [round(ms, 1) for _, _, ms in ordered],
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    return "\n".join(text for _, text, _ in ordered if text), report
@@ -1,16 +1,13 @@
 import re
-import json
-import os
+import io
+import hashlib
+import time
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
-from difflib import get_close_matches
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 
 # Attempt to import external libraries
-try:
-    import pdfplumber
-except ImportError:
-    pdfplumber = None
-
 try:
     import docx
 except ImportError:
@@ -21,13 +18,12 @@ try:
 except ImportError:
     phonenumbers = None
 
-try:
-    import google.generativeai as genai
-except ImportError:
-    genai = None
-
 # Import config for API key
 from config import Config
+from skill_matcher import SkillMatcher
+from result_cache import TTLCache
+from summary_service import extractive_summary, get_summary_service
+from pdf_extractor import extract_pdf_text, resolve_engine
 
 # ---------------------------
 # Config / Mini knowledge base
@@ -48,89 +44,97 @@ SKILLS_MASTER = [
     "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "html", "css",
     "spring", "hibernate", "git", "linux", "bash", "rest", "api", "microservices",
     "spark", "hadoop", "etl", "tableau", "power bi", "fastapi", "selenium",
-    "android", "ios", "swift", "kotlin", "reactjs", "nodejs", "vuejs", "angular"
+    "android", "ios", "swift", "kotlin", "reactjs", "nodejs", "vuejs", "angular",
+    "nextjs", "mysql", "firebase"
 ]
 
+# Alternative spellings -> canonical skill name
+SKILL_ALIASES = {
+    "reactjs": "react", "react.js": "react",
+    "node.js": "nodejs", "node js": "nodejs",
+    "vue": "vuejs", "vue.js": "vuejs",
+    "next.js": "nextjs",
+    "angularjs": "angular",
+    "postgres": "postgresql",
+    "mongo": "mongodb",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "sklearn": "scikit-learn", "scikit learn": "scikit-learn",
+    "tf": "tensorflow",
+    "k8s": "kubernetes",
+    "powerbi": "power bi",
+    "rest api": "rest", "rest apis": "rest", "restful": "rest",
+    "amazon web services": "aws",
+    "google cloud": "gcp",
+}
+
 COMMON_CITIES = [
     "bengaluru", "bangalore", "mumbai", "delhi", "new delhi", "chennai", "hyderabad", "pune", "kolkata",
     "gurgaon", "noida", "greater noida", "kochi", "thiruvananthapuram", "ahmedabad", "jaipur", "lucknow"
 ]
 
+# Bump when changes to the parser change its output; bulk_parse re-parses
+# files that were parsed by an older version
+PARSER_VERSION = 2
+
 EMAIL_RE = re.compile(r"[a-zA-Z0-9+_.-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", re.I)
-DURATION_PATTERN = r"\(([^)]*(?:20\d{2}|Present|current)[^)]*)\)"
 
 
-def _extract_text_from_pdf(p: Path) -> str:
-    if pdfplumber is None:
-        print("⚠️ pdfplumber not installed. Cannot parse PDF.")
+def _extract_text_from_pdf(data: bytes, report: Optional[Dict] = None) -> str:
+    if resolve_engine(Config.PDF_TEXT_ENGINE) is None:
+        print("⚠️ Neither pypdfium2 nor pdfplumber installed. Cannot parse PDF.")
         return ""
-    text = []
-    with pdfplumber.open(str(p)) as pdf:
-        for page in pdf.pages:
-            t = page.extract_text()
-            if t:
-                text.append(t)
-    return "\n".join(text)
-
-def _extract_text_from_docx(p: Path) -> str:
+    text, pdf_report = extract_pdf_text(
+        data,
+        engine=Config.PDF_TEXT_ENGINE,
+        max_pages=Config.PDF_MAX_PAGES,
+        max_seconds=Config.PDF_MAX_SECONDS,
+        target_chars=Config.PDF_TARGET_CHARS,
+        workers=Config.PDF_WORKERS,
+        pages_per_task=Config.PDF_PAGES_PER_TASK
+    )
+    if pdf_report["stopped"] != "complete":
+        print(f"📄 PDF extraction stopped ({pdf_report['stopped']}) after "
+              f"{pdf_report['pages_read']}/{pdf_report['pages_total']} pages")
+    if report is not None:
+        report.update(pdf_report)
+    return text
+
+def _extract_text_from_docx(data: bytes) -> str:
     if docx is None:
         print("⚠️ python-docx not installed. Cannot parse DOCX.")
         return ""
-    doc = docx.Document(str(p))
+    doc = docx.Document(io.BytesIO(data))
     paragraphs = [p.text for p in doc.paragraphs if p.text and p.text.strip()]
     return "\n".join(paragraphs)
 
-def _extract_text_from_txt(p: Path) -> str:
-    return p.read_text(encoding="utf-8", errors="ignore")
-
-def _extract_text(path_str: str) -> str:
-    p = Path(path_str)
-    if not p.exists():
-        raise FileNotFoundError(f"Resume file not found: {p}")
-    suffix = p.suffix.lower()
+def _extract_text_from_txt(data: bytes) -> str:
+    return data.decode("utf-8", errors="ignore")
+
+def _read_source(source: Union[str, Path, bytes, BinaryIO], filename: Optional[str] = None) -> Tuple[bytes, str]:
+    """Bytes and lowercase extension of a resume given as a path, bytes or binary stream"""
+    if isinstance(source, (str, Path)):
+        p = Path(source)
+        if not p.exists():
+            raise FileNotFoundError(f"Resume file not found: {p}")
+        return p.read_bytes(), Path(filename or p.name).suffix.lower()
+    data = source if isinstance(source, bytes) else source.read()
+    name = filename or getattr(source, "filename", None) or getattr(source, "name", None) or ""
+    return data, Path(str(name)).suffix.lower()
+
+def _extract_text(data: bytes, suffix: str, report: Optional[Dict] = None) -> str:
     if suffix == ".pdf":
-        return _extract_text_from_pdf(p)
+        return _extract_text_from_pdf(data, report)
     elif suffix in (".docx", ".doc"):
-        return _extract_text_from_docx(p)
+        return _extract_text_from_docx(data)
     elif suffix in (".txt",):
-        return _extract_text_from_txt(p)
+        return _extract_text_from_txt(data)
     else:
         try:
-            return _extract_text_from_txt(p)
+            return _extract_text_from_txt(data)
         except Exception:
             raise RuntimeError(f"Unsupported file type or read error: {suffix}")
 
-def _find_heading_positions(text: str) -> List[Dict]:
-    lines = text.splitlines()
-    positions = []
-    for idx, line in enumerate(lines):
-        normalized = re.sub(r'[^a-zA-Z ]', ' ', line).strip().lower()
-        for h in HEADINGS:
-            if normalized.startswith(h):
-                positions.append({"heading": h, "line_index": idx, "raw_heading": line.strip()})
-                break
-    return positions
-
-def _segment_by_headings(text: str) -> Dict[str, str]:
-    lines = text.splitlines()
-    headings = _find_heading_positions(text)
-    if not headings:
-        return {"summary": text.strip()}
-
-    sections = {}
-    for i, item in enumerate(headings):
-        start = item["line_index"]
-        end = headings[i + 1]["line_index"] if i + 1 < len(headings) else len(lines)
-        section_text = "\n".join(lines[start:end]).strip()
-        sections[item["heading"]] = section_text
-
-    first_idx = headings[0]["line_index"]
-    if first_idx > 0:
-        summary = "\n".join(lines[:first_idx]).strip()
-        if summary:
-            sections.setdefault("summary", summary)
-    return sections
-
 def _extract_emails(text: str) -> List[str]:
     return list({m.group(0).strip() for m in EMAIL_RE.finditer(text)})
 
@@ -143,59 +147,117 @@ def _extract_phones(text: str) -> List[str]:
         phones.append(phonenumbers.format_number(match.number, phonenumbers.PhoneNumberFormat.INTERNATIONAL))
     return list(dict.fromkeys(phones))
 
-def _extract_name_candidate(text: str, emails: List[str]) -> Optional[str]:
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    if lines:
-        first = lines[0]
-        if 1 <= len(first.split()) <= 4 and any(c.isalpha() for c in first):
-            return first
+# ---------------------------
+# Single-pass section parser
+# ---------------------------
+def _heading_pattern(heading: str) -> str:
+    # The original lookup blanked out every non-letter before matching
+    return "".join(r"[^a-zA-Z\n]" if ch == " " else re.escape(ch) for ch in heading)
+
+# Runs over the whole document at once. One group per heading, in list
+# order: like the original startswith loop, the first listed heading a line
+# starts with wins.
+_HEADING_RE = re.compile(
+    r"^[^a-zA-Z\n]*(?:" + "|".join(f"({_heading_pattern(h)})" for h in HEADINGS) + ")",
+    re.I | re.A | re.M
+)
+# Also a whole-document scan, so it must not cross line breaks; it is cheap
+# (literal "(" prefix) and narrows role detection down to a few lines
+_DURATION_RE = re.compile(r"\([^)\n]*(?:20\d{2}|Present|current)[^)\n]*\)")
+# Applied to single lines
+_ROLE_RE = re.compile(r"Intern|Engineer|Developer|Analyst|Manager|Researcher", re.I)
+_DEGREE_RE = re.compile(r"B(?:\.?\s?Tech|achelor|\.?Sc)|Intermediate|M(?:aster|\.?Tech)", re.I)
+_PROJECT_START_RE = re.compile(r"\d+\.|[A-Z][a-zA-Z\s]+:")
+_CGPA_RE = re.compile(r"[\d\.]+(?:\s?CGPA|%|percent)", re.I)
+_YEAR_RE = re.compile(r"\(([^)]*(?:20\d{2}|Present)[^)]*)\)")
+_TRAILING_PARENS_RE = re.compile(r"\s*\([^)]*\)\s*$")
+_PARENS_RE = re.compile(r"\(([^)]+)\)")
+_EMAIL_LOCAL_RE = re.compile(r"[\.\_\-\d]+")
+_BULLETS = ("•", "-", "*")
+
+class _Document:
+    """
+    Tokenized resume: raw and stripped lines, heading lines and role lines.
+
+    The text is split once and headings and durations are found by one
+    scan each over the whole document. Degree lines are only needed in
+    education sections (and the fallback), so they are matched lazily and
+    remembered; no line is split or matched twice.
+    """
+    __slots__ = ("raw", "lines", "headings", "role", "_degree")
+
+    def __init__(self, text: str):
+        self.raw = text.splitlines()
+        self.lines = [ln.strip() for ln in self.raw]
+        joined = "\n".join(self.raw)
+        starts = []
+        offset = 0
+        for ln in self.raw:
+            starts.append(offset)
+            offset += len(ln) + 1
+
+        self.headings = [
+            (bisect_right(starts, m.start()) - 1, HEADINGS[m.lastindex - 1])
+            for m in _HEADING_RE.finditer(joined)
+        ]
+        dated = {bisect_right(starts, m.start()) - 1 for m in _DURATION_RE.finditer(joined)}
+        self.role = {i for i in dated if _ROLE_RE.search(self.lines[i])}
+        self._degree = {}
+
+    def is_degree(self, i: int) -> bool:
+        found = self._degree.get(i)
+        if found is None:
+            found = self._degree[i] = _DEGREE_RE.search(self.lines[i]) is not None
+        return found
+
+def _trim_blank(doc: _Document, start: int, end: int) -> Tuple[int, int]:
+    """Line range without leading and trailing blank lines, as stripping the section text would"""
+    while start < end and not doc.lines[start]:
+        start += 1
+    while end > start and not doc.lines[end - 1]:
+        end -= 1
+    return start, end
+
+def _extract_name_candidate(doc: _Document, emails: List[str]) -> Optional[str]:
+    first = next((ln for ln in doc.lines if ln), None)
+    if first and 1 <= len(first.split()) <= 4 and any(c.isalpha() for c in first):
+        return first
     if emails:
         local = emails[0].split("@")[0]
-        local = re.sub(r"[\.\_\-\d]+", " ", local).strip()
+        local = _EMAIL_LOCAL_RE.sub(" ", local).strip()
         return " ".join([w.capitalize() for w in local.split() if w])
     return None
 
-def _extract_education(text: str) -> List[Dict]:
-    lines = text.splitlines()
+def _extract_education(doc: _Document, start: int, end: int) -> List[Dict]:
     education_entries = []
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        if re.search(r"(B\.?\s?Tech|Intermediate|Bachelor|Master|B\.?Sc|M\.?Tech)", line, re.I):
-            degree_line = line
-            if i + 1 < len(lines):
-                inst_line = lines[i + 1].strip()
-                cgpa_match = re.search(r"[\d\.]+(?:\s?CGPA|%|percent)", degree_line, re.I)
-                cgpa = cgpa_match.group(0) if cgpa_match else None
-                
-                year_match = re.search(r"\(([^)]*(?:20\d{2}|Present)[^)]*)\)", inst_line)
-                if not year_match:
-                     year_match = re.search(r"\(([^)]*(?:20\d{2}|Present)[^)]*)\)", degree_line)
-                
-                year = year_match.group(1) if year_match else None
-                institution = re.sub(r"\s*\([^)]*\)\s*$", "", inst_line).strip()
-                
-                education_entries.append({
-                    "degree": degree_line,
-                    "institution": institution,
-                    "cgpa_or_percentage": cgpa,
-                    "duration": year
-                })
-                i += 2
-                continue
+    i = start
+    while i < end:
+        if doc.is_degree(i) and i + 1 < end:
+            degree_line = doc.lines[i]
+            inst_line = doc.lines[i + 1]
+            cgpa_match = _CGPA_RE.search(degree_line)
+            year_match = _YEAR_RE.search(inst_line) or _YEAR_RE.search(degree_line)
+            education_entries.append({
+                "degree": degree_line,
+                "institution": _TRAILING_PARENS_RE.sub("", inst_line).strip(),
+                "cgpa_or_percentage": cgpa_match.group(0) if cgpa_match else None,
+                "duration": year_match.group(1) if year_match else None
+            })
+            i += 2
+            continue
         i += 1
     return education_entries
 
-def _split_experience_blocks(section_text: str) -> List[Dict]:
-    lines = [ln.strip() for ln in section_text.splitlines() if ln.strip()]
+def _split_experience_blocks(doc: _Document, start: int, end: int) -> List[Dict]:
     blocks = []
     current_role = None
     current_bullets = []
 
-    for ln in lines:
-        is_new_role = re.search(r"(Intern|Engineer|Developer|Analyst|Manager|Researcher)", ln, re.I) and re.search(DURATION_PATTERN, ln)
-        
-        if is_new_role:
+    for i in range(start, end):
+        ln = doc.lines[i]
+        if not ln:
+            continue
+        if i in doc.role:
             if current_role:
                 blocks.append({
                     "role_line": current_role,
@@ -203,14 +265,12 @@ def _split_experience_blocks(section_text: str) -> List[Dict]:
                 })
             current_role = ln
             current_bullets = []
-        elif ln.startswith(("•", "-", "*")):
-            bullet = ln.lstrip("•-* ").strip()
-            current_bullets.append(bullet)
-        else:
-            if current_bullets:
-                current_bullets[-1] += " " + ln.strip()
-            elif current_role:
-                current_role += " " + ln.strip()
+        elif ln.startswith(_BULLETS):
+            current_bullets.append(ln.lstrip("•-* ").strip())
+        elif current_bullets:
+            current_bullets[-1] += " " + ln
+        elif current_role:
+            current_role += " " + ln
 
     if current_role:
         blocks.append({
@@ -220,32 +280,24 @@ def _split_experience_blocks(section_text: str) -> List[Dict]:
 
     return blocks
 
-def _extract_experience(section_text: str) -> List[Dict]:
-    blocks = _split_experience_blocks(section_text)
+def _extract_experience(doc: _Document, start: int, end: int) -> List[Dict]:
     exps = []
 
-    for block in blocks:
+    for block in _split_experience_blocks(doc, start, end):
         role_line = block["role_line"]
-        bullets = block["bullets"]
-
-        title, company, duration = None, None, None
+        duration = None
 
-        dur_match = re.search(r"\(([^)]+)\)", role_line)
+        dur_match = _PARENS_RE.search(role_line)
         if dur_match:
             duration = dur_match.group(1)
             role_line = role_line.replace(f"({duration})", "").strip()
 
-        if " – " in role_line:
-            parts = role_line.split(" – ", 1)
-            title = parts[0].strip()
-            company = parts[1].strip()
-        elif " - " in role_line:
-            parts = role_line.split(" - ", 1)
-            title = parts[0].strip()
-            company = parts[1].strip()
+        for separator in (" – ", " - "):
+            if separator in role_line:
+                title, company = (part.strip() for part in role_line.split(separator, 1))
+                break
         else:
-            title = role_line.strip()
-            company = None
+            title, company = role_line.strip(), None
 
         if company and (',' in company or '|' in company):
             company = company.split(',')[0].split('|')[0].strip()
@@ -254,62 +306,111 @@ def _extract_experience(section_text: str) -> List[Dict]:
             "title": title or "N/A",
             "company": company or "N/A",
             "duration": duration,
-            "bullets": bullets
+            "bullets": block["bullets"]
         })
 
     return exps
 
-def _extract_projects(section_text: str) -> List[Dict]:
-    lines = [ln.strip() for ln in section_text.splitlines() if ln.strip()]
+def _extract_projects(doc: _Document, start: int, end: int) -> List[Dict]:
     projects = []
     current_proj = None
 
-    for ln in lines:
-        if re.match(r"^\d+\.", ln) or re.match(r"^[A-Z][a-zA-Z\s]+:", ln):
+    for i in range(start, end):
+        ln = doc.lines[i]
+        if not ln:
+            continue
+        if _PROJECT_START_RE.match(ln):
             if current_proj:
                 projects.append(current_proj)
-            title = ln.split(':')[0].strip() if ':' in ln else ln.strip()
-            description = ln.split(':', 1)[1].strip() if ':' in ln else ""
-            current_proj = {"title": title, "bullets": []}
-            if description:
-                 current_proj["bullets"].append(description)
-        elif ln.startswith(("•", "-", "*")):
+            title, colon, description = ln.partition(':')
+            current_proj = {"title": title.strip(), "bullets": []}
+            if colon and description.strip():
+                current_proj["bullets"].append(description.strip())
+        elif ln.startswith(_BULLETS):
             if current_proj is not None:
-                bullet = ln.lstrip("•-* ").strip()
-                current_proj["bullets"].append(bullet)
-        else:
-            if current_proj:
-                if current_proj["bullets"]:
-                    current_proj["bullets"][-1] += " " + ln.strip()
-                else:
-                    current_proj["title"] += " " + ln.strip()
+                current_proj["bullets"].append(ln.lstrip("•-* ").strip())
+        elif current_proj:
+            if current_proj["bullets"]:
+                current_proj["bullets"][-1] += " " + ln
+            else:
+                current_proj["title"] += " " + ln
 
     if current_proj:
         projects.append(current_proj)
 
     return projects
 
-def _extract_skills(text: str, master_list: List[str]=SKILLS_MASTER, cutoff=0.8) -> List[str]:
-    text_lower = text.lower()
-    found = set()
-    
-    for skill in master_list:
-        if skill.lower() in text_lower:
-            found.add(skill)
+def _parse_structure(text: str, emails: List[str]) -> Dict:
+    """
+    Sections, name, education, experience and projects of a resume.
 
-    words = re.findall(r"[a-zA-Z\+\#\.\-]{2,}", text_lower)
-    uniq = sorted(set(words), key=lambda x: -len(x))
-    for w in uniq:
-        matches = get_close_matches(w, master_list, n=3, cutoff=cutoff)
-        for m in matches:
-            found.add(m)
+    The text is tokenized once (see _Document); sections and entities are
+    then assembled from line ranges, including the whole-text fallbacks,
+    without re-splitting or re-matching anything.
+    """
+    doc = _Document(text)
+    total = len(doc.lines)
+
+    # Later occurrences of a heading replace earlier ones but keep their place
+    spans = {}
+    for n, (start, heading) in enumerate(doc.headings):
+        end = doc.headings[n + 1][0] if n + 1 < len(doc.headings) else total
+        spans[heading] = (start, end)
+    if not doc.headings:
+        spans["summary"] = (0, total)
+    elif any(doc.lines[:doc.headings[0][0]]):
+        spans.setdefault("summary", (0, doc.headings[0][0]))
+
+    sections = {k: "\n".join(doc.raw[start:end]).strip() for k, (start, end) in spans.items()}
+    if not doc.headings:
+        sections["summary"] = text.strip()
 
-    tech_patterns = re.findall(r"(React\.js|Node\.js|Next\.js|MongoDB|PostgreSQL|MySQL|Firebase|TensorFlow|PyTorch|scikit-learn)", text, re.I)
-    for tp in tech_patterns:
-        clean = tp.lower().replace('.js', '').capitalize()
-        found.add(clean)
+    skills_text = ""
+    for k in ("skills", "technical skills", "expertise"):
+        if k in sections:
+            skills_text = sections[k]
+            break
+    if not skills_text:
+        skills_text = text
+
+    education, experience, projects = [], [], []
+    for k, (start, end) in spans.items():
+        if "education" in k:
+            education.extend(_extract_education(doc, *_trim_blank(doc, start, end)))
+        elif "experience" in k or "employment" in k or "work" in k:
+            experience.extend(_extract_experience(doc, start, end))
+        elif "project" in k:
+            projects.extend(_extract_projects(doc, start, end))
 
-    return sorted(found)
+    if not education:
+        education.extend(_extract_education(doc, 0, total))
+    if not experience:
+        experience.extend(_extract_experience(doc, 0, total))
+
+    return {
+        "name": _extract_name_candidate(doc, emails),
+        "sections": sections,
+        "skills_text": skills_text,
+        "education": education,
+        "experience": experience,
+        "projects": projects,
+    }
+
+# Built once at import; custom master lists get their own cached matcher
+_SKILL_MATCHER = SkillMatcher(SKILLS_MASTER, SKILL_ALIASES)
+
+@lru_cache(maxsize=8)
+def _get_skill_matcher(master_list: tuple, cutoff: float) -> SkillMatcher:
+    return SkillMatcher(master_list, SKILL_ALIASES, cutoff=cutoff)
+
+def normalize_skill(skill: str) -> str:
+    """Canonical name of a skill or alias (e.g. "React.js" -> "react")"""
+    return _SKILL_MATCHER.normalize(skill)
+
+def _extract_skills(text: str, master_list: List[str]=SKILLS_MASTER, cutoff=0.8) -> List[str]:
+    if master_list is SKILLS_MASTER and cutoff == _SKILL_MATCHER.cutoff:
+        return _SKILL_MATCHER.extract(text)
+    return _get_skill_matcher(tuple(master_list), cutoff).extract(text)
 
 def _guess_location(text: str) -> Optional[str]:
     t = text.lower()
@@ -320,117 +421,106 @@ def _guess_location(text: str) -> Optional[str]:
         return "India"
     return None
 
-def _generate_ai_summary(parsed_data: Dict) -> str:
-    if genai is None:
-        return "[Gemini not available - google-generativeai not installed]"
-
-    try:
-        genai.configure(api_key=Config.GEMINI_API_KEY)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-
-        name = parsed_data.get("name", "the candidate")
-        experience_lines = [
-            f"{exp.get('title', '')} at {exp.get('company', '')} ({exp.get('duration', '')})"
-            for exp in parsed_data.get('experience', [])
-        ]
-        skills = ", ".join(parsed_data.get("skills", []))
-        projects_titles = [
-            proj.get('title', '').split('.')[0].strip()
-            for proj in parsed_data.get('projects', [])
-        ]
+def parse_text(text: str) -> Dict:
+    """Structured resume data from plain text (everything except the AI summary)"""
+    emails = _extract_emails(text)
+    structure = _parse_structure(text, emails)
+    sections = structure["sections"]
+    return {
+        "name": structure["name"],
+        "contact": {
+            "emails": emails,
+            "phones": _extract_phones(text)
+        },
+        "location_guess": _guess_location(text),
+        "education": structure["education"],
+        "experience": structure["experience"],
+        "projects": structure["projects"],
+        "skills": _extract_skills(structure["skills_text"]),
+        "raw_sections": {k: (v[:800] + "..." if len(v) > 800 else v) for k, v in sections.items()},
+        "ai_summary": ""
+    }
 
-        prompt = f"""
-You are a professional resume editor. Write a 2-3 sentence personal summary in **first person** for the candidate's resume header.
+def _generate_ai_summary(parsed_data: Dict) -> Dict:
+    """AI summary via the shared summary service: {"text": ..., "source": ...}"""
+    return get_summary_service().summarize(parsed_data)
 
-**Style:** Natural, confident, concise. Like a LinkedIn bio or resume profile.
-**Focus:** Highlight key skills, experiences, and career goals.
-**Avoid:** Buzzwords like "passionate", "hardworking", "team player". Be specific.
 
-**Candidate Info:**
-Name: {name}
-Key Skills: {skills}
-Recent Experience: {"; ".join(experience_lines[:2])}
-Projects: {"; ".join(projects_titles[:2])}
+# Parsed resumes keyed by the sha256 of the uploaded file's bytes
+_PARSE_CACHE = TTLCache(Config.PARSE_CACHE_SIZE, Config.PARSE_CACHE_TTL_SECONDS)
 
-**Goal:** Generate a profile summary for this candidate's resume.
-"""
-        response = model.generate_content(prompt)
-        return response.text.strip()
+def get_parse_cache_stats() -> Dict:
+    return _PARSE_CACHE.stats()
 
-    except Exception as e:
-        return f"[Error generating AI summary: {str(e)}]"
+def _content_digest(data: bytes, suffix: str) -> str:
+    # The extension picks the extractor, so it is part of the key
+    return f"{suffix}:{hashlib.sha256(data).hexdigest()}"
 
+def _record_timing(timings: Optional[Dict], stage: str, started: float) -> float:
+    now = time.perf_counter()
+    if timings is not None:
+        timings[f"{stage}_ms"] = round((now - started) * 1000, 1)
+    return now
 
-def parse_resume(file_path: str) -> Dict:
+def parse_resume(source: Union[str, Path, bytes, BinaryIO], timings: Optional[Dict] = None,
+                 filename: Optional[str] = None, summarize: bool = True) -> Dict:
     """
     Main function to parse resume and extract structured data
     
+    Results are cached by file content, so re-uploading the same resume
+    skips extraction, parsing and the AI summary. Nothing is written to
+    disk; persisting uploads is up to the caller (see upload_store).
+    
     Args:
-        file_path: Path to the resume file
+        source: Path to the resume file, its bytes, or a binary stream
+            (e.g. an uploaded FileStorage)
+        timings: Optional dict that receives per-stage durations in milliseconds
+        filename: Name used to pick the extractor by extension; defaults to
+            the path or the stream's filename/name
+        summarize: Ask the summary service for an AI summary; when False the
+            summary is extractive and the parse cache is bypassed (bulk runs)
     
     Returns:
         Dictionary containing parsed resume data
     """
+    started = time.perf_counter()
     try:
-        text = _extract_text(file_path)
+        data, suffix = _read_source(source, filename)
+    except OSError as e:
+        print(f"❌ Error reading resume file: {e}")
+        return {"error": str(e)}
+    cache_key = _content_digest(data, suffix)
+    cached = _PARSE_CACHE.get(cache_key) if summarize else None
+    if timings is not None:
+        timings["parse_cache_hit"] = cached is not None
+    if cached is not None:
+        _record_timing(timings, "cache", started)
+        return cached
+    
+    extract_report = {}
+    try:
+        text = _extract_text(data, suffix, extract_report)
     except Exception as e:
         print(f"❌ Error during text extraction: {e}")
         return {"error": str(e)}
+    started = _record_timing(timings, "extract", started)
+    if timings is not None and extract_report:
+        timings["pdf"] = extract_report
     
-    sections = _segment_by_headings(text)
+    parsed = parse_text(text)
 
-    emails = _extract_emails(text)
-    phones = _extract_phones(text)
-    name = _extract_name_candidate(text, emails)
+    started = _record_timing(timings, "parse", started)
 
-    skills_text = ""
-    for k in ("skills", "technical skills", "expertise"):
-        if k in sections:
-            skills_text = sections[k]
-            break
-    if not skills_text:
-        skills_text = text
-
-    education, experience, projects = [], [], []
-    for k, v in sections.items():
-        if "education" in k:
-            education.extend(_extract_education(v))
-        elif "experience" in k or "employment" in k or "work" in k:
-            experience.extend(_extract_experience(v))
-        elif "project" in k:
-            projects.extend(_extract_projects(v))
-
-    if not education:
-        education.extend(_extract_education(text))
-    if not experience:
-        experience.extend(_extract_experience(text))
-
-    skills = _extract_skills(skills_text)
-
-    parsed = {
-        "name": name,
-        "contact": {
-            "emails": emails,
-            "phones": phones
-        },
-        "location_guess": _guess_location(text),
-        "education": education,
-        "experience": experience,
-        "projects": projects,
-        "skills": skills,
-        "raw_sections": {k: (v[:800] + "..." if len(v) > 800 else v) for k, v in sections.items()},
-        "ai_summary": ""
-    }
-
-    parsed["ai_summary"] = _generate_ai_summary(parsed)
-
-    # Save to JSON file
-    output_path = Path(file_path).with_suffix('.json')
-    try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(parsed, f, indent=2, ensure_ascii=False)
-        print(f"✅ Successfully saved parsed resume to: {output_path}")
-    except Exception as e:
-        print(f"❌ Error writing JSON file: {e}")
+    if summarize:
+        summary = _generate_ai_summary(parsed)
+    else:
+        summary = {"text": extractive_summary(parsed), "source": "extractive"}
+    parsed["ai_summary"] = summary["text"]
+    parsed["ai_summary_source"] = summary["source"]
+    _record_timing(timings, "ai_summary", started)
+
+    # A fallback summary is not cached so the next upload asks the model again
+    if summarize and summary["source"] != "fallback":
+        _PARSE_CACHE.put(cache_key, parsed)
 
     return parsed
\ No newline at end of file
@@ -0,0 +1,560 @@
+import json
+import math
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from vector_quantization import QUANTIZERS, load_quantizer, save_quantizer, train_quantizer
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# Metadata fields searches can filter on, and their dtypes in NumpyBackend
+FILTER_FIELDS = {
+    "location_key": str,
+    "stipend_min": np.float64,
+    "duration_months_min": np.float64,
+}
+
+
+def normalize_rows(vectors) -> np.ndarray:
+    """L2-normalize a vector or a matrix of row vectors as float32"""
+    arr = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(arr, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return arr / norms
+
+
+def chroma_where(candidate_ids=None, filters=None) -> Optional[Dict]:
+    """Chroma where clause for a candidate id list and job filters"""
+    filters = filters or {}
+    clauses = []
+    if candidate_ids is not None:
+        clauses.append({"id": {"$in": [int(job_id) for job_id in candidate_ids]}})
+    if filters.get("locations"):
+        clauses.append({"location_key": {"$in": list(filters["locations"])}})
+    if filters.get("min_stipend") is not None:
+        clauses.append({"stipend_min": {"$gte": filters["min_stipend"]}})
+    if filters.get("min_duration") is not None:
+        clauses.append({"duration_months_min": {"$gte": filters["min_duration"]}})
+    if filters.get("max_duration") is not None:
+        clauses.append({"duration_months_min": {"$lte": filters["max_duration"]}})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+class RetrievalBackend:
+    """
+    Interface of the job vector index.
+
+    Documents are keyed by job id (as a string) and carry the content hash of
+    the text they were embedded from, which drives incremental syncing.
+    search() returns (job_id, cosine_similarity) pairs, best first. The
+    search is restricted to candidate_ids when given, and to jobs matching
+    filters ({"locations": [...], "min_stipend": ..., "min_duration": ...,
+    "max_duration": ...}) evaluated on the FILTER_FIELDS metadata.
+    """
+
+    name = None
+
+    # Whether an opened backend can be inherited by forked worker processes
+    # (see gunicorn.conf.py); other backends are reopened in each worker
+    fork_safe = False
+
+    def indexed_hashes(self) -> Dict[str, str]:
+        raise NotImplementedError
+
+    def upsert(self, ids: List[str], vectors: Sequence[np.ndarray], metadatas: List[Dict]):
+        raise NotImplementedError
+
+    def delete(self, ids: List[str]):
+        raise NotImplementedError
+
+    def flush(self):
+        """Persist pending writes"""
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def refresh(self) -> bool:
+        """Pick up an index written by another process; True if a newer one was loaded"""
+        return False
+
+    def search(self, query_vector, k: int, candidate_ids: Optional[Sequence[int]] = None,
+               filters: Optional[Dict] = None) -> List[Tuple[int, float]]:
+        raise NotImplementedError
+
+    def search_many(self, query_vectors, k: int, candidate_ids: Optional[Sequence[int]] = None,
+                    filters: Optional[Dict] = None) -> List[List[Tuple[int, float]]]:
+        """search() for several queries; backends override this with a batched query"""
+        return [self.search(query_vector, k, candidate_ids, filters) for query_vector in query_vectors]
+
+
+class ChromaBackend(RetrievalBackend):
+    """Persistent Chroma collection (HNSW index)"""
+
+    name = "chroma"
+
+    # Page size used when reading ids/hashes back out of the collection
+    READ_PAGE_SIZE = 5000
+
+    # Longest candidate id list passed to Chroma as an $in clause; longer
+    # lists (e.g. a broad skill filter) are applied to the results instead
+    MAX_WHERE_IDS = 1000
+
+    def __init__(self, persist_directory: str, collection_name: str):
+        import chromadb
+        from chromadb.config import Settings
+
+        os.makedirs(persist_directory, exist_ok=True)
+        self._client = chromadb.PersistentClient(
+            path=persist_directory,
+            settings=Settings(anonymized_telemetry=False)
+        )
+        # New collections use cosine distance. An existing collection (e.g. one
+        # created by LangChain with the default l2 space) is opened as is:
+        # passing other metadata would rewrite it while the HNSW index keeps
+        # the space it was built with; _to_similarity converts its distances
+        try:
+            self._collection = self._client.get_collection(name=collection_name)
+        except ValueError:
+            self._collection = self._client.create_collection(
+                name=collection_name,
+                metadata={"hnsw:space": "cosine"}
+            )
+        self._space = (self._collection.metadata or {}).get("hnsw:space", "l2")
+
+    def _to_similarity(self, distance: float) -> float:
+        if self._space == "l2":
+            # Squared L2 between unit vectors is 2 - 2 * cos
+            return 1.0 - distance / 2.0
+        # "cosine" and "ip" distances are both 1 - dot product
+        return 1.0 - distance
+
+    def indexed_hashes(self) -> Dict[str, str]:
+        hashes = {}
+        offset = 0
+        while True:
+            page = self._collection.get(include=["metadatas"], limit=self.READ_PAGE_SIZE, offset=offset)
+            for doc_id, meta in zip(page["ids"], page["metadatas"]):
+                hashes[doc_id] = (meta or {}).get("content_hash")
+            if len(page["ids"]) < self.READ_PAGE_SIZE:
+                return hashes
+            offset += self.READ_PAGE_SIZE
+
+    def upsert(self, ids, vectors, metadatas):
+        self._collection.upsert(
+            ids=ids,
+            embeddings=normalize_rows(vectors).tolist(),
+            metadatas=metadatas
+        )
+
+    def delete(self, ids):
+        if ids:
+            self._collection.delete(ids=ids)
+
+    def count(self):
+        return self._collection.count()
+
+    def search(self, query_vector, k, candidate_ids=None, filters=None):
+        return self.search_many([query_vector], k, candidate_ids, filters)[0]
+
+    def _query(self, query_embeddings, n_results, where):
+        result = self._collection.query(
+            query_embeddings=query_embeddings,
+            n_results=n_results,
+            where=where,
+            include=["distances"]
+        )
+        return [
+            [(int(doc_id), self._to_similarity(distance)) for doc_id, distance in zip(ids, distances)]
+            for ids, distances in zip(result["ids"], result["distances"])
+        ]
+
+    def search_many(self, query_vectors, k, candidate_ids=None, filters=None):
+        total = self.count()
+        k = min(k, total)
+        if candidate_ids is not None:
+            k = min(k, len(candidate_ids))
+        if k <= 0 or len(query_vectors) == 0:
+            return [[] for _ in query_vectors]
+        query_embeddings = normalize_rows(query_vectors).tolist()
+        if candidate_ids is None or len(candidate_ids) <= self.MAX_WHERE_IDS:
+            # Candidates and filters are evaluated on document metadata inside the query
+            return self._query(query_embeddings, k, chroma_where(candidate_ids, filters))
+
+        # Too many candidates for an $in clause: query with the other filters
+        # only and keep candidate hits, fetching more until every query has k
+        allowed = {int(job_id) for job_id in candidate_ids}
+        where = chroma_where(None, filters)
+        n_results = min(total, max(2 * k, math.ceil(2 * k * total / len(allowed))))
+        while True:
+            results = [
+                [hit for hit in hits if hit[0] in allowed][:k]
+                for hits in self._query(query_embeddings, n_results, where)
+            ]
+            if n_results >= total or all(len(hits) == k for hits in results):
+                return results
+            n_results = min(total, n_results * 2)
+
+
+class NumpyBackend(RetrievalBackend):
+    """
+    Exact search over a contiguous float32 matrix of normalized embeddings.
+
+    The matrix, job ids, content hashes and FILTER_FIELDS columns are stored
+    as .npy files and memory-mapped read-only on load, so processes opening
+    the same index (or forked from one that did) share its pages through
+    the OS page cache. Filters become a vectorized row mask, and a query is
+    one matrix-vector product over the remaining rows followed by an
+    argpartition top-k, so scores are exact cosine similarities.
+
+    Every flush writes a new generation directory and then atomically
+    replaces manifest.json pointing at it; readers never see a partial
+    index, and refresh() lets other processes swap in the new generation
+    without embedding anything. Flushes are serialized with a file lock and
+    merge their changes into generations other processes wrote meanwhile.
+
+    With storage "int8" or "pq" every generation also holds compact codes
+    of the vectors (see vector_quantization). A search scans the codes
+    only, then re-scores its best rerank_candidates rows exactly against
+    the float32 matrix, which stays on disk and is paged in a few rows at
+    a time; returned scores are still exact cosine similarities.
+    """
+
+    name = "numpy"
+    fork_safe = True
+
+    STORAGE_MODES = ("float32",) + tuple(QUANTIZERS)
+
+    # Generations kept on disk: the current one and its predecessor, for
+    # processes that read the previous manifest just before the swap
+    KEEP_GENERATIONS = 2
+
+    # Queries scored per matrix product in search_many, bounding the
+    # (queries x jobs) score matrix
+    QUERY_CHUNK_SIZE = 64
+
+    # Codes are retrained when the index has grown this many times over the
+    # rows the quantizer was trained on; new rows are encoded with the
+    # existing quantizer until then
+    RETRAIN_GROWTH = 2
+
+    def __init__(self, directory: str, storage: str = "float32", rerank_candidates: int = 200,
+                 pq_subspaces: int = 48):
+        if storage not in self.STORAGE_MODES:
+            raise ValueError(f"Unknown vector storage: {storage} (expected one of {', '.join(self.STORAGE_MODES)})")
+        self.directory = directory
+        self.storage = storage
+        self.rerank_candidates = rerank_candidates
+        self.pq_subspaces = pq_subspaces
+        self._lock = threading.Lock()
+        # (ids, hashes, vectors, filter columns, (quantizer, codes) or None)
+        # is swapped as a whole so searches never see a half-applied update
+        self._data = (np.empty(0, dtype=np.int64), np.empty(0, dtype="U64"), None, self._filter_columns([]), None)
+        self._pending = []
+        self._deleted = set()
+        self._dirty = False
+        # Ids upserted/deleted since the last flush, to merge into a
+        # generation written by another process in the meantime
+        self._changed = set()
+        self._generation = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load(self._read_manifest())
+        if storage != "float32" and self._data[2] is not None and self._data[4] is None:
+            # Written without codes of this kind: the next flush adds them
+            self._dirty = True
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _read_manifest(self) -> Optional[Dict]:
+        try:
+            with open(self._path("manifest.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _filter_columns(metadatas) -> Dict[str, np.ndarray]:
+        """FILTER_FIELDS columns for a list of metadata dicts; missing values become "" / NaN"""
+        return {
+            field: np.array(
+                [meta.get(field) or "" for meta in metadatas] if dtype is str
+                else [meta.get(field, np.nan) for meta in metadatas],
+                dtype=dtype
+            )
+            for field, dtype in FILTER_FIELDS.items()
+        }
+
+    def _load(self, manifest: Optional[Dict]):
+        """Memory-map the generation named by manifest (or the pre-manifest flat layout)"""
+        if manifest is not None:
+            directory, generation = self._path(manifest["path"]), manifest["generation"]
+        elif os.path.exists(self._path("vectors.npy")):
+            directory, generation = self.directory, 0
+        else:
+            return
+
+        def load(name):
+            return np.load(os.path.join(directory, name), mmap_mode="r")
+
+        ids = load("ids.npy")
+        vectors = load("vectors.npy") if len(ids) else None
+        columns = self._filter_columns([{}] * len(ids))
+        for field in FILTER_FIELDS:
+            if os.path.exists(os.path.join(directory, f"{field}.npy")):
+                columns[field] = load(f"{field}.npy")
+        quantized = None
+        if self.storage != "float32" and len(ids) and os.path.exists(os.path.join(directory, "codes.npy")):
+            quantizer = load_quantizer(directory)
+            if quantizer is not None and quantizer.kind == self.storage:
+                quantized = (quantizer, load("codes.npy"))
+        self._data = (ids, load("hashes.npy"), vectors, columns, quantized)
+        self._generation = generation
+
+    def _consolidate(self):
+        """Apply pending upserts and deletes to the in-memory arrays"""
+        with self._lock:
+            if not self._pending and not self._deleted:
+                return
+            ids, hashes, vectors, columns, quantized = self._data
+            new_ids = [batch[0] for batch in self._pending]
+            replaced = np.array(list(self._deleted), dtype=np.int64)
+            if new_ids:
+                replaced = np.concatenate([replaced] + new_ids)
+            keep = ~np.isin(ids, replaced)
+
+            parts_ids = [ids[keep]] + new_ids
+            parts_hashes = [hashes[keep]] + [batch[1] for batch in self._pending]
+            parts_vectors = ([vectors[keep]] if vectors is not None else []) + [batch[2] for batch in self._pending]
+            if quantized is not None:
+                quantizer, codes = quantized
+                if all(batch[2].shape[1] == quantizer.dim for batch in self._pending):
+                    quantized = (quantizer, np.concatenate(
+                        [codes[keep]] + [quantizer.encode(batch[2]) for batch in self._pending]
+                    ))
+                else:
+                    # Vectors of another model; flush() trains a new quantizer
+                    quantized = None
+            self._data = (
+                np.concatenate(parts_ids),
+                np.concatenate(parts_hashes),
+                np.ascontiguousarray(np.concatenate(parts_vectors)) if parts_vectors else None,
+                {
+                    field: np.concatenate([column[keep]] + [batch[3][field] for batch in self._pending])
+                    for field, column in columns.items()
+                },
+                quantized,
+            )
+            self._pending = []
+            self._deleted = set()
+            self._dirty = True
+
+    def indexed_hashes(self):
+        self._consolidate()
+        ids, hashes = self._data[:2]
+        return dict(zip((str(i) for i in ids.tolist()), hashes.tolist()))
+
+    def upsert(self, ids, vectors, metadatas):
+        with self._lock:
+            self._changed.update(int(i) for i in ids)
+            self._pending.append((
+                np.array([int(i) for i in ids], dtype=np.int64),
+                np.array([meta["content_hash"] for meta in metadatas], dtype="U64"),
+                normalize_rows(np.vstack(vectors)),
+                self._filter_columns(metadatas),
+            ))
+
+    def delete(self, ids):
+        with self._lock:
+            self._changed.update(int(i) for i in ids)
+            self._deleted.update(int(i) for i in ids)
+
+    def flush(self):
+        self._consolidate()
+        if not self._dirty:
+            return
+        with self._file_lock():
+            manifest = self._read_manifest()
+            if manifest is not None and manifest["generation"] != self._generation:
+                self._rebase(manifest)
+            generation = max(self._generation, manifest["generation"] if manifest else 0) + 1
+            name = f"gen-{generation:06d}"
+            self._write_generation(self._path(name))
+            # Readers follow the manifest, so replacing it is the atomic switch
+            tmp_path = self._path("manifest.json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"generation": generation, "path": name, "count": len(self._data[0]),
+                           "created_at": time.time()}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._path("manifest.json"))
+            self._dirty = False
+            self._changed = set()
+            self._load(self._read_manifest())
+            self._remove_old_generations(generation)
+
+    def refresh(self):
+        manifest = self._read_manifest()
+        if manifest is None or manifest["generation"] == self._generation:
+            return False
+        with self._lock:
+            if self._pending or self._deleted or self._dirty:
+                # Unflushed local changes; flush() merges them into the new generation
+                return False
+            self._load(manifest)
+        return True
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock on the index directory for the duration of a flush (no-op without fcntl)"""
+        with open(self._path(".lock"), "w") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _rebase(self, manifest: Dict):
+        """Re-apply this process's unflushed changes on top of a generation written elsewhere"""
+        with self._lock:
+            ids, hashes, vectors, columns, _ = self._data
+            rows = np.flatnonzero(np.isin(ids, np.array(list(self._changed), dtype=np.int64)))
+            present = set(ids[rows].tolist())
+            self._load(manifest)
+            if len(rows):
+                self._pending.append((
+                    ids[rows], hashes[rows], np.asarray(vectors[rows]),
+                    {field: column[rows] for field, column in columns.items()},
+                ))
+            self._deleted = {job_id for job_id in self._changed if job_id not in present}
+        self._consolidate()
+
+    def _quantize(self, vectors: np.ndarray, quantized):
+        """(quantizer, codes) for the storage mode, reusing the current ones unless a retrain is due"""
+        if quantized is not None:
+            quantizer, codes = quantized
+            if len(vectors) < self.RETRAIN_GROWTH * quantizer.trained_rows:
+                return quantizer, codes
+        quantizer = train_quantizer(self.storage, vectors, subspaces=self.pq_subspaces)
+        return quantizer, quantizer.encode(vectors)
+
+    def _write_generation(self, directory: str):
+        ids, hashes, vectors, columns, quantized = self._data
+        if vectors is None:
+            vectors = np.empty((0, 0), dtype=np.float32)
+        arrays = [("vectors.npy", vectors), ("ids.npy", ids), ("hashes.npy", hashes)]
+        arrays += [(f"{field}.npy", column) for field, column in columns.items()]
+        quantizer = None
+        if self.storage != "float32" and len(vectors):
+            quantizer, codes = self._quantize(vectors, quantized)
+            arrays.append(("codes.npy", codes))
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        for name, arr in arrays:
+            with open(os.path.join(directory, name), "wb") as f:
+                np.save(f, arr)
+                f.flush()
+                os.fsync(f.fileno())
+        if quantizer is not None:
+            save_quantizer(quantizer, directory)
+
+    def _remove_old_generations(self, current: int):
+        """Delete generations beyond KEEP_GENERATIONS and files of the pre-manifest layout"""
+        # Processes still mapping a deleted generation keep reading it until
+        # they refresh: unlinked files stay valid while mapped
+        for entry in os.scandir(self.directory):
+            if entry.is_dir() and entry.name.startswith("gen-"):
+                if int(entry.name[4:]) <= current - self.KEEP_GENERATIONS:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            elif entry.is_file() and entry.name.endswith(".npy"):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def count(self):
+        self._consolidate()
+        return len(self._data[0])
+
+    @staticmethod
+    def _filter_mask(ids, columns, candidate_ids, filters) -> np.ndarray:
+        mask = np.ones(len(ids), dtype=bool)
+        if candidate_ids is not None:
+            mask &= np.isin(ids, np.asarray(candidate_ids, dtype=np.int64))
+        if filters.get("locations"):
+            mask &= np.isin(columns["location_key"], list(filters["locations"]))
+        # NaN (unknown) values fail every comparison and are filtered out
+        if filters.get("min_stipend") is not None:
+            mask &= columns["stipend_min"] >= filters["min_stipend"]
+        if filters.get("min_duration") is not None:
+            mask &= columns["duration_months_min"] >= filters["min_duration"]
+        if filters.get("max_duration") is not None:
+            mask &= columns["duration_months_min"] <= filters["max_duration"]
+        return mask
+
+    def search(self, query_vector, k, candidate_ids=None, filters=None):
+        return self.search_many([query_vector], k, candidate_ids, filters)[0]
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Column indexes and values of the k highest scores of every row, best first"""
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def search_many(self, query_vectors, k, candidate_ids=None, filters=None):
+        self._consolidate()
+        ids, _, vectors, columns, quantized = self._data
+        rows = None
+        if (candidate_ids is not None or filters) and vectors is not None:
+            # Score only the rows passing the candidate list and filters
+            rows = np.flatnonzero(self._filter_mask(ids, columns, candidate_ids, filters or {}))
+            ids = ids[rows]
+        k = min(k, len(ids))
+        if k <= 0 or vectors is None:
+            return [[] for _ in query_vectors]
+
+        shortlist = max(self.rerank_candidates, k)
+        if quantized is not None and len(ids) > shortlist:
+            quantizer, codes = quantized
+            codes = codes if rows is None else codes[rows]
+        else:
+            quantizer = None
+            vectors = vectors if rows is None else vectors[rows]
+
+        queries = normalize_rows(np.vstack(query_vectors))
+        results = []
+        for start in range(0, len(queries), self.QUERY_CHUNK_SIZE):
+            chunk = queries[start:start + self.QUERY_CHUNK_SIZE]
+            if quantizer is None:
+                top, top_scores = self._top_k(chunk @ vectors.T, k)
+            else:
+                # The codes pick a shortlist per query; only its float32 rows
+                # are read back and scored exactly
+                shortlisted, _ = self._top_k(quantizer.scores(chunk, codes), shortlist)
+                matrix_rows = shortlisted if rows is None else rows[shortlisted]
+                exact = np.einsum("qcd,qd->qc", vectors[matrix_rows], chunk)
+                best, top_scores = self._top_k(exact, k)
+                top = np.take_along_axis(shortlisted, best, axis=1)
+            for row_ids, row_scores in zip(ids[top], top_scores):
+                results.append(list(zip(row_ids.tolist(), row_scores.tolist())))
+        return results
+
+def create_backend(name: str, config) -> RetrievalBackend:
+    """Instantiate the retrieval backend selected by config"""
+    if name == "chroma":
+        return ChromaBackend(config.VECTORSTORE_DIR, config.VECTORSTORE_COLLECTION)
+    if name == "numpy":
+        return NumpyBackend(config.NUMPY_INDEX_DIR, storage=config.VECTOR_STORAGE,
+                            rerank_candidates=config.VECTOR_RERANK_CANDIDATES, pq_subspaces=config.PQ_SUBSPACES)
+    raise ValueError(f"Unknown retrieval backend: {name}")
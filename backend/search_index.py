@@ -0,0 +1,144 @@
+import re
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from models import db, Job
+
+# Searchable columns and their relevance weights (title > company > skills)
+_SQLITE_BM25_WEIGHTS = "10.0, 5.0, 3.0"
+
+_SQLITE_SETUP = [
+    """
+    CREATE VIRTUAL TABLE jobs_fts USING fts5(
+        internship_title, company_name, required_skills,
+        content='jobs', content_rowid='id', tokenize='unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts (rowid, internship_title, company_name, required_skills)
+        VALUES (new.id, new.internship_title, new.company_name, new.required_skills);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts (jobs_fts, rowid, internship_title, company_name, required_skills)
+        VALUES ('delete', old.id, old.internship_title, old.company_name, old.required_skills);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE ON jobs BEGIN
+        INSERT INTO jobs_fts (jobs_fts, rowid, internship_title, company_name, required_skills)
+        VALUES ('delete', old.id, old.internship_title, old.company_name, old.required_skills);
+        INSERT INTO jobs_fts (rowid, internship_title, company_name, required_skills)
+        VALUES (new.id, new.internship_title, new.company_name, new.required_skills);
+    END
+    """,
+    "INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')",
+]
+
+_POSTGRES_SETUP = [
+    """
+    ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(internship_title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(company_name, '')), 'B') ||
+        setweight(to_tsvector('simple', replace(coalesce(required_skills, ''), '|', ' ')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING GIN (search_vector)",
+]
+
+# Which implementation search_jobs() uses: 'sqlite', 'postgresql' or 'like'
+_mode = None
+
+
+def _query_terms(query):
+    """Alphanumeric search terms; everything else (FTS operators, quotes) is dropped"""
+    return re.findall(r"\w+", query.lower())[:10]
+
+
+def ensure_search_index():
+    """
+    Create the full-text index for jobs if needed.
+
+    SQLite gets an external-content FTS5 table kept in sync by triggers,
+    PostgreSQL a generated tsvector column with a GIN index. Other databases
+    (or SQLite builds without FTS5) fall back to LIKE scans.
+    """
+    global _mode
+    dialect = db.engine.dialect.name
+    try:
+        if dialect == 'sqlite':
+            with db.engine.begin() as conn:
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts'")
+                ).first()
+                if not exists:
+                    for statement in _SQLITE_SETUP:
+                        conn.execute(text(statement))
+                    print("✅ Built FTS5 search index for jobs")
+            _mode = 'sqlite'
+        elif dialect == 'postgresql':
+            with db.engine.begin() as conn:
+                for statement in _POSTGRES_SETUP:
+                    conn.execute(text(statement))
+            _mode = 'postgresql'
+        else:
+            _mode = 'like'
+    except (OperationalError, ProgrammingError) as e:
+        print(f"⚠️ Full-text search unavailable, falling back to LIKE: {e}")
+        _mode = 'like'
+    return _mode
+
+
+def search_jobs(query, limit, offset=0):
+    """
+    Relevance-ranked job search with prefix matching on every term.
+
+    Args:
+        query: Free-text query; all terms must match (as prefixes)
+        limit: Maximum number of ids to return
+        offset: Number of ranked results to skip
+
+    Returns:
+        List of matching active job ids, best first
+    """
+    terms = _query_terms(query)
+    if not terms or limit <= 0:
+        return []
+    if _mode is None:
+        ensure_search_index()
+
+    if _mode == 'sqlite':
+        match = " ".join(f'"{term}"*' for term in terms)
+        rows = db.session.execute(text(f"""
+            SELECT jobs.id FROM jobs_fts
+            JOIN jobs ON jobs.id = jobs_fts.rowid
+            WHERE jobs_fts MATCH :match AND jobs.is_active = 1
+            ORDER BY bm25(jobs_fts, {_SQLITE_BM25_WEIGHTS})
+            LIMIT :limit OFFSET :offset
+        """), {'match': match, 'limit': limit, 'offset': offset})
+    elif _mode == 'postgresql':
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        rows = db.session.execute(text("""
+            SELECT id FROM jobs
+            WHERE search_vector @@ to_tsquery('simple', :tsquery) AND is_active
+            ORDER BY ts_rank(search_vector, to_tsquery('simple', :tsquery)) DESC, id
+            LIMIT :limit OFFSET :offset
+        """), {'tsquery': tsquery, 'limit': limit, 'offset': offset})
+    else:
+        pattern = f"%{' '.join(terms)}%"
+        rows = (
+            db.session.query(Job.id)
+            .filter(Job.is_active.is_(True))
+            .filter(db.or_(
+                Job.internship_title.ilike(pattern),
+                Job.company_name.ilike(pattern),
+                Job.required_skills.ilike(pattern)
+            ))
+            .order_by(Job.id)
+            .limit(limit)
+            .offset(offset)
+        )
+    return [row[0] for row in rows]
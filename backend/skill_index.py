@@ -0,0 +1,112 @@
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+def parse_required_skills(required_skills: str, normalize: Callable[[str], str]) -> List[str]:
+    """Normalized, de-duplicated skills of a pipe-delimited required_skills value"""
+    skills = []
+    for skill in (required_skills or "").split("|"):
+        skill = skill.strip()
+        if skill and skill.lower() != "n/a":
+            skills.append(normalize(skill))
+    return list(dict.fromkeys(skill for skill in skills if skill))
+
+
+class SkillIndex:
+    """
+    In-memory inverted index from normalized skill to the jobs requiring it.
+
+    Each skill maps to a packed bitset over job ordinals, so "any"/"all"
+    queries are a handful of vectorized OR/AND operations over N/8 bytes,
+    and overlap counts are the sum of the unpacked bitsets of the query
+    skills.
+    """
+
+    def __init__(self):
+        self.job_ids = np.empty(0, dtype=np.int64)
+        self._bits: Dict[str, np.ndarray] = {}
+        self._skill_counts = np.empty(0, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    @property
+    def skills(self) -> List[str]:
+        return sorted(self._bits)
+
+    def build(self, rows: Iterable[Tuple[int, str]]):
+        """Index (job_id, skill) pairs"""
+        ordinals: Dict[int, int] = {}
+        postings: Dict[str, List[int]] = {}
+        for job_id, skill in rows:
+            ordinal = ordinals.setdefault(job_id, len(ordinals))
+            postings.setdefault(skill, []).append(ordinal)
+
+        n = len(ordinals)
+        self.job_ids = np.fromiter(ordinals, dtype=np.int64, count=n)
+        self._skill_counts = np.zeros(n, dtype=np.int32)
+        self._bits = {}
+        for skill, skill_ordinals in postings.items():
+            present = np.zeros(n, dtype=bool)
+            present[skill_ordinals] = True
+            self._skill_counts += present
+            self._bits[skill] = np.packbits(present, bitorder="little")
+        return self
+
+    def _unpack(self, bits: np.ndarray) -> np.ndarray:
+        return np.unpackbits(bits, count=len(self.job_ids), bitorder="little").astype(bool)
+
+    def _empty_bits(self) -> np.ndarray:
+        return np.zeros((len(self.job_ids) + 7) // 8, dtype=np.uint8)
+
+    def match(self, skills: Iterable[str], mode: str = "any") -> List[int]:
+        """Ids of jobs requiring any (or all) of the given normalized skills"""
+        skills = list(dict.fromkeys(skills))
+        if not skills or not len(self.job_ids):
+            return []
+        if mode == "any":
+            bits = self._empty_bits()
+            for skill in skills:
+                if skill in self._bits:
+                    bits |= self._bits[skill]
+        elif mode == "all":
+            if any(skill not in self._bits for skill in skills):
+                return []
+            bits = self._bits[skills[0]].copy()
+            for skill in skills[1:]:
+                bits &= self._bits[skill]
+        else:
+            raise ValueError(f"Unknown skill match mode: {mode}")
+        return self.job_ids[self._unpack(bits)].tolist()
+
+    def overlap(self, skills: Iterable[str], mode: str = "any") -> List[Tuple[int, int, float]]:
+        """
+        Jobs matching the skills, ranked by skill overlap.
+
+        Returns:
+            List of (job_id, number of query skills the job requires, share
+            of the job's required skills covered by the query), best first
+        """
+        if mode not in ("any", "all"):
+            raise ValueError(f"Unknown skill match mode: {mode}")
+        skills = list(dict.fromkeys(skills))
+        if mode == "all" and any(skill not in self._bits for skill in skills):
+            return []
+        skills = [skill for skill in skills if skill in self._bits]
+        if not skills:
+            return []
+        matched = np.zeros(len(self.job_ids), dtype=np.int32)
+        for skill in skills:
+            matched += self._unpack(self._bits[skill])
+
+        required = len(skills) if mode == "all" else 1
+        rows = np.flatnonzero(matched >= required)
+        coverage = matched[rows] / np.maximum(self._skill_counts[rows], 1)
+        # Most shared skills first, then best coverage, then lowest id
+        order = np.lexsort((self.job_ids[rows], -coverage, -matched[rows]))
+        rows, coverage = rows[order], coverage[order]
+        return [
+            (int(job_id), int(count), float(share))
+            for job_id, count, share in zip(self.job_ids[rows], matched[rows], coverage)
+        ]
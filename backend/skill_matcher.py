@@ -0,0 +1,104 @@
+import heapq
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9\+\#\.\-]*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens that keep skill punctuation (c++, c#, node.js, scikit-learn)"""
+    return [tok.rstrip(".-") for tok in TOKEN_RE.findall(text.lower())]
+
+
+def _trigrams(term: str) -> Set[str]:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SkillMatcher:
+    """
+    Precompiled skill extractor.
+
+    Exact matches use a word-level trie over every skill and alias, so one
+    left-to-right pass over the resume tokens finds single- and multi-word
+    skills alike (the word-granular equivalent of Aho-Corasick). Tokens
+    without an exact match are looked up fuzzily: a character-trigram index
+    and a length bound narrow the candidates before difflib's ratio is
+    computed, instead of comparing every token with every skill.
+    """
+
+    MAX_FUZZY_CANDIDATES = 32
+
+    def __init__(self, skills: Iterable[str], aliases: Optional[Dict[str, str]] = None, cutoff: float = 0.8):
+        self.cutoff = cutoff
+        # Every surface form (skill or alias) -> canonical skill name
+        self.forms: Dict[str, str] = {}
+        for skill in skills:
+            self.forms.setdefault(skill.lower(), skill.lower())
+        for alias, canonical in (aliases or {}).items():
+            self.forms[alias.lower()] = canonical.lower()
+
+        self._trie: Dict = {}
+        for form, canonical in self.forms.items():
+            node = self._trie
+            for tok in tokenize(form):
+                node = node.setdefault(tok, {})
+            node[None] = canonical
+
+        self._trigram_index: Dict[str, List[str]] = defaultdict(list)
+        for form in self.forms:
+            for gram in _trigrams(form):
+                self._trigram_index[gram].append(form)
+
+        self.fuzzy_match = lru_cache(maxsize=50000)(self._fuzzy_match)
+
+    def _exact_matches(self, tokens: List[str]) -> Set[str]:
+        found = set()
+        for start in range(len(tokens)):
+            node = self._trie
+            pos = start
+            while pos < len(tokens) and tokens[pos] in node:
+                node = node[tokens[pos]]
+                pos += 1
+                if None in node:
+                    found.add(node[None])
+        return found
+
+    def _fuzzy_match(self, token: str) -> Tuple[str, ...]:
+        """Canonical skills whose name or alias is at least `cutoff` similar to token"""
+        if len(token) < 2:
+            return ()
+        shared = defaultdict(int)
+        for gram in _trigrams(token):
+            for form in self._trigram_index.get(gram, ()):
+                shared[form] += 1
+
+        # Strings above the cutoff share most of their trigrams, so only the
+        # best-overlapping forms are worth an exact ratio
+        matches = []
+        for form in heapq.nlargest(self.MAX_FUZZY_CANDIDATES, shared, key=shared.__getitem__):
+            # ratio = 2 * matching / (len_a + len_b) can never reach the cutoff
+            # when the lengths are too far apart
+            if 2 * min(len(form), len(token)) < self.cutoff * (len(form) + len(token)):
+                continue
+            matcher = SequenceMatcher(None, token, form)
+            if matcher.quick_ratio() >= self.cutoff and matcher.ratio() >= self.cutoff:
+                matches.append((matcher.ratio(), self.forms[form]))
+        matches.sort(reverse=True)
+        return tuple(dict.fromkeys(canonical for _, canonical in matches[:3]))
+
+    def extract(self, text: str) -> List[str]:
+        tokens = tokenize(text)
+        found = self._exact_matches(tokens)
+        for token in dict.fromkeys(tokens):
+            if token not in self.forms:
+                found.update(self.fuzzy_match(token))
+        return sorted(found)
+
+    def normalize(self, skill: str) -> str:
+        """Canonical name for a skill or alias; unknown skills are lowercased"""
+        key = " ".join(tokenize(skill))
+        return self.forms.get(key, key)
@@ -0,0 +1,245 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Optional
+
+from config import Config
+from result_cache import TTLCache, cache_key
+
+PROMPT_TEMPLATE = """
+You are a professional resume editor. Write a 2-3 sentence personal summary in **first person** for the candidate's resume header.
+
+**Style:** Natural, confident, concise. Like a LinkedIn bio or resume profile.
+**Focus:** Highlight key skills, experiences, and career goals.
+**Avoid:** Buzzwords like "passionate", "hardworking", "team player". Be specific.
+
+**Candidate Info:**
+Name: {name}
+Key Skills: {skills}
+Recent Experience: {experience}
+Projects: {projects}
+
+**Goal:** Generate a profile summary for this candidate's resume.
+"""
+
+
+class ModelUnavailableError(RuntimeError):
+    """No model can be used at all (e.g. the client library is missing)"""
+
+
+def summary_fields(parsed_data: Dict) -> Dict:
+    """The parts of a parsed resume that go into the summary prompt"""
+    experience_lines = [
+        f"{exp.get('title', '')} at {exp.get('company', '')} ({exp.get('duration', '')})"
+        for exp in parsed_data.get('experience', [])
+    ]
+    projects_titles = [
+        proj.get('title', '').split('.')[0].strip()
+        for proj in parsed_data.get('projects', [])
+    ]
+    return {
+        "name": parsed_data.get("name", "the candidate"),
+        "skills": ", ".join(parsed_data.get("skills", [])),
+        "experience": "; ".join(experience_lines[:2]),
+        "projects": "; ".join(projects_titles[:2]),
+    }
+
+
+def extractive_summary(parsed_data: Dict) -> str:
+    """First-person summary assembled from the parsed fields, without any model call"""
+    sentences = []
+    skills = parsed_data.get("skills") or []
+    if skills:
+        sentences.append(f"I work with {', '.join(skills[:6])}.")
+    experience = [exp for exp in parsed_data.get("experience") or [] if exp.get("title")]
+    if experience:
+        latest = experience[0]
+        company = f" at {latest['company']}" if latest.get("company") else ""
+        sentences.append(f"Most recently I worked as {latest['title']}{company}.")
+    projects = [
+        proj.get("title", "").split(".")[0].strip()
+        for proj in parsed_data.get("projects") or []
+        if proj.get("title")
+    ]
+    if projects:
+        sentences.append(f"My projects include {'; '.join(projects[:2])}.")
+    education = [edu for edu in parsed_data.get("education") or [] if edu.get("degree")]
+    if education and len(sentences) < 3:
+        sentences.append(f"I studied {education[0]['degree']}.")
+    return " ".join(sentences) or "I am looking for internship opportunities."
+
+
+class StubModel:
+    """Offline stand-in for a GenerativeModel: fixed reply after an optional delay, or a failure"""
+
+    class _Response:
+        def __init__(self, text):
+            self.text = text
+
+    def __init__(self, text: str = "I build things.", delay: float = 0.0, error: Optional[Exception] = None):
+        self.text = text
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def generate_content(self, contents, *, generation_config=None, safety_settings=None, stream=False):
+        # Same keywords as GenerativeModel.generate_content in google-generativeai 0.3.x,
+        # so calls the real client would reject fail here too
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self._Response(self.text)
+
+
+def _gemini_model():
+    # Imported on first use, off the startup path
+    try:
+        import google.generativeai as genai
+    except ImportError:
+        raise ModelUnavailableError("google-generativeai not installed")
+    genai.configure(api_key=Config.GEMINI_API_KEY)
+    return genai.GenerativeModel(Config.GEMINI_MODEL_NAME)
+
+
+class SummaryService:
+    """
+    AI profile summaries with caching, request coalescing and a latency budget.
+
+    The model client is created once; if it can't be created at all (e.g.
+    the client library is missing), that is remembered and every summary
+    is extractive without trying again. Summaries are cached by the prompt's
+    input fields, and concurrent requests for the same fields share one
+    model call. Calls run on a small thread pool; a caller waits at most
+    budget_seconds (including retries) and otherwise gets an extractive
+    summary, while a late model answer still lands in the cache for the
+    next request.
+    """
+
+    def __init__(self, model_factory: Callable = _gemini_model, budget_seconds: float = 4.0,
+                 retries: int = 1, cache_size: int = 1024, cache_ttl_seconds: float = 86400,
+                 workers: int = 4):
+        self.model_factory = model_factory
+        self.budget_seconds = budget_seconds
+        self.retries = retries
+        self._cache = TTLCache(cache_size, cache_ttl_seconds)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="summary")
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._model = None
+        self._unavailable: Optional[ModelUnavailableError] = None
+        self._counters = {"model": 0, "cache": 0, "coalesced": 0, "fallback": 0, "extractive": 0}
+
+    def _count(self, source: str):
+        with self._lock:
+            self._counters[source] += 1
+
+    def _get_model(self):
+        with self._lock:
+            if self._unavailable is not None:
+                raise self._unavailable
+            if self._model is None:
+                try:
+                    self._model = self.model_factory()
+                except ModelUnavailableError as e:
+                    self._unavailable = e
+                    raise
+            return self._model
+
+    def _generate(self, fields: Dict) -> str:
+        # The caller's wait on the future enforces the budget (the pinned
+        # client has no per-call timeout); late answers are still useful to
+        # the cache, so a call may run past it, but retries stop once it is spent
+        deadline = time.monotonic() + self.budget_seconds
+        prompt = PROMPT_TEMPLATE.format(**fields)
+        model = self._get_model()
+        for attempt in range(self.retries + 1):
+            try:
+                return model.generate_content(prompt).text.strip()
+            except Exception:
+                if attempt == self.retries or time.monotonic() >= deadline:
+                    raise
+                time.sleep(min(0.2 * 2 ** attempt, max(0.0, deadline - time.monotonic())))
+
+    def _finish(self, key: str, future: Future):
+        with self._lock:
+            self._inflight.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self._cache.put(key, future.result())
+
+    def summarize(self, parsed_data: Dict) -> Dict:
+        """
+        Summary for a parsed resume.
+
+        Returns:
+            {"text": ..., "source": ...}: "model" or "cache", "fallback" when
+            the model failed or ran out of budget, "extractive" when no
+            model is available at all
+        """
+        fields = summary_fields(parsed_data)
+        key = cache_key(Config.GEMINI_MODEL_NAME, fields)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._count("cache")
+            return {"text": cached, "source": "cache"}
+
+        if self._unavailable is not None:
+            self._count("extractive")
+            return {"text": extractive_summary(parsed_data), "source": "extractive"}
+
+        with self._lock:
+            future = self._inflight.get(key)
+            coalesced = future is not None
+            if future is None:
+                future = self._pool.submit(self._generate, fields)
+                self._inflight[key] = future
+        if coalesced:
+            self._count("coalesced")
+        else:
+            # Outside the lock: the callback runs right away if the call already finished
+            future.add_done_callback(lambda done: self._finish(key, done))
+
+        try:
+            text = future.result(timeout=self.budget_seconds)
+            self._count("model")
+            return {"text": text, "source": "model"}
+        except FutureTimeoutError:
+            print(f"⏱️ AI summary exceeded {self.budget_seconds}s budget, using extractive summary")
+        except ModelUnavailableError:
+            self._count("extractive")
+            return {"text": extractive_summary(parsed_data), "source": "extractive"}
+        except Exception as e:
+            print(f"❌ Error generating AI summary: {e}")
+        self._count("fallback")
+        return {"text": extractive_summary(parsed_data), "source": "fallback"}
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+        return {**counters, "cache_entries": self._cache.stats()["entries"]}
+
+
+_summary_service = None
+_summary_service_lock = threading.Lock()
+
+
+def get_summary_service() -> SummaryService:
+    """Process-wide summary service configured from Config"""
+    global _summary_service
+    with _summary_service_lock:
+        if _summary_service is None:
+            _summary_service = SummaryService(
+                budget_seconds=Config.AI_SUMMARY_BUDGET_SECONDS,
+                retries=Config.AI_SUMMARY_RETRIES,
+                cache_size=Config.AI_SUMMARY_CACHE_SIZE,
+                cache_ttl_seconds=Config.AI_SUMMARY_CACHE_TTL_SECONDS,
+                workers=Config.AI_SUMMARY_WORKERS
+            )
+        return _summary_service
+
+
+def set_summary_service(service: Optional[SummaryService]):
+    """Replace the process-wide service, e.g. with one around a StubModel in tests"""
+    global _summary_service
+    with _summary_service_lock:
+        _summary_service = service
@@ -0,0 +1,227 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+TERMINAL_STATUSES = ("done", "failed")
+
+
+class QueueFullError(Exception):
+    """Raised when a task is submitted while the queue is at capacity"""
+
+
+def _process_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # os.kill would terminate the process; treat owners as gone
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class TaskQueue:
+    """
+    Durable background task queue backed by a local SQLite file.
+
+    Tasks are rows in a `tasks` table; a fixed pool of worker threads claims
+    queued rows, runs the handler and stores its result together with
+    per-stage timings. submit() refuses new work once `max_pending` tasks
+    are queued or running, which gives callers a clear backpressure signal.
+    Running tasks record the pid of the process working on them, so
+    processes sharing the file (e.g. several server workers) only re-queue
+    tasks whose process is gone when they start.
+    """
+
+    def __init__(self, db_path: str, handler: Callable[[Dict, Dict], Dict], workers: int = 2,
+                 max_pending: int = 50, poll_interval: float = 1.0):
+        self.db_path = db_path
+        self.handler = handler
+        self.workers = workers
+        self.max_pending = max_pending
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        self._claim_lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._threads = []
+
+        conn = self._conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                timings TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                owner_pid INTEGER
+            )
+        """)
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(tasks)")}
+        if "owner_pid" not in columns:
+            conn.execute("ALTER TABLE tasks ADD COLUMN owner_pid INTEGER")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_tasks_status_created ON tasks (status, created_at)")
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def requeue_interrupted(self) -> int:
+        """Queue tasks again whose process stopped while running them"""
+        conn = self._conn()
+        owners = [row[0] for row in conn.execute("SELECT DISTINCT owner_pid FROM tasks WHERE status = 'running'")]
+        # A task owned by this pid was claimed by an earlier process that had
+        # the same pid: this one hasn't claimed anything yet
+        gone = [pid for pid in owners if pid is None or pid == os.getpid() or not _process_alive(pid)]
+        requeued = 0
+        for pid in gone:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = 'queued', started_at = NULL, owner_pid = NULL "
+                "WHERE status = 'running' AND owner_pid IS ?",
+                (pid,)
+            )
+            requeued += cursor.rowcount
+        return requeued
+
+    def start(self, requeue: bool = True):
+        """Start the worker threads, first re-queuing interrupted tasks unless requeue is False"""
+        if self._threads:
+            return
+        if requeue:
+            self.requeue_interrupted()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"task-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def after_fork(self):
+        """Drop the parent's connections, locks and threads in a forked child; call start() after"""
+        self._local = threading.local()
+        self._claim_lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._threads = []
+
+    def pending_count(self) -> int:
+        row = self._conn().execute(
+            "SELECT COUNT(*) FROM tasks WHERE status IN ('queued', 'running')"
+        ).fetchone()
+        return row[0]
+
+    def pending_payloads(self) -> List[Dict]:
+        """Payloads of the queued and running tasks"""
+        rows = self._conn().execute(
+            "SELECT payload FROM tasks WHERE status IN ('queued', 'running')"
+        ).fetchall()
+        return [json.loads(row["payload"]) for row in rows]
+
+    def submit(self, payload: Dict) -> str:
+        """Queue a task and return its id; raises QueueFullError at capacity"""
+        task_id = uuid.uuid4().hex
+        # Capacity check and insert in one statement, so concurrent submits can't overshoot
+        cursor = self._conn().execute(
+            "INSERT INTO tasks (id, status, payload, created_at) SELECT ?, 'queued', ?, ? "
+            "WHERE (SELECT COUNT(*) FROM tasks WHERE status IN ('queued', 'running')) < ?",
+            (task_id, json.dumps(payload), time.time(), self.max_pending)
+        )
+        if cursor.rowcount == 0:
+            raise QueueFullError(f"Task queue is full ({self.max_pending} pending tasks)")
+        with self._wakeup:
+            self._wakeup.notify()
+        return task_id
+
+    def get(self, task_id: str) -> Optional[Dict]:
+        row = self._conn().execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "task_id": row["id"],
+            "status": row["status"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "timings": json.loads(row["timings"]) if row["timings"] else {},
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+        }
+
+    def wait(self, task_id: str, timeout: float) -> Optional[Dict]:
+        """Return the task once it is finished or the timeout has passed"""
+        deadline = time.monotonic() + timeout
+        while True:
+            task = self.get(task_id)
+            if task is None or task["status"] in TERMINAL_STATUSES or time.monotonic() >= deadline:
+                return task
+            time.sleep(min(0.2, max(0.0, deadline - time.monotonic())))
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete finished tasks older than the given age"""
+        cursor = self._conn().execute(
+            "DELETE FROM tasks WHERE status IN ('done', 'failed') AND finished_at < ?",
+            (time.time() - older_than_seconds,)
+        )
+        return cursor.rowcount
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        conn = self._conn()
+        with self._claim_lock:
+            # BEGIN IMMEDIATE also serialises claims across processes sharing the file
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id, payload, created_at FROM tasks WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE tasks SET status = 'running', started_at = ?, owner_pid = ? WHERE id = ?",
+                        (time.time(), os.getpid(), row["id"])
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return row
+
+    def _work(self):
+        while True:
+            try:
+                row = self._claim()
+            except sqlite3.Error as e:
+                print(f"❌ Task queue error: {e}")
+                row = None
+            if row is None:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+                continue
+            self._run(row)
+
+    def _run(self, row: sqlite3.Row):
+        started = time.time()
+        timings = {"queue_wait_ms": round((started - row["created_at"]) * 1000, 1)}
+        result, error, status = None, None, "done"
+        try:
+            result = self.handler(json.loads(row["payload"]), timings)
+            if isinstance(result, dict) and "error" in result:
+                error, status = str(result["error"]), "failed"
+        except Exception as e:
+            error, status = str(e), "failed"
+        timings["total_ms"] = round((time.time() - started) * 1000, 1)
+        self._conn().execute(
+            "UPDATE tasks SET status = ?, result = ?, error = ?, timings = ?, finished_at = ? WHERE id = ?",
+            (status, json.dumps(result) if result is not None else None, error,
+             json.dumps(timings), time.time(), row["id"])
+        )
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Make the backend modules importable however pytest is invoked
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+@pytest.fixture
+def app_config(tmp_path, monkeypatch):
+    """
+    Config on a temporary database and task queue, without warm-up or
+    upload persistence; the catalog CSV imported on first use has no rows.
+    """
+    import upload_store
+    from config import Config
+    from csv_importer import JOB_COLUMNS
+
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'jobs.db'}"
+        TASK_DB_PATH = str(tmp_path / 'tasks.sqlite3')
+        TASK_WORKERS = 0
+        WARM_UP_ON_START = False
+
+    csv_path = tmp_path / 'jobs.csv'
+    csv_path.write_text(','.join(JOB_COLUMNS) + '\n', encoding='utf-8')
+    monkeypatch.setattr(Config, 'CSV_FILE', str(csv_path))
+    monkeypatch.setattr(Config, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    monkeypatch.setattr(Config, 'PERSIST_UPLOADS', False)
+    monkeypatch.setattr(upload_store, '_upload_store', None)
+    return TestConfig
+
+
+@pytest.fixture
+def app(app_config):
+    import app as app_module
+    return app_module.create_app(app_config)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,39 @@
+import app as app_module
+import core_logic
+import csv_importer
+from models import db, Job, JobSkill
+
+
+def test_backfills_run_without_warm_up(app, app_config):
+    # Jobs as an older version stored them: no skills rows, no parsed filter columns
+    with app.app_context():
+        db.session.add(Job(internship_title='Data Intern', company_name='Acme', location='Bengaluru',
+                           required_skills='Python | SQL', stipend_inr='12000', duration_months='6 Months'))
+        db.session.commit()
+
+    restarted = app_module.create_app(app_config)
+    with restarted.app_context():
+        job = Job.query.one()
+        assert (job.location_key, job.stipend_min, job.duration_months_min) == ('bangalore', 12000, 6.0)
+        assert sorted(skill for (skill,) in db.session.query(JobSkill.skill)) == ['python', 'sql']
+
+
+def test_empty_catalog_is_imported_on_first_request(app, client, tmp_path, monkeypatch):
+    monkeypatch.setattr(core_logic, 'update_vectorstore', lambda changed_ids, removed_ids: None)
+    csv_path = tmp_path / 'jobs.csv'
+    csv_path.write_text(
+        ','.join(csv_importer.JOB_COLUMNS) + '\n'
+        + 'ML Intern,Acme,Pune,Build models,Python | PyTorch,10000,3 Months\n',
+        encoding='utf-8'
+    )
+    imports = []
+    real_import = app_module.import_jobs_from_csv
+    monkeypatch.setattr(app_module, 'import_jobs_from_csv', lambda: imports.append(1) or real_import())
+
+    assert client.get('/api/ready').status_code == 503
+    assert imports == []
+
+    jobs = client.get('/api/jobs/by-skills?skills=pytorch').get_json()['jobs']
+    assert [job['internship_title'] for job in jobs] == ['ML Intern']
+    client.get('/api/jobs')
+    assert imports == [1]
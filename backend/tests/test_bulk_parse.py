@@ -0,0 +1,83 @@
+import json
+import zipfile
+
+import pytest
+
+import bulk_parse
+import resume_parser
+
+RESUME = b'Jane Doe\njane@example.com\nSkills\nPython, SQL\n'
+
+
+@pytest.fixture
+def parsed_names(monkeypatch):
+    """Names parse_resume was called for; files named bad* fail"""
+    names = []
+    real_parse = resume_parser.parse_resume
+
+    def parse_file(name, data, summarize):
+        names.append(name)
+        if name.startswith('bad'):
+            return {'error': 'unreadable'}
+        return real_parse(data, filename=name, summarize=summarize)
+
+    monkeypatch.setattr(bulk_parse, '_parse_file', parse_file)
+    return names
+
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def run(source, output, **options):
+    return bulk_parse.run(str(source), str(output), workers=0, checkpoint_every=2, **options)
+
+
+def test_reruns_skip_parsed_files_and_retry_failures(tmp_path, parsed_names):
+    source = tmp_path / 'resumes'
+    source.mkdir()
+    (source / 'a.txt').write_bytes(RESUME)
+    (source / 'b.txt').write_bytes(RESUME.replace(b'Jane', b'John'))
+    (source / 'bad.txt').write_bytes(b'?')
+    output = tmp_path / 'out.jsonl'
+
+    first = run(source, output)
+    assert (first['parsed'], first['failed'], first['skipped']) == (2, 1, 0)
+    assert [record['file'] for record in read_jsonl(output)] == ['a.txt', 'b.txt']
+    assert read_jsonl(output)[0]['parsed']['skills'] == ['python', 'sql']
+
+    # Unchanged files are skipped; the failed one is tried again
+    parsed_names.clear()
+    second = run(source, output)
+    assert (second['parsed'], second['failed'], second['skipped']) == (0, 1, 2)
+    assert parsed_names == ['bad.txt']
+
+    # Changed content is parsed again, and --force re-parses everything
+    (source / 'a.txt').write_bytes(RESUME + b'Docker\n')
+    parsed_names.clear()
+    run(source, output)
+    assert parsed_names == ['a.txt', 'bad.txt']
+    parsed_names.clear()
+    run(source, output, force=True)
+    assert parsed_names == ['a.txt', 'b.txt', 'bad.txt']
+
+
+def test_failures_are_not_current(tmp_path):
+    state = bulk_parse.BulkState(str(tmp_path / 'state.sqlite3'))
+    state.record('cv.txt', 'abc', error='unreadable')
+    assert not state.is_current('cv.txt', 'abc')
+    state.record('cv.txt', 'abc')
+    assert state.is_current('cv.txt', 'abc')
+    state.close()
+    assert bulk_parse.BulkState(str(tmp_path / 'state.sqlite3')).is_current('cv.txt', 'abc')
+
+
+def test_reads_zip_archives(tmp_path, parsed_names):
+    archive = tmp_path / 'resumes.zip'
+    with zipfile.ZipFile(archive, 'w') as f:
+        f.writestr('team/a.txt', RESUME)
+        f.writestr('team/notes.xlsx', b'')
+    result = run(archive, tmp_path / 'out.jsonl')
+    assert result['parsed'] == 1
+    assert parsed_names == ['team/a.txt']
@@ -0,0 +1,202 @@
+import csv
+
+import pytest
+
+import core_logic
+import csv_importer
+from csv_importer import import_jobs_from_csv
+from models import db, Job, JobSkill
+
+FIELDS = ['internship_title', 'company_name', 'location', 'full_description',
+          'required_skills', 'stipend_inr', 'duration_months']
+
+
+def job_row(n, **overrides):
+    row = {
+        'internship_title': f'Intern {n}', 'company_name': f'Company {n}', 'location': 'Pune',
+        'full_description': f'Work on project {n}', 'required_skills': 'Python | SQL',
+        'stipend_inr': '10000', 'duration_months': '3 Months',
+    }
+    row.update(overrides)
+    return row
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.fixture
+def reindexed(app, monkeypatch):
+    """Records the (changed_ids, removed_ids) each import hands to the vector store"""
+    calls = []
+    monkeypatch.setattr(core_logic, 'update_vectorstore',
+                        lambda changed_ids, removed_ids: calls.append((sorted(changed_ids), sorted(removed_ids))))
+    with app.app_context():
+        yield calls
+
+
+def test_replace_import(tmp_path, reindexed):
+    rows = [job_row(n) for n in range(5)] + [job_row(5, company_name='')]
+    report = import_jobs_from_csv(write_csv(tmp_path / 'jobs.csv', rows), chunksize=2, mode='replace')
+
+    assert report['inserted'] == 5
+    assert report['invalid'] == 1
+    assert Job.query.count() == 5
+    job = Job.query.filter_by(internship_title='Intern 0').one()
+    assert (job.location_key, job.stipend_min, job.duration_months_min) == ('pune', 10000, 3.0)
+    assert {skill for (skill,) in db.session.query(JobSkill.skill).filter_by(job_id=job.id)} == {'python', 'sql'}
+    assert reindexed == [(sorted(report['changed_ids']), [])]
+    assert len(report['changed_ids']) == 5
+
+
+def test_failed_import_keeps_previous_catalog(tmp_path, reindexed, monkeypatch):
+    import_jobs_from_csv(write_csv(tmp_path / 'old.csv', [job_row(n) for n in range(3)]), mode='replace')
+    reindexed.clear()
+
+    real_insert = csv_importer._bulk_insert
+    chunks = []
+
+    def failing_insert(records):
+        chunks.append(records)
+        if len(chunks) == 2:
+            raise RuntimeError('disk full')
+        real_insert(records)
+
+    monkeypatch.setattr(csv_importer, '_bulk_insert', failing_insert)
+    new_rows = [job_row(n, company_name='New') for n in range(4)]
+    assert import_jobs_from_csv(write_csv(tmp_path / 'new.csv', new_rows), chunksize=2, mode='replace') is False
+
+    # The whole import was one transaction: the first chunk was rolled back too
+    assert sorted(title for (title,) in db.session.query(Job.internship_title)) == ['Intern 0', 'Intern 1', 'Intern 2']
+    assert Job.query.filter_by(company_name='New').count() == 0
+    assert JobSkill.query.count() == 6
+    assert reindexed == []
+
+
+def test_replace_reindexes_removed_jobs(tmp_path, reindexed):
+    first = import_jobs_from_csv(write_csv(tmp_path / 'a.csv', [job_row(n) for n in range(3)]), mode='replace')
+    second = import_jobs_from_csv(write_csv(tmp_path / 'b.csv', [job_row(0)]), mode='replace')
+
+    assert Job.query.count() == 1
+    (job_id,) = second['changed_ids']
+    assert set(second['removed_ids']) == set(first['changed_ids']) - {job_id}
+    assert reindexed[-1] == ([job_id], sorted(second['removed_ids']))
+
+
+def test_incremental_import_only_touches_changed_rows(tmp_path, reindexed):
+    rows = [job_row(n) for n in range(4)]
+    first = import_jobs_from_csv(write_csv(tmp_path / 'a.csv', rows), mode='incremental')
+    assert first['inserted'] == 4
+    ids = {job.internship_title: job.id for job in Job.query}
+
+    rows[1] = job_row(1, stipend_inr='15000')
+    rows[3] = job_row(3, required_skills='Java')
+    rows.append(job_row(4))
+    rows.append(job_row(0))  # duplicate natural key
+    second = import_jobs_from_csv(write_csv(tmp_path / 'b.csv', rows), mode='incremental')
+
+    assert {k: second[k] for k in ('inserted', 'updated', 'unchanged', 'deactivated', 'duplicates')} == \
+        {'inserted': 1, 'updated': 2, 'unchanged': 2, 'deactivated': 0, 'duplicates': 1}
+    new_id = Job.query.filter_by(internship_title='Intern 4').one().id
+    assert sorted(second['changed_ids']) == sorted([ids['Intern 1'], ids['Intern 3'], new_id])
+    # Updated in place, keeping their ids and re-derived fields and skills
+    assert db.session.get(Job, ids['Intern 1']).stipend_min == 15000
+    assert [skill for (skill,) in db.session.query(JobSkill.skill).filter_by(job_id=ids['Intern 3'])] == ['java']
+
+    third = import_jobs_from_csv(write_csv(tmp_path / 'b.csv', rows), mode='incremental')
+    assert third['unchanged'] == 5
+    assert third['changed_ids'] == [] and third['removed_ids'] == []
+    assert len(reindexed) == 2
+
+
+def test_incremental_import_soft_deletes_and_revives(tmp_path, reindexed):
+    rows = [job_row(n) for n in range(3)]
+    import_jobs_from_csv(write_csv(tmp_path / 'a.csv', rows), mode='incremental')
+    dropped_id = Job.query.filter_by(internship_title='Intern 2').one().id
+
+    report = import_jobs_from_csv(write_csv(tmp_path / 'b.csv', rows[:2]), mode='incremental')
+    assert report['deactivated'] == 1
+    assert report['removed_ids'] == [dropped_id]
+    assert reindexed[-1] == ([], [dropped_id])
+    # Soft-deleted: the row is kept but no longer active
+    assert Job.query.count() == 3
+    assert Job.active().count() == 2
+    assert db.session.get(Job, dropped_id).is_active is False
+
+    # Dropping it again is a no-op, bringing it back re-activates the same row
+    assert import_jobs_from_csv(write_csv(tmp_path / 'b.csv', rows[:2]), mode='incremental')['deactivated'] == 0
+    report = import_jobs_from_csv(write_csv(tmp_path / 'a.csv', rows), mode='incremental')
+    assert (report['inserted'], report['updated']) == (0, 1)
+    assert report['changed_ids'] == [dropped_id]
+    assert Job.active().count() == 3
+
+
+def test_source_id_column_is_the_natural_key(tmp_path, reindexed):
+    path = tmp_path / 'jobs.csv'
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS + ['source_id'])
+        writer.writeheader()
+        writer.writerow({**job_row(0), 'source_id': 'a-1'})
+    import_jobs_from_csv(str(path), mode='incremental')
+    job_id = Job.query.one().id
+
+    # A renamed posting with the same source id is an update, not a new job
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS + ['source_id'])
+        writer.writeheader()
+        writer.writerow({**job_row(0, internship_title='Data Intern'), 'source_id': 'a-1'})
+    report = import_jobs_from_csv(str(path), mode='incremental')
+    assert (report['inserted'], report['updated'], report['deactivated']) == (0, 1, 0)
+    assert Job.query.one().id == job_id
+    assert Job.query.one().internship_title == 'Data Intern'
+
+
+def test_incremental_import_over_duplicate_legacy_rows(tmp_path, reindexed):
+    # Rows as the old importer wrote them: no source key, duplicates kept
+    for row in (job_row(0), job_row(0), job_row(1)):
+        db.session.add(Job(**row))
+    db.session.commit()
+    legacy_ids = [job.id for job in Job.query.order_by(Job.id)]
+
+    report = import_jobs_from_csv(write_csv(tmp_path / 'jobs.csv', [job_row(0), job_row(1)]), mode='incremental')
+    assert report is not False
+    assert (report['inserted'], report['deactivated']) == (0, 1)
+    assert report['removed_ids'] == [legacy_ids[1]]
+    assert [job.id for job in Job.active().order_by(Job.id)] == [legacy_ids[0], legacy_ids[2]]
+    assert db.session.get(Job, legacy_ids[1]).source_key is None
+
+    # Later imports keep working and leave the duplicate alone
+    report = import_jobs_from_csv(write_csv(tmp_path / 'jobs.csv', [job_row(0), job_row(1)]), mode='incremental')
+    assert (report['unchanged'], report['deactivated'], report['removed_ids']) == (2, 0, [])
+
+
+def test_vector_store_failure_does_not_fail_the_import(tmp_path, reindexed, monkeypatch):
+    def failing_update(changed_ids, removed_ids):
+        raise RuntimeError('model download failed')
+
+    monkeypatch.setattr(core_logic, 'update_vectorstore', failing_update)
+    monkeypatch.setattr(core_logic, '_vectorstore', object())
+    report = import_jobs_from_csv(write_csv(tmp_path / 'jobs.csv', [job_row(0)]), mode='incremental')
+
+    assert report['inserted'] == 1
+    assert report['warnings'] == ['Vector store update failed (model download failed); it is re-synced on next use']
+    assert Job.query.count() == 1
+    # Dropped, so the next search re-syncs it with the committed jobs
+    assert core_logic._vectorstore is None
+
+
+def test_admin_import_reports_vector_store_failure(client, tmp_path, monkeypatch):
+    def failing_update(changed_ids, removed_ids):
+        raise RuntimeError('disk full')
+
+    monkeypatch.setattr(core_logic, 'update_vectorstore', failing_update)
+    monkeypatch.setattr(core_logic.Config, 'CSV_FILE', write_csv(tmp_path / 'new.csv', [job_row(0)]))
+    response = client.post('/api/admin/import-jobs')
+    body = response.get_json()
+    assert response.status_code == 200 and body['success'] is True
+    assert body['report']['inserted'] == 1
+    assert body['report']['warnings'] == ['Vector store update failed (disk full); it is re-synced on next use']
@@ -0,0 +1,18 @@
+import io
+
+import pytest
+
+
+@pytest.mark.parametrize('value', ['nan', 'inf', '-Infinity', 'abc'])
+def test_non_finite_or_invalid_filter_values_are_rejected(client, value):
+    response = client.post(f'/api/recommend?min_stipend={value}',
+                           data={'resume': (io.BytesIO(b'Jo\nSkills\nPython\n'), 'r.txt')})
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': 'min_stipend must be a number'}
+
+
+@pytest.mark.parametrize('name', ['min_stipend', 'min_duration', 'max_duration'])
+def test_batch_rejects_non_finite_filters_in_json_body(client, name):
+    response = client.post('/api/recommend/batch', json={'profiles': [{'name': 'a'}], name: 'NaN'})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == f'{name} must be a number'
@@ -0,0 +1,133 @@
+import pytest
+
+import core_logic
+from lexical_index import BM25Index, fuse_rankings, job_terms, resume_terms
+from models import db, Job
+from resume_parser import normalize_skill
+from result_cache import TTLCache
+
+
+def build(documents):
+    return BM25Index().build(
+        (job_id, job_terms(title, skills, normalize_skill)) for job_id, title, skills in documents
+    )
+
+
+def test_bm25_scoring():
+    index = build([
+        (1, 'Python Developer Intern', 'Python | Django'),
+        (2, 'Data Analyst', 'Python | Machine Learning | SQL | Excel | Tableau'),
+        (3, 'Designer', 'Figma'),
+        (4, 'Machine Operator', 'Welding'),
+    ])
+    hits = index.search(['python'], 10)
+    # Same term frequency: the shorter document scores higher
+    assert [job_id for job_id, _ in hits] == [1, 2]
+    assert hits[0][1] > hits[1][1] > 0
+
+    # Skills are whole-phrase terms: "machine learning" doesn't match the title word "machine"
+    assert [job_id for job_id, _ in index.search(['machine learning'], 10)] == [2]
+    assert index.search(['rust'], 10) == []
+    assert [job_id for job_id, _ in index.search(['python'], 10, candidate_ids=[2, 3])] == [2]
+    assert len(index.search(['python', 'figma', 'welding'], 2)) == 2
+    assert BM25Index().search(['python'], 10) == []
+
+
+def test_resume_terms():
+    resume = {'skills': ['React.js', 'SQL'], 'experience': [{'title': 'Web Developer'}]}
+    assert resume_terms(resume, normalize_skill) == ['react', 'sql', 'web', 'developer']
+
+
+def test_rrf_keeps_dense_only_and_lexical_only_hits():
+    fused = fuse_rankings([(1, 0.9), (2, 0.8)], [(2, 7.0), (3, 5.0)], method='rrf', dense_weight=0.5)
+    assert [job_id for job_id, _ in fused] == [2, 1, 3]
+    signals = dict(fused)
+    assert signals[2]['fused'] == pytest.approx(0.5 / 62 + 0.5 / 61)
+    assert (signals[1]['lexical'], signals[1]['lexical_rank']) == (None, None)
+    assert (signals[3]['dense'], signals[3]['dense_rank'], signals[3]['lexical_rank']) == (None, None, 2)
+
+
+def test_fusion_ties_keep_dense_order_first():
+    # Equal fused scores: dense hits in dense order, then lexical-only hits
+    fused = fuse_rankings([(5, 0.9), (6, 0.8)], [(7, 3.0), (8, 2.0)], method='rrf', dense_weight=0.5)
+    assert [job_id for job_id, _ in fused] == [5, 7, 6, 8]
+    assert dict(fused)[5]['fused'] == dict(fused)[7]['fused']
+
+
+def test_weighted_fusion():
+    fused = fuse_rankings([(1, 0.9), (2, 0.5)], [(3, 4.0), (2, 2.0)], method='weighted', dense_weight=0.5)
+    signals = dict(fused)
+    assert signals[3]['fused'] == pytest.approx(0.5 * 0.5 + 0.5 * 1.0)  # missing dense -> lowest dense score
+    assert signals[2]['fused'] == pytest.approx(0.5 * 0.5 + 0.5 * 0.5)
+    assert signals[1]['fused'] == pytest.approx(0.5 * 0.9)
+    with pytest.raises(ValueError):
+        fuse_rankings([], [], method='max')
+
+
+class FakeStore:
+    def __init__(self, hits):
+        self.hits = hits
+
+    def search(self, query_vector, k, candidate_ids=None, filters=None):
+        return self.hits[:k]
+
+    def refresh(self):
+        return False
+
+
+class FakeEmbeddings:
+    def embed_query(self, text):
+        return [0.0]
+
+
+@pytest.fixture
+def catalog(app, monkeypatch):
+    with app.app_context():
+        jobs = {}
+        for title, skills in [('Backend Intern', 'Go'), ('Web Intern', 'HTML'), ('Kotlin Intern', 'Kotlin')]:
+            job = Job(internship_title=title, company_name='Acme', required_skills=skills)
+            db.session.add(job)
+            db.session.commit()
+            jobs[title] = job.id
+        monkeypatch.setattr(core_logic, '_vectorstore', FakeStore([(jobs['Backend Intern'], 0.8), (jobs['Web Intern'], 0.7)]))
+        monkeypatch.setattr(core_logic, '_embeddings', FakeEmbeddings())
+        monkeypatch.setattr(core_logic, '_lexical_index', None)
+        monkeypatch.setattr(core_logic, '_recommendation_cache', TTLCache(16, 600))
+        yield jobs
+
+
+RESUME = {'skills': ['Kotlin'], 'experience': [], 'education': [], 'projects': []}
+
+
+def test_hybrid_adds_lexical_only_hits(catalog):
+    results = core_logic.get_job_recommendations(RESUME, top_n=3, mode='hybrid')
+    by_title = {job['internship_title']: job for job in results}
+    assert set(by_title) == {'Backend Intern', 'Web Intern', 'Kotlin Intern'}
+    kotlin = by_title['Kotlin Intern']
+    assert kotlin['similarity_score'] is None
+    assert kotlin['scores']['lexical_rank'] == 1 and kotlin['scores']['dense_rank'] is None
+    assert by_title['Backend Intern']['scores']['dense_rank'] == 1
+
+
+def test_dense_mode_skips_the_lexical_index(catalog, monkeypatch):
+    def no_lexical_index():
+        raise AssertionError('dense mode must not build the BM25 index')
+
+    monkeypatch.setattr(core_logic, 'get_lexical_index', no_lexical_index)
+    results = core_logic.get_job_recommendations(RESUME, top_n=3, mode='dense')
+    assert [job['internship_title'] for job in results] == ['Backend Intern', 'Web Intern']
+    assert all('scores' not in job for job in results)
+
+
+def test_lexical_index_is_rebuilt_after_a_catalog_change(catalog):
+    index = core_logic.get_lexical_index()
+    assert core_logic.get_lexical_index() is index
+    job = Job(internship_title='Swift Intern', company_name='Acme', required_skills='Swift')
+    db.session.add(job)
+    db.session.commit()
+    assert index.search(['swift'], 5) == []
+
+    core_logic._reset_job_indexes()
+    rebuilt = core_logic.get_lexical_index()
+    assert rebuilt is not index
+    assert [job_id for job_id, _ in rebuilt.search(['swift'], 5)] == [job.id]
@@ -0,0 +1,135 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import core_logic
+from retrieval import NumpyBackend
+
+DIM = 8
+
+
+def vector(job_id):
+    return np.random.default_rng(job_id).standard_normal(DIM).astype(np.float32)
+
+
+def upsert(backend, job_ids, version='v1'):
+    backend.upsert([str(i) for i in job_ids], [vector(i) for i in job_ids],
+                   [{'content_hash': f'{i}-{version}', 'location_key': 'pune'} for i in job_ids])
+
+
+def generations(directory):
+    return sorted(entry for entry in os.listdir(directory) if entry.startswith('gen-'))
+
+
+def manifest(directory):
+    with open(os.path.join(directory, 'manifest.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def seeded(tmp_path):
+    backend = NumpyBackend(str(tmp_path))
+    upsert(backend, range(1, 7))
+    backend.flush()
+    return str(tmp_path)
+
+
+def test_flush_merges_changes_written_by_another_instance(seeded):
+    first, second = NumpyBackend(seeded), NumpyBackend(seeded)
+
+    upsert(first, [10, 1], version='first')
+    first.delete(['2'])
+    first.flush()
+
+    # second still holds the seed generation; its flush rebases on first's
+    upsert(second, [20, 3], version='second')
+    second.delete(['4'])
+    second.flush()
+
+    expected = {'1': '1-first', '3': '3-second', '5': '5-v1', '6': '6-v1', '10': '10-first', '20': '20-second'}
+    assert second.indexed_hashes() == expected
+    assert first.refresh() is True
+    assert first.indexed_hashes() == expected
+    assert NumpyBackend(seeded).indexed_hashes() == expected
+    assert manifest(seeded)['count'] == len(expected)
+
+    hits = first.search(vector(20), 1, filters={'locations': ['pune']})
+    assert hits[0][0] == 20 and hits[0][1] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_refresh_picks_up_a_new_generation_once(seeded):
+    writer, reader = NumpyBackend(seeded), NumpyBackend(seeded)
+    assert reader.refresh() is False
+
+    upsert(writer, [7])
+    writer.flush()
+    assert reader.refresh() is True
+    assert reader.refresh() is False
+    assert reader.count() == 7
+    assert reader._generation == writer._generation
+
+
+def test_refresh_waits_for_local_changes(seeded):
+    writer, reader = NumpyBackend(seeded), NumpyBackend(seeded)
+    upsert(writer, [7])
+    writer.flush()
+
+    reader.delete(['1'])
+    assert reader.refresh() is False
+    reader.flush()
+    assert set(reader.indexed_hashes()) == {'2', '3', '4', '5', '6', '7'}
+    assert writer.refresh() is True
+    assert writer.indexed_hashes() == reader.indexed_hashes()
+
+
+def test_old_generations_are_removed_after_the_swap(seeded, monkeypatch):
+    backend = NumpyBackend(seeded)
+    reader = NumpyBackend(seeded)
+    seen = []
+    real_remove = NumpyBackend._remove_old_generations
+
+    def remove_old_generations(self, current):
+        # The manifest already names the new generation, and nothing was deleted yet
+        seen.append((manifest(seeded)['generation'], generations(seeded)))
+        real_remove(self, current)
+
+    monkeypatch.setattr(NumpyBackend, '_remove_old_generations', remove_old_generations)
+    upsert(backend, [7])
+    backend.flush()
+    upsert(backend, [8])
+    backend.flush()
+
+    assert seen == [(2, ['gen-000001', 'gen-000002']), (3, ['gen-000001', 'gen-000002', 'gen-000003'])]
+    assert generations(seeded) == ['gen-000002', 'gen-000003']
+    # A reader still mapping the deleted generation keeps working until it refreshes
+    assert reader._generation == 1
+    assert reader.search(vector(3), 1)[0][0] == 3
+    assert reader.refresh() is True
+    assert reader.count() == 8
+
+
+def test_writers_never_reuse_a_generation(seeded):
+    first, second = NumpyBackend(seeded), NumpyBackend(seeded)
+    upsert(first, [7])
+    first.flush()
+    upsert(second, [8])
+    second.flush()
+    assert manifest(seeded)['generation'] == 3
+    assert generations(seeded) == ['gen-000002', 'gen-000003']
+
+
+def test_after_fork_keeps_only_fork_safe_backends(seeded, monkeypatch):
+    backend = NumpyBackend(seeded)
+    monkeypatch.setattr(core_logic, '_embedding_cache', None)
+    monkeypatch.setattr(core_logic, '_vectorstore', backend)
+    core_logic.after_fork()
+    assert core_logic._vectorstore is backend
+
+    class NotForkSafe:
+        fork_safe = False
+
+    monkeypatch.setattr(core_logic, '_vectorstore', NotForkSafe())
+    core_logic.after_fork()
+    assert core_logic._vectorstore is None
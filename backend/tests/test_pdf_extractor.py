@@ -0,0 +1,105 @@
+import pytest
+
+import pdf_extractor
+from pdf_extractor import extract_pdf_text, resolve_engine
+
+
+def make_pdf(page_texts):
+    """A minimal PDF with one line of Helvetica text per page"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return out
+
+
+@pytest.fixture
+def fake_pages(monkeypatch):
+    """A 20-page document of 100 characters per page; records the page ranges read"""
+    clock = {"now": 0.0, "per_page": 0.0}
+    reads = []
+
+    def extract_page_range(source, engine, start, stop):
+        reads.append((start, stop))
+        clock["now"] += clock["per_page"] * (stop - start)
+        return [(index, str(index % 10) * 100, 1.0) for index in range(start, stop)]
+
+    monkeypatch.setattr(pdf_extractor, "count_pages", lambda source: 20)
+    monkeypatch.setattr(pdf_extractor, "extract_page_range", extract_page_range)
+    monkeypatch.setattr(pdf_extractor, "resolve_engine", lambda engine: "pdfium")
+    monkeypatch.setattr(pdf_extractor.time, "perf_counter", lambda: clock["now"])
+    return reads, clock
+
+
+def test_reads_everything_under_the_caps(fake_pages):
+    reads, _ = fake_pages
+    text, report = extract_pdf_text(b"", max_pages=30, target_chars=10 ** 6, workers=0, pages_per_task=4)
+    assert (report["pages_read"], report["stopped"]) == (20, "complete")
+    assert len(reads) == 5
+    assert text.splitlines()[0] == "0" * 100
+
+
+def test_page_limit(fake_pages):
+    reads, _ = fake_pages
+    text, report = extract_pdf_text(b"", max_pages=6, target_chars=10 ** 6, workers=0, pages_per_task=4)
+    assert reads == [(0, 4), (4, 6)]
+    assert (report["pages_total"], report["pages_read"], report["stopped"]) == (20, 6, "page_limit")
+    assert len(text.splitlines()) == 6
+
+
+def test_stops_early_once_target_chars_are_read(fake_pages):
+    reads, _ = fake_pages
+    text, report = extract_pdf_text(b"", max_pages=30, target_chars=500, workers=0, pages_per_task=4)
+    # 400 characters after the first range, 800 after the second
+    assert reads == [(0, 4), (4, 8)]
+    assert (report["pages_read"], report["stopped"]) == (8, "target_chars")
+    assert len(text) >= 500
+
+
+def test_stops_at_the_time_limit(fake_pages):
+    reads, clock = fake_pages
+    clock["per_page"] = 1.0
+    _, report = extract_pdf_text(b"", max_pages=30, max_seconds=6, target_chars=10 ** 6, workers=0, pages_per_task=4)
+    assert reads == [(0, 4), (4, 8)]
+    assert (report["pages_read"], report["stopped"]) == (8, "time_limit")
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        resolve_engine("ocr")
+
+
+@pytest.mark.parametrize("engine", ["pdfium", "pdfplumber"])
+def test_real_pdf(engine):
+    if resolve_engine(engine) != engine:
+        pytest.skip(f"{engine} not installed")
+    pdf = make_pdf([f"Page {n} Python SQL" for n in range(6)])
+    text, report = extract_pdf_text(pdf, engine=engine, max_pages=5, target_chars=10 ** 6, workers=0, pages_per_task=2)
+    assert report["engine"] == engine
+    assert (report["pages_total"], report["pages_read"], report["stopped"]) == (6, 5, "page_limit")
+    assert [line.strip() for line in text.splitlines()] == [f"Page {n} Python SQL" for n in range(5)]
+
+
+def test_page_ranges_on_the_process_pool():
+    if resolve_engine("auto") is None:
+        pytest.skip("no PDF engine installed")
+    pdf = make_pdf([f"Page {n}" for n in range(9)])
+    text, report = extract_pdf_text(pdf, max_pages=30, target_chars=10 ** 6, workers=2, pages_per_task=2)
+    assert (report["pages_read"], report["stopped"]) == (9, "complete")
+    assert [line.strip() for line in text.splitlines()] == [f"Page {n}" for n in range(9)]
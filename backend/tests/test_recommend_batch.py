@@ -0,0 +1,58 @@
+import io
+import json
+import time
+
+import app as app_module
+
+
+def fake_parse(data, filename=None):
+    if filename == 'slow.txt':
+        time.sleep(0.5)
+    if filename == 'bad.txt':
+        return {'error': 'Could not parse'}
+    return {'name': filename, 'skills': []}
+
+
+def upload(name):
+    return (io.BytesIO(b'resume'), name)
+
+
+def test_results_stream_per_resume_and_top_n_is_clamped(client, monkeypatch):
+    calls = []
+
+    def fake_batch(summaries, top_n=10, **kwargs):
+        calls.append(([summary['name'] for summary in summaries], top_n, time.monotonic()))
+        return [[{'id': i} for i in range(top_n)] for _ in summaries]
+
+    monkeypatch.setattr(app_module, 'parse_resume', fake_parse)
+    monkeypatch.setattr(app_module, 'get_job_recommendations_batch', fake_batch)
+
+    started = time.monotonic()
+    response = client.post('/api/recommend/batch?top_n=100000', data={
+        'resumes': [upload('slow.txt'), upload('fast.txt'), upload('bad.txt'), upload('x.exe')],
+    })
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    by_file = {line['filename']: line for line in lines}
+    assert by_file['x.exe'] == {'index': 3, 'filename': 'x.exe', 'success': False, 'error': 'Invalid file type'}
+    assert by_file['bad.txt']['success'] is False
+    assert len(by_file['fast.txt']['recommendations']) == 50
+    assert len(by_file['slow.txt']['recommendations']) == 50
+    # The fast resume is ranked on its own, before the slow one has finished parsing
+    assert [names for names, _, _ in calls] == [['fast.txt'], ['slow.txt']]
+    assert calls[0][2] - started < 0.4
+    assert {top_n for _, top_n, _ in calls} == {50}
+    assert [line['filename'] for line in lines].index('fast.txt') < [line['filename'] for line in lines].index('slow.txt')
+
+
+def test_profiles_are_ranked_before_uploads_parse(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(app_module, 'get_job_recommendations_batch',
+                        lambda summaries, top_n=10, **kwargs: calls.append(top_n) or [[] for _ in summaries])
+
+    response = client.post('/api/recommend/batch', json={'profiles': [{'name': 'a'}, {'name': 'b'}], 'top_n': 0})
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert [line['index'] for line in lines] == [0, 1]
+    assert all(line['success'] for line in lines)
+    assert calls == [1]
@@ -0,0 +1,153 @@
+import pytest
+
+import core_logic
+import resume_parser
+import result_cache
+from models import db, Job
+from result_cache import TTLCache
+
+RESUME = {'skills': ['python', 'sql'], 'experience': [], 'education': [], 'projects': [], 'ai_summary': 'Data intern'}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expiry_and_lru(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(result_cache.time, 'monotonic', clock)
+    cache = TTLCache(max_entries=2, ttl_seconds=10)
+
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)  # evicts b, the least recently used
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
+
+    clock.now += 11
+    assert cache.get('a') is None
+    assert cache.stats() == {'entries': 1, 'hits': 3, 'misses': 2, 'evictions': 1, 'hit_rate': 0.6}
+
+
+def test_ttl_cache_copies_values():
+    cache = TTLCache(max_entries=4, ttl_seconds=60)
+    value = {'jobs': [1, 2]}
+    cache.put('k', value)
+    value['jobs'].append(3)
+    cache.get('k')['jobs'].append(4)
+    assert cache.get('k') == {'jobs': [1, 2]}
+
+    disabled = TTLCache(max_entries=0, ttl_seconds=60)
+    disabled.put('k', 1)
+    assert disabled.get('k') is None
+
+
+class FakeStore:
+    def __init__(self, hits):
+        self.hits = hits
+        self.searches = 0
+        self.changed_elsewhere = False
+        self.during_search = None
+
+    def search(self, query_vector, k, candidate_ids=None, filters=None):
+        self.searches += 1
+        if self.during_search:
+            self.during_search()
+        return self.hits[:k]
+
+    def refresh(self):
+        changed, self.changed_elsewhere = self.changed_elsewhere, False
+        return changed
+
+    def count(self):
+        return len(self.hits)
+
+
+class FakeEmbeddings:
+    def embed_query(self, text):
+        return [0.0]
+
+
+@pytest.fixture
+def store(app, monkeypatch):
+    with app.app_context():
+        ids = []
+        for n in range(3):
+            job = Job(internship_title=f'Intern {n}', company_name='Acme', required_skills='Python')
+            db.session.add(job)
+            db.session.commit()
+            ids.append(job.id)
+        store = FakeStore([(job_id, 0.9 - 0.1 * i) for i, job_id in enumerate(ids)])
+        monkeypatch.setattr(core_logic, '_vectorstore', store)
+        monkeypatch.setattr(core_logic, '_embeddings', FakeEmbeddings())
+        monkeypatch.setattr(core_logic, '_last_refresh_check', 0.0)
+        monkeypatch.setattr(core_logic.Config, 'INDEX_REFRESH_SECONDS', 0)
+        monkeypatch.setattr(core_logic, '_recommendation_cache', TTLCache(16, 600))
+        yield store
+
+
+def test_recommendations_are_cached_per_request(store):
+    first = core_logic.get_job_recommendations(RESUME, top_n=2, mode='dense')
+    assert [job['id'] for job in first] == [job_id for job_id, _ in store.hits[:2]]
+    assert core_logic.get_job_recommendations(RESUME, top_n=2, mode='dense') == first
+    assert store.searches == 1
+
+    # Different options are a different entry
+    core_logic.get_job_recommendations(RESUME, top_n=3, mode='dense')
+    core_logic.get_job_recommendations(RESUME, top_n=2, mode='dense', filters={'locations': ['Pune']})
+    assert store.searches == 3
+
+
+def test_catalog_changes_invalidate_recommendations(store):
+    core_logic.get_job_recommendations(RESUME, top_n=2, mode='dense')
+
+    # An import in this process
+    core_logic._reset_job_indexes()
+    core_logic.get_job_recommendations(RESUME, top_n=2, mode='dense')
+    assert store.searches == 2
+
+    # A newer index generation written by another process
+    store.changed_elsewhere = True
+    core_logic.get_job_recommendations(RESUME, top_n=2, mode='dense')
+    assert store.searches == 3
+    core_logic.get_job_recommendations(RESUME, top_n=2, mode='dense')
+    assert store.searches == 3
+
+
+def test_search_running_during_invalidation_is_not_cached(store):
+    store.during_search = core_logic._invalidate_recommendations
+    core_logic.get_job_recommendations(RESUME, top_n=2, mode='dense')
+    store.during_search = None
+    core_logic.get_job_recommendations(RESUME, top_n=2, mode='dense')
+    assert store.searches == 2
+
+
+def test_parse_cache_skips_fallback_summaries(monkeypatch):
+    monkeypatch.setattr(resume_parser, '_PARSE_CACHE', TTLCache(16, 600))
+    sources = ['fallback', 'model']
+    calls = []
+
+    def summarize(parsed):
+        calls.append(1)
+        return {'text': 'summary', 'source': sources[len(calls) - 1]}
+
+    monkeypatch.setattr(resume_parser, '_generate_ai_summary', summarize)
+    resume = b'Jane Doe\njane@example.com\nSkills\nPython, SQL\n'
+    timings = {}
+    resume_parser.parse_resume(resume, filename='cv.txt', timings=timings)
+    assert timings['parse_cache_hit'] is False
+    resume_parser.parse_resume(resume, filename='cv.txt', timings=timings)
+    assert timings['parse_cache_hit'] is False
+    parsed = resume_parser.parse_resume(resume, filename='cv.txt', timings=timings)
+    assert timings['parse_cache_hit'] is True
+    assert parsed['ai_summary_source'] == 'model'
+    assert len(calls) == 2
+
+    # Same bytes under another extension go through another extractor
+    resume_parser.parse_resume(resume, filename='cv.md', summarize=False)
+    resume_parser.parse_resume(resume, filename='cv.txt', summarize=False)
+    assert len(calls) == 2
@@ -0,0 +1,72 @@
+import chromadb
+import numpy as np
+import pytest
+from chromadb.config import Settings
+
+from retrieval import ChromaBackend, normalize_rows
+
+VECTORS = normalize_rows(np.random.default_rng(0).standard_normal((20, 8)))
+
+
+def _expected(query, k):
+    scores = VECTORS @ normalize_rows(query)
+    order = np.argsort(-scores)[:k]
+    return [(int(i), float(scores[i])) for i in order]
+
+
+def _assert_matches(result, expected):
+    assert [job_id for job_id, _ in result] == [job_id for job_id, _ in expected]
+    assert [score for _, score in result] == pytest.approx([score for _, score in expected], abs=1e-4)
+
+
+def test_existing_l2_collection_keeps_its_space(tmp_path):
+    # A collection created by the old LangChain path: default metadata, l2 space
+    client = chromadb.PersistentClient(path=str(tmp_path), settings=Settings(anonymized_telemetry=False))
+    collection = client.create_collection(name="jobs")
+    collection.add(
+        ids=[str(i) for i in range(len(VECTORS))],
+        embeddings=VECTORS.tolist(),
+        metadatas=[{"id": i, "content_hash": f"h{i}"} for i in range(len(VECTORS))],
+    )
+    del collection, client
+
+    backend = ChromaBackend(str(tmp_path), "jobs")
+    assert backend._space == "l2"
+    assert (backend._collection.metadata or {}).get("hnsw:space", "l2") == "l2"
+    query = VECTORS[3] + 0.1 * VECTORS[5]
+    _assert_matches(backend.search(query, 5), _expected(query, 5))
+
+
+def test_new_collection_uses_cosine(tmp_path):
+    backend = ChromaBackend(str(tmp_path), "jobs")
+    assert backend._space == "cosine"
+    backend.upsert([str(i) for i in range(len(VECTORS))], VECTORS,
+                   [{"id": i, "content_hash": f"h{i}"} for i in range(len(VECTORS))])
+    query = VECTORS[7]
+    _assert_matches(backend.search(query, 3), _expected(query, 3))
+    assert backend.indexed_hashes()["7"] == "h7"
+
+
+def test_long_candidate_lists_are_applied_to_the_results(tmp_path, monkeypatch):
+    backend = ChromaBackend(str(tmp_path), "jobs")
+    backend.upsert([str(i) for i in range(len(VECTORS))], VECTORS, [
+        {"id": i, "content_hash": f"h{i}", "location_key": "pune" if i % 2 else "delhi"}
+        for i in range(len(VECTORS))
+    ])
+    monkeypatch.setattr(ChromaBackend, "MAX_WHERE_IDS", 3)
+    wheres = []
+    query_chroma = backend._query
+    monkeypatch.setattr(backend, "_query", lambda q, n, where: wheres.append(where) or query_chroma(q, n, where))
+
+    candidates = [1, 2, 3, 5, 8, 13, 17, 19]
+    query = VECTORS[4]
+    result = backend.search(query, 3, candidate_ids=candidates, filters={"locations": ["pune"]})
+
+    allowed = [i for i in candidates if i % 2]
+    scores = VECTORS[allowed] @ normalize_rows(query)
+    expected = [(allowed[i], float(scores[i])) for i in np.argsort(-scores)[:3]]
+    _assert_matches(result, expected)
+    assert wheres == [{"location_key": {"$in": ["pune"]}}] * len(wheres)
+    # Fewer matching candidates than k: all of them are returned
+    result = backend.search(query, 10, candidate_ids=[1, 2, 3, 4, 5], filters={"locations": ["pune"]})
+    assert sorted(job_id for job_id, _ in result) == [1, 3, 5]
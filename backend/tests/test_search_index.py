@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import text
+
+import search_index
+from models import db, Job
+from search_index import ensure_search_index, search_jobs
+
+
+def add_job(title, company='Acme', skills='Python', **fields):
+    job = Job(internship_title=title, company_name=company, required_skills=skills, **fields)
+    db.session.add(job)
+    db.session.commit()
+    return job.id
+
+
+@pytest.fixture
+def ctx(app):
+    with app.app_context():
+        assert search_index._mode == 'sqlite'
+        yield
+
+
+def test_index_follows_inserts_updates_and_deletes(ctx):
+    job_id = add_job('Backend Intern', skills='Django | PostgreSQL')
+    assert search_jobs('django', 10) == [job_id]
+    assert search_jobs('postg', 10) == [job_id]  # prefix match
+
+    job = db.session.get(Job, job_id)
+    job.required_skills = 'Flask'
+    db.session.commit()
+    assert search_jobs('django', 10) == []
+    assert search_jobs('flask', 10) == [job_id]
+
+    db.session.delete(job)
+    db.session.commit()
+    assert search_jobs('flask', 10) == []
+
+
+def test_soft_deleted_jobs_are_not_found(ctx):
+    job_id = add_job('Data Intern')
+    job = db.session.get(Job, job_id)
+    job.is_active = False
+    db.session.commit()
+    assert search_jobs('data', 10) == []
+
+
+def test_ranking_terms_and_paging(ctx):
+    in_skills = add_job('Web Intern', skills='React | Python')
+    in_title = add_job('Python Intern', skills='SQL')
+    add_job('Python Tester', company='Other', skills='Java')
+
+    # Every term must match; a title hit outranks a skills hit
+    assert search_jobs('python intern', 10) == [in_title, in_skills]
+    # FTS syntax in the query is treated as plain words, not operators
+    assert search_jobs('python" NEAR(', 10) == search_jobs('python near', 10)
+    assert search_jobs('python', 1, offset=1) == [search_jobs('python', 10)[1]]
+    assert search_jobs('', 10) == []
+
+
+def test_existing_rows_are_indexed_when_the_table_is_created(ctx):
+    job_id = add_job('Design Intern', skills='Figma')
+    with db.engine.begin() as conn:
+        conn.execute(text('DROP TABLE jobs_fts'))
+    ensure_search_index()
+    assert search_jobs('figma', 10) == [job_id]
+
+
+def test_search_route_pages(client, app):
+    with app.app_context():
+        ids = [add_job(f'ML Intern {n}', skills='PyTorch') for n in range(3)]
+    page = client.get('/api/jobs/search?q=pytorch&per_page=2').get_json()
+    assert page['has_more'] is True
+    assert len(page['jobs']) == 2
+    rest = client.get('/api/jobs/search?q=pytorch&per_page=2&page=2').get_json()
+    assert rest['has_more'] is False
+    assert sorted(job['id'] for job in page['jobs'] + rest['jobs']) == ids
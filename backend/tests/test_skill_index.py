@@ -0,0 +1,94 @@
+import pytest
+
+import core_logic
+from csv_importer import ensure_job_skills
+from models import db, Job
+from resume_parser import normalize_skill
+from skill_index import SkillIndex, parse_required_skills
+
+ROWS = [
+    (10, 'python'), (10, 'sql'),
+    (11, 'python'), (11, 'sql'), (11, 'docker'), (11, 'aws'),
+    (12, 'python'),
+    (13, 'java'),
+    # more than 8 jobs, so the bitsets span several bytes
+    *((job_id, 'excel') for job_id in range(14, 24)),
+]
+
+
+@pytest.fixture
+def index():
+    return SkillIndex().build(ROWS)
+
+
+def test_parse_required_skills():
+    assert parse_required_skills('React.js | N/A | Python || react', normalize_skill) == ['react', 'python']
+    assert parse_required_skills(None, normalize_skill) == []
+
+
+def test_match_any_and_all(index):
+    assert index.match(['python', 'java'], 'any') == [10, 11, 12, 13]
+    assert index.match(['python', 'sql'], 'all') == [10, 11]
+    assert index.match(['excel'], 'any') == list(range(14, 24))
+    with pytest.raises(ValueError):
+        index.match(['python'], 'most')
+
+
+def test_unknown_skills(index):
+    assert index.match(['python', 'cobol'], 'any') == [10, 11, 12]
+    assert index.match(['python', 'cobol'], 'all') == []
+    assert index.match(['cobol'], 'any') == []
+    assert index.overlap(['cobol'], 'any') == []
+    assert SkillIndex().build([]).match(['python']) == []
+
+
+def test_overlap_ranking(index):
+    # Most shared skills, then the share of the job's skills covered, then id
+    assert index.overlap(['python', 'sql', 'java'], 'any') == [
+        (10, 2, 1.0), (11, 2, 0.5), (12, 1, 1.0), (13, 1, 1.0),
+    ]
+    assert index.overlap(['sql', 'python'], 'all') == [(10, 2, 1.0), (11, 2, 0.5)]
+
+
+@pytest.fixture
+def catalog(app, monkeypatch):
+    monkeypatch.setattr(core_logic, '_skill_index', None)
+    with app.app_context():
+        jobs = {}
+        for title, skills in [('Full Stack', 'React.js | Node.js | MongoDB'), ('Frontend', 'React'),
+                              ('Backend', 'Node.js | PostgreSQL'), ('Old Frontend', 'React | CSS')]:
+            job = Job(internship_title=title, company_name='Acme', required_skills=skills)
+            db.session.add(job)
+            db.session.commit()
+            jobs[title] = job.id
+        ensure_job_skills()
+        job = db.session.get(Job, jobs['Old Frontend'])
+        job.is_active = False
+        db.session.commit()
+    return jobs
+
+
+def titles(response):
+    return [job['internship_title'] for job in response.get_json()['jobs']]
+
+
+def test_by_skills_route(client, catalog):
+    response = client.get('/api/jobs/by-skills?skills=React,Node JS')
+    assert titles(response) == ['Full Stack', 'Frontend', 'Backend']
+    first = response.get_json()['jobs'][0]
+    assert (first['matched_skills'], first['skill_overlap'], first['skill_coverage']) == (2, 1.0, 0.6667)
+
+    assert titles(client.get('/api/jobs/by-skills?skills=react,nodejs&match=all')) == ['Full Stack']
+    assert titles(client.get('/api/jobs/by-skills?skills=cobol')) == []
+
+    page = client.get('/api/jobs/by-skills?skills=react,nodejs&per_page=2').get_json()
+    assert (page['total'], page['has_more'], len(page['jobs'])) == (3, True, 2)
+
+    assert client.get('/api/jobs/by-skills').status_code == 400
+    assert client.get('/api/jobs/by-skills?skills=react&match=most').status_code == 400
+
+
+def test_soft_deleted_jobs_are_excluded(client, catalog):
+    # 'Old Frontend' is the only job requiring CSS, and it is inactive
+    assert titles(client.get('/api/jobs/by-skills?skills=css')) == []
+    assert 'Old Frontend' not in titles(client.get('/api/jobs/by-skills?skills=react'))
@@ -0,0 +1,40 @@
+import pytest
+
+from resume_parser import SKILL_ALIASES, _extract_skills, normalize_skill
+from skill_matcher import SkillMatcher
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('Node JS, Express', ['nodejs']),
+    ('Node.js and React.js', ['nodejs', 'react']),
+    ('JS, HTML, CSS', ['css', 'html']),
+    ('Worked on a JS widget for the web team', []),
+    ('MongoDB, PostgreSQL', ['mongodb', 'postgresql']),
+    ('machine learning with scikit learn and k8s', ['kubernetes', 'machine learning', 'scikit-learn']),
+])
+def test_extract_skills(text, expected):
+    assert _extract_skills(text) == expected
+
+
+def test_canonical_names_only():
+    # The legacy parser also emitted capitalized duplicates such as 'Mongodb'
+    # for MongoDB; the matcher reports each skill once, by its canonical name
+    skills = _extract_skills('MongoDB PostgreSQL MySQL Firebase TensorFlow PyTorch')
+    assert skills == ['firebase', 'mongodb', 'mysql', 'postgresql', 'pytorch', 'tensorflow']
+
+
+def test_fuzzy_matches_misspellings():
+    assert 'kubernetes' in _extract_skills('kubernets')
+    assert 'tensorflow' in _extract_skills('tensorflw')
+
+
+def test_normalize_skill():
+    assert normalize_skill('React.js') == 'react'
+    assert normalize_skill('Node JS') == 'nodejs'
+    assert normalize_skill('JS') == 'js'
+    assert normalize_skill('Rust') == 'rust'
+
+
+def test_custom_master_list():
+    matcher = SkillMatcher(['rust', 'go'], SKILL_ALIASES)
+    assert matcher.extract('Rust and Go services') == ['go', 'rust']
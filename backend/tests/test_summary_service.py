@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from summary_service import ModelUnavailableError, StubModel, SummaryService
+
+PARSED = {
+    "name": "Jo",
+    "skills": ["Python", "SQL"],
+    "experience": [{"title": "Intern", "company": "Acme", "duration": "3 months"}],
+    "projects": [{"title": "Chat bot. Built with Flask"}],
+}
+
+
+def make_service(model, **kwargs):
+    return SummaryService(model_factory=lambda: model, **kwargs)
+
+
+def test_stub_rejects_keywords_the_real_client_does_not_accept():
+    with pytest.raises(TypeError):
+        StubModel().generate_content("prompt", request_options={"timeout": 1})
+
+
+def test_model_answer_is_cached():
+    model = StubModel(text=" I build APIs. ")
+    service = make_service(model)
+
+    assert service.summarize(PARSED) == {"text": "I build APIs.", "source": "model"}
+    assert service.summarize(PARSED) == {"text": "I build APIs.", "source": "cache"}
+    assert model.calls == 1
+
+
+def test_concurrent_requests_share_one_model_call():
+    model = StubModel(delay=0.3)
+    service = make_service(model)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.summarize(PARSED))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert model.calls == 1
+    assert [result["source"] for result in results] == ["model"] * 4
+    assert service.stats()["coalesced"] == 3
+
+
+def test_budget_exceeded_falls_back_and_late_answer_fills_cache():
+    model = StubModel(text="Late answer.", delay=0.5)
+    service = make_service(model, budget_seconds=0.1)
+
+    started = time.monotonic()
+    result = service.summarize(PARSED)
+    assert result["source"] == "fallback"
+    assert "Python" in result["text"]
+    assert time.monotonic() - started < 0.4
+
+    time.sleep(0.6)
+    assert service.summarize(PARSED) == {"text": "Late answer.", "source": "cache"}
+
+
+def test_model_error_is_retried_then_falls_back():
+    model = StubModel(error=RuntimeError("quota"))
+    service = make_service(model, retries=1)
+
+    result = service.summarize(PARSED)
+    assert result["source"] == "fallback"
+    assert model.calls == 2
+    # Failures are not cached
+    assert service.summarize(PARSED)["source"] == "fallback"
+    assert model.calls == 4
+
+
+def test_missing_client_uses_extractive_summary():
+    attempts = []
+
+    def unavailable():
+        attempts.append(1)
+        raise ModelUnavailableError("google-generativeai not installed")
+
+    service = SummaryService(model_factory=unavailable)
+    result = service.summarize(PARSED)
+    assert result["source"] == "extractive"
+    assert result["text"].startswith("I work with Python, SQL.")
+
+    # The missing client is remembered, not imported again per request
+    assert service.summarize({**PARSED, "name": "Someone Else"})["source"] == "extractive"
+    assert len(attempts) == 1
+    assert service.stats()["extractive"] == 2
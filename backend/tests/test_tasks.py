@@ -0,0 +1,140 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+import app as app_module
+from task_queue import QueueFullError, TaskQueue
+
+
+def _old_file(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'resume')
+    past = time.time() - 48 * 3600
+    os.utime(path, (past, past))
+
+
+def test_event_stream_ends_with_gone_when_task_is_purged(client):
+    queue = app_module.task_queue
+    task_id = queue.submit({'filepath': 'x.txt', 'top_n': 10})
+    real_wait = queue.wait
+
+    def wait_then_purge(wanted, timeout):
+        task = real_wait(wanted, 0)
+        # The retention clean-up removes the task after the first event
+        queue._conn().execute("DELETE FROM tasks WHERE id = ?", (wanted,))
+        return task
+
+    queue.wait = wait_then_purge
+    try:
+        events = client.get(f'/api/tasks/{task_id}/events').get_data(as_text=True).split('\n\n')
+    finally:
+        queue.wait = real_wait
+
+    assert events[0].startswith('data: ') and '"status": "queued"' in events[0]
+    assert events[1] == f'event: gone\ndata: {{"task_id": "{task_id}", "status": "gone"}}'
+    assert events[2:] == ['']
+
+
+def test_event_stream_of_unknown_task_is_404(client):
+    assert client.get('/api/tasks/missing/events').status_code == 404
+
+
+def test_upload_purge_keeps_uploads_of_pending_tasks(app):
+    store, queue = app_module.upload_store, app_module.task_queue
+    queued = store.new_path('queued.txt')
+    finished = store.new_path('finished.txt')
+    stray = store.new_path('stray.txt')
+    for path in (queued, finished, stray):
+        _old_file(path)
+    queue.submit({'filepath': queued, 'top_n': 10})
+    done_id = queue.submit({'filepath': finished, 'top_n': 10})
+    queue._conn().execute("UPDATE tasks SET status = 'done', finished_at = ? WHERE id = ?", (time.time(), done_id))
+
+    assert store.purge() == 2
+    assert os.path.exists(queued)
+    assert not os.path.exists(finished)
+    assert not os.path.exists(stray)
+
+
+def test_task_purge_only_removes_finished_tasks(app):
+    queue = app_module.task_queue
+    queued_id = queue.submit({'filepath': 'a.txt', 'top_n': 10})
+    done_id = queue.submit({'filepath': 'b.txt', 'top_n': 10})
+    queue._conn().execute("UPDATE tasks SET status = 'done', finished_at = 0 WHERE id = ?", (done_id,))
+    queue._conn().execute("UPDATE tasks SET created_at = 0 WHERE id = ?", (queued_id,))
+
+    assert queue.purge(3600) == 1
+    assert queue.get(queued_id)['status'] == 'queued'
+    assert queue.get(done_id) is None
+
+
+def test_submit_never_exceeds_capacity(tmp_path):
+    queue = TaskQueue(str(tmp_path / 'tasks.sqlite3'), lambda payload, timings: {}, workers=0, max_pending=3)
+    accepted, rejected = [], []
+
+    def submit(n):
+        # One connection per thread, like the request threads
+        try:
+            accepted.append(queue.submit({'n': n}))
+        except QueueFullError:
+            rejected.append(n)
+
+    threads = [threading.Thread(target=submit, args=(n,)) for n in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert (len(accepted), len(rejected)) == (3, 9)
+    assert queue.pending_count() == 3
+
+
+def test_restart_requeues_only_tasks_of_stopped_processes(tmp_path):
+    path = str(tmp_path / 'tasks.sqlite3')
+    queue = TaskQueue(path, lambda payload, timings: {}, workers=0)
+    finished = subprocess.Popen([sys.executable, '-c', 'pass'])
+    finished.wait()
+    alive = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+    try:
+        owners = {'dead': finished.pid, 'alive': alive.pid, 'legacy': None}
+        ids = {}
+        for name, pid in owners.items():
+            ids[name] = queue.submit({'name': name})
+            queue._conn().execute("UPDATE tasks SET status = 'running', started_at = 1, owner_pid = ? WHERE id = ?",
+                                  (pid, ids[name]))
+
+        # Another worker process starting up on the same file
+        TaskQueue(path, lambda payload, timings: {}, workers=0).start()
+        assert queue.get(ids['dead'])['status'] == 'queued'
+        assert queue.get(ids['legacy'])['status'] == 'queued'
+        assert queue.get(ids['alive'])['status'] == 'running'
+    finally:
+        alive.kill()
+        alive.wait()
+
+
+def test_claimed_tasks_record_their_process(tmp_path):
+    queue = TaskQueue(str(tmp_path / 'tasks.sqlite3'), lambda payload, timings: {}, workers=0)
+    task_id = queue.submit({})
+    assert queue._claim()['id'] == task_id
+    row = queue._conn().execute("SELECT status, owner_pid FROM tasks WHERE id = ?", (task_id,)).fetchone()
+    assert (row['status'], row['owner_pid']) == ('running', os.getpid())
+
+
+def test_opens_a_task_file_without_owner_column(tmp_path):
+    path = str(tmp_path / 'tasks.sqlite3')
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE tasks (id TEXT PRIMARY KEY, status TEXT NOT NULL, payload TEXT NOT NULL, result TEXT,
+                            error TEXT, timings TEXT, created_at REAL NOT NULL, started_at REAL, finished_at REAL)
+    """)
+    conn.execute("INSERT INTO tasks (id, status, payload, created_at) VALUES ('old', 'running', '{}', 1)")
+    conn.commit()
+    conn.close()
+
+    queue = TaskQueue(path, lambda payload, timings: {}, workers=0)
+    assert queue.requeue_interrupted() == 1
+    assert queue.get('old')['status'] == 'queued'
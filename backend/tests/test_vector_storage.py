@@ -0,0 +1,137 @@
+import os
+
+import numpy as np
+import pytest
+
+from retrieval import NumpyBackend, normalize_rows
+from vector_quantization import load_quantizer, save_quantizer, train_quantizer
+
+LOCATIONS = ['delhi', 'pune', 'remote']
+
+
+def embeddings(n, dim=64, seed=0):
+    """Clustered, normalized vectors, so neighbours are well defined"""
+    structure = np.random.default_rng(0)
+    centers = structure.standard_normal((32, dim)).astype(np.float32)
+    rng = np.random.default_rng(seed + 1)
+    points = centers[rng.integers(32, size=n)] + 0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+    return normalize_rows(points)
+
+
+def metadata(i):
+    return {'content_hash': f'h{i}', 'location_key': LOCATIONS[i % 3], 'stipend_min': i % 10 * 1000}
+
+
+def exact_top(vectors, query, k, allowed=None):
+    ids = np.arange(len(vectors)) if allowed is None else np.array(sorted(allowed))
+    scores = vectors[ids] @ (query / np.linalg.norm(query))
+    return ids[np.argsort(-scores)[:k]].tolist()
+
+
+@pytest.fixture(scope='module')
+def vectors():
+    return embeddings(3000)
+
+
+def build(directory, vectors, **options):
+    backend = NumpyBackend(str(directory), **options)
+    backend.upsert([str(i) for i in range(len(vectors))], vectors, [metadata(i) for i in range(len(vectors))])
+    backend.flush()
+    return backend
+
+
+@pytest.mark.parametrize('kind', ['int8', 'pq'])
+def test_quantizer_round_trip(tmp_path, vectors, kind):
+    quantizer = train_quantizer(kind, vectors, subspaces=16)
+    codes = quantizer.encode(vectors)
+    assert codes.dtype == (np.int8 if kind == 'int8' else np.uint8)
+    assert codes.shape == (len(vectors), 64 if kind == 'int8' else 16)
+
+    queries = vectors[:5]
+    approx = quantizer.scores(queries, codes)
+    assert np.abs(approx - queries @ vectors.T).max() < (0.05 if kind == 'int8' else 0.5)
+
+    save_quantizer(quantizer, str(tmp_path))
+    loaded = load_quantizer(str(tmp_path))
+    assert (loaded.kind, loaded.trained_rows) == (kind, len(vectors))
+    np.testing.assert_array_equal(loaded.scores(queries, codes), approx)
+    assert load_quantizer(str(tmp_path / 'missing')) is None
+
+
+def test_unknown_storage(tmp_path):
+    with pytest.raises(ValueError):
+        NumpyBackend(str(tmp_path), storage='float16')
+
+
+@pytest.mark.parametrize('storage', ['int8', 'pq'])
+def test_rerank_returns_exact_results(tmp_path, vectors, storage):
+    backend = build(tmp_path, vectors, storage=storage, rerank_candidates=100, pq_subspaces=16)
+    assert backend._data[4] is not None
+    query = 0.9 * vectors[5] + 0.1 * vectors[7]
+
+    hits = backend.search(query, 5)
+    assert [job_id for job_id, _ in hits] == exact_top(vectors, query, 5)
+    # Scores come from the float32 vectors, not the codes
+    top_id, top_score = hits[0]
+    assert top_score == pytest.approx(float(vectors[top_id] @ (query / np.linalg.norm(query))), abs=1e-5)
+
+    allowed = [i for i in range(len(vectors)) if i % 3 == 1 and i % 10 >= 5]
+    hits = backend.search(query, 5, filters={'locations': ['pune'], 'min_stipend': 5000})
+    assert [job_id for job_id, _ in hits] == exact_top(vectors, query, 5, allowed)
+    candidates = list(range(0, len(vectors), 2))
+    hits = backend.search(query, 5, candidate_ids=candidates)
+    assert [job_id for job_id, _ in hits] == exact_top(vectors, query, 5, candidates)
+
+    many = backend.search_many([vectors[1], vectors[2]], 3)
+    assert [[job_id for job_id, _ in hits] for hits in many] == \
+        [exact_top(vectors, vectors[1], 3), exact_top(vectors, vectors[2], 3)]
+
+
+def test_incremental_updates_reuse_the_quantizer(tmp_path, vectors):
+    vectors = vectors.copy()
+    backend = build(tmp_path, vectors, storage='pq', rerank_candidates=100, pq_subspaces=16)
+    quantizer = backend._data[4][0]
+
+    moved = embeddings(1, seed=9)[0]
+    backend.upsert(['5'], [moved], [metadata(5)])
+    backend.delete(['7'])
+    backend.flush()
+    assert backend._data[4][0].trained_rows == quantizer.trained_rows
+    assert backend.count() == len(vectors) - 1
+    assert backend._data[4][1].shape == (len(vectors) - 1, 16)
+    assert backend.search(moved, 1)[0][0] == 5
+    assert 7 not in [job_id for job_id, _ in backend.search(vectors[7], 10)]
+
+    # Another process picks up the new generation, codes included
+    other = NumpyBackend(str(tmp_path), storage='pq', pq_subspaces=16)
+    assert not other._dirty
+    assert other.search(moved, 1)[0][0] == 5
+
+    # Retrained once the index outgrows the rows the codes were trained on
+    grown = embeddings(len(vectors) * NumpyBackend.RETRAIN_GROWTH, seed=5)
+    start = len(vectors)
+    backend.upsert([str(start + i) for i in range(len(grown))], grown,
+                   [metadata(start + i) for i in range(len(grown))])
+    backend.flush()
+    assert backend._data[4][0].trained_rows == backend.count()
+
+
+def test_switching_storage_mode(tmp_path, vectors):
+    build(tmp_path, vectors)
+    quantized = NumpyBackend(str(tmp_path), storage='int8')
+    # An index built without codes is rewritten with them on the next flush
+    assert quantized._dirty and quantized._data[4] is None
+    quantized.flush()
+    assert quantized._data[4][0].kind == 'int8'
+    generation = os.path.join(str(tmp_path), f'gen-{quantized._generation:06d}')
+    assert 'quantizer.json' in os.listdir(generation)
+
+    plain = NumpyBackend(str(tmp_path))
+    assert plain._data[4] is None and not plain._dirty
+    assert [job_id for job_id, _ in plain.search(vectors[3], 3)] == exact_top(vectors, vectors[3], 3)
+
+
+def test_empty_quantized_index(tmp_path):
+    backend = NumpyBackend(str(tmp_path), storage='pq')
+    assert backend.search(np.ones(64, dtype=np.float32), 3) == []
+    backend.flush()
@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set
+
+from werkzeug.utils import secure_filename
+
+from config import Config
+
+
+class UploadStore:
+    """
+    Optional, asynchronous persistence of uploaded resumes and their parses.
+
+    Requests parse uploads from memory; when persistence is enabled the
+    original file and the parsed JSON are written by a single background
+    thread, so the request path never waits on the disk. Files older than
+    retention_hours are removed at startup and then at most once per
+    purge_interval_seconds, piggybacking on the writer thread, except the
+    paths returned by in_use (e.g. uploads of tasks still waiting to run).
+    """
+
+    def __init__(self, folder: str, enabled: bool = True, retention_hours: float = 24,
+                 purge_interval_seconds: float = 3600):
+        self.folder = folder
+        self.enabled = enabled
+        self.retention_hours = retention_hours
+        self.purge_interval_seconds = purge_interval_seconds
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="upload-store")
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self.in_use: Optional[Callable[[], Set[str]]] = None
+        self._counters = {"saved": 0, "discarded": 0, "purged": 0, "errors": 0}
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self._counters[name] += n
+
+    def new_path(self, filename: str) -> str:
+        """Unique path in the upload folder for a client-supplied file name"""
+        return os.path.join(self.folder, f"{uuid.uuid4().hex}_{secure_filename(filename)}")
+
+    def _write(self, path: str, data: Optional[bytes], parsed: Optional[Dict]):
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            if data is not None:
+                with open(path, "wb") as f:
+                    f.write(data)
+            if parsed is not None:
+                with open(os.path.splitext(path)[0] + ".json", "w", encoding="utf-8") as f:
+                    json.dump(parsed, f, indent=2, ensure_ascii=False)
+            self._count("saved")
+        except Exception as e:
+            self._count("errors")
+            print(f"❌ Error persisting upload {path}: {e}")
+        self._maybe_purge()
+
+    def save(self, filename: str, data: bytes, parsed: Optional[Dict] = None):
+        """Queue an in-memory upload and its parse for writing; no-op when disabled"""
+        if not self.enabled:
+            return
+        self._writer.submit(self._write, self.new_path(filename), data, parsed)
+
+    def save_parsed(self, path: str, parsed: Dict):
+        """Queue the parse of an upload that is already on disk"""
+        self._writer.submit(self._write, path, None, parsed)
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+            self._count("discarded")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self._count("errors")
+            print(f"❌ Error removing upload {path}: {e}")
+
+    def discard(self, path: str):
+        """Queue removal of an on-disk upload that is no longer needed"""
+        self._writer.submit(self._remove, path)
+
+    def finish(self, path: str, parsed: Optional[Dict]):
+        """Keep a processed on-disk upload (with its parse) if persistence is on, else remove it"""
+        if self.enabled and parsed is not None:
+            self.save_parsed(path, parsed)
+        else:
+            self.discard(path)
+
+    def _maybe_purge(self):
+        if time.monotonic() - self._last_purge >= self.purge_interval_seconds:
+            self.purge()
+
+    def purge(self) -> int:
+        """Delete files older than the retention period; returns how many were removed"""
+        self._last_purge = time.monotonic()
+        cutoff = time.time() - self.retention_hours * 3600
+        removed = 0
+        try:
+            entries = list(os.scandir(self.folder))
+        except FileNotFoundError:
+            return 0
+        keep = {os.path.abspath(path) for path in self.in_use()} if self.in_use else set()
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff and os.path.abspath(entry.path) not in keep:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            self._count("purged", removed)
+            print(f"🧹 Removed {removed} uploads older than {self.retention_hours}h")
+        return removed
+
+    def flush(self):
+        """Wait for queued writes (used at shutdown and in tests)"""
+        self._writer.submit(lambda: None).result()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+        return {"enabled": self.enabled, "retention_hours": self.retention_hours, **counters}
+
+
+_upload_store = None
+_upload_store_lock = threading.Lock()
+
+
+def get_upload_store() -> UploadStore:
+    """Process-wide upload store configured from Config"""
+    global _upload_store
+    with _upload_store_lock:
+        if _upload_store is None:
+            _upload_store = UploadStore(
+                Config.UPLOAD_FOLDER,
+                enabled=Config.PERSIST_UPLOADS,
+                retention_hours=Config.UPLOAD_RETENTION_HOURS
+            )
+        return _upload_store
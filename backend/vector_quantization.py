@@ -0,0 +1,195 @@
+"""
+Compact codes for the numpy retrieval backend.
+
+- int8: per-dimension scalar quantization, one byte per dimension (4x smaller)
+- pq: product quantization, one byte per subspace (48 bytes for a
+  384-dimensional vector, 32x smaller)
+
+Both score codes against float32 queries without decoding the matrix, so
+a search scans only the codes. Scores are approximate; NumpyBackend
+re-scores the best candidates exactly against the float32 vectors.
+"""
+import json
+import os
+from typing import Optional
+
+import numpy as np
+
+
+class ScalarQuantizer:
+    """Maps every dimension's [min, max] range onto the 256 values of an int8"""
+
+    kind = "int8"
+
+    # Rows decoded to float32 per matrix product; small enough for the copy
+    # to stay in the CPU cache
+    CHUNK_ROWS = 2048
+
+    def __init__(self, low: np.ndarray, scale: np.ndarray, trained_rows: int):
+        self.low = np.asarray(low, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self.trained_rows = trained_rows
+
+    @property
+    def dim(self) -> int:
+        return len(self.low)
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, **options) -> "ScalarQuantizer":
+        vectors = np.asarray(vectors, dtype=np.float32)
+        low, high = vectors.min(axis=0), vectors.max(axis=0)
+        scale = (high - low) / 255
+        scale[scale == 0] = 1.0
+        return cls(low, scale, len(vectors))
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        levels = np.rint((np.asarray(vectors, dtype=np.float32) - self.low) / self.scale)
+        return (np.clip(levels, 0, 255) - 128).astype(np.int8)
+
+    def scores(self, queries: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Approximate dot products, shape (queries, rows)"""
+        # x ~= low + scale * (code + 128), so q.x = (q * scale).code + q.(low + 128 * scale)
+        weights = queries * self.scale
+        offsets = queries @ (self.low + 128 * self.scale)
+        scores = np.empty((len(queries), len(codes)), dtype=np.float32)
+        for start in range(0, len(codes), self.CHUNK_ROWS):
+            chunk = codes[start:start + self.CHUNK_ROWS].astype(np.float32)
+            scores[:, start:start + len(chunk)] = weights @ chunk.T
+        return scores + offsets[:, None]
+
+    def arrays(self):
+        return {"low": self.low, "scale": self.scale}
+
+
+class ProductQuantizer:
+    """
+    Splits vectors into `subspaces` equal slices and replaces each slice by
+    the nearest of 256 centroids learned with k-means on that slice.
+    """
+
+    kind = "pq"
+
+    CENTROIDS = 256
+    KMEANS_ITERATIONS = 20
+    # Rows k-means is trained on (64 per centroid); more adds build time, not accuracy
+    TRAIN_SAMPLE = 16384
+    CHUNK_ROWS = 65536
+
+    def __init__(self, centroids: np.ndarray, trained_rows: int):
+        # (subspaces, centroids, dims per subspace)
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.trained_rows = trained_rows
+
+    @property
+    def dim(self) -> int:
+        return self.centroids.shape[0] * self.centroids.shape[2]
+
+    @staticmethod
+    def _subspace_count(dim: int, requested: int) -> int:
+        # The largest divisor of dim not above the requested count
+        return max(m for m in range(1, min(requested, dim) + 1) if dim % m == 0)
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, subspaces: int = 48, seed: int = 0, **options) -> "ProductQuantizer":
+        vectors = np.asarray(vectors, dtype=np.float32)
+        trained_rows = len(vectors)
+        rng = np.random.default_rng(seed)
+        if len(vectors) > cls.TRAIN_SAMPLE:
+            vectors = vectors[np.sort(rng.choice(len(vectors), cls.TRAIN_SAMPLE, replace=False))]
+        m = cls._subspace_count(vectors.shape[1], subspaces)
+        k = min(cls.CENTROIDS, len(vectors))
+        slices = vectors.reshape(len(vectors), m, -1)
+        centroids = np.stack([cls._kmeans(np.ascontiguousarray(slices[:, j]), k, rng) for j in range(m)])
+        if k < cls.CENTROIDS:
+            # Pad so codes are always uint8 indexes into 256 centroids
+            padding = np.repeat(centroids[:, :1], cls.CENTROIDS - k, axis=1)
+            centroids = np.concatenate([centroids, padding], axis=1)
+        return cls(centroids, trained_rows)
+
+    @classmethod
+    def _kmeans(cls, points: np.ndarray, k: int, rng) -> np.ndarray:
+        centroids = points[rng.choice(len(points), k, replace=False)].copy()
+        for _ in range(cls.KMEANS_ITERATIONS):
+            assignment = cls._nearest(points, centroids)
+            counts = np.bincount(assignment, minlength=k)
+            sums = np.stack([np.bincount(assignment, weights=points[:, d], minlength=k)
+                             for d in range(points.shape[1])], axis=1)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+            # Empty clusters restart from random points
+            empty = np.flatnonzero(~filled)
+            if len(empty):
+                centroids[empty] = points[rng.choice(len(points), len(empty), replace=False)]
+        return centroids
+
+    @staticmethod
+    def _nearest(points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        # argmin ||p - c||^2 = argmin ||c||^2 - 2 p.c
+        distances = points @ (-2 * centroids.T)
+        distances += (centroids * centroids).sum(axis=1)
+        return distances.argmin(axis=1)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        m = self.centroids.shape[0]
+        codes = np.empty((len(vectors), m), dtype=np.uint8)
+        for start in range(0, len(vectors), self.CHUNK_ROWS):
+            slices = vectors[start:start + self.CHUNK_ROWS].reshape(-1, m, self.centroids.shape[2])
+            for j in range(m):
+                points = np.ascontiguousarray(slices[:, j])
+                codes[start:start + len(slices), j] = self._nearest(points, self.centroids[j])
+        return codes
+
+    def scores(self, queries: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Approximate dot products, shape (queries, rows), from per-query lookup tables"""
+        m = self.centroids.shape[0]
+        # tables[q, j, c] = dot product of query q's slice j with centroid c
+        tables = np.einsum("qjd,jcd->qjc", queries.reshape(len(queries), m, -1), self.centroids)
+        scores = np.empty((len(queries), len(codes)), dtype=np.float32)
+        for start in range(0, len(codes), self.CHUNK_ROWS):
+            # One contiguous column of codes per subspace, gathered for all queries at once
+            chunk = np.ascontiguousarray(codes[start:start + self.CHUNK_ROWS].T)
+            total = scores[:, start:start + chunk.shape[1]]
+            total[:] = 0
+            for j, column in enumerate(chunk):
+                total += np.take(tables[:, j], column, axis=1)
+        return scores
+
+    def arrays(self):
+        return {"centroids": self.centroids}
+
+
+QUANTIZERS = {quantizer.kind: quantizer for quantizer in (ScalarQuantizer, ProductQuantizer)}
+
+
+def train_quantizer(kind: str, vectors: np.ndarray, **options):
+    """A quantizer of the given kind ('int8' or 'pq') fitted to vectors"""
+    if kind not in QUANTIZERS:
+        raise ValueError(f"Unknown vector storage: {kind} (expected float32, {', '.join(QUANTIZERS)})")
+    return QUANTIZERS[kind].train(vectors, **options)
+
+
+def save_quantizer(quantizer, directory: str):
+    """Write quantizer.json and the quantizer's arrays into directory"""
+    for name, arr in quantizer.arrays().items():
+        with open(os.path.join(directory, f"quantizer_{name}.npy"), "wb") as f:
+            np.save(f, arr)
+            f.flush()
+            os.fsync(f.fileno())
+    with open(os.path.join(directory, "quantizer.json"), "w", encoding="utf-8") as f:
+        json.dump({"kind": quantizer.kind, "trained_rows": quantizer.trained_rows}, f)
+
+
+def load_quantizer(directory: str) -> Optional[object]:
+    """The quantizer saved in directory, or None"""
+    try:
+        with open(os.path.join(directory, "quantizer.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        return None
+    cls = QUANTIZERS[meta.pop("kind")]
+    arrays = {
+        entry.name[len("quantizer_"):-len(".npy")]: np.load(entry.path)
+        for entry in os.scandir(directory) if entry.name.startswith("quantizer_") and entry.name.endswith(".npy")
+    }
+    return cls(**arrays, **meta)
@@ -0,0 +1,82 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class WarmUp:
+    """
+    Start-up work that runs in a background thread after the app is created.
+
+    Steps run in order inside an application context; the first failure
+    stops the sequence. status() is what the readiness endpoint reports:
+    the app serves requests while warming up (anything not loaded yet is
+    loaded lazily by the request that needs it), but only reports ready
+    once every step has finished.
+    """
+
+    def __init__(self, app, steps: List[Tuple[str, Callable[[], object]]]):
+        self.app = app
+        self.steps = steps
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._state = "pending"
+        self._step_ms: Dict[str, float] = {}
+        self._current: Optional[str] = None
+        self._error: Optional[str] = None
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    def start(self, background: bool = True):
+        """Run the steps in a background thread, or in the calling thread when background is False"""
+        with self._lock:
+            if self._started_at is not None:
+                return
+            self._state = "running"
+            self._started_at = time.time()
+            if background:
+                self._thread = threading.Thread(target=self.run, name="warm-up", daemon=True)
+                self._thread.start()
+        if not background:
+            self.run()
+
+    def run(self):
+        with self.app.app_context():
+            for name, step in self.steps:
+                with self._lock:
+                    self._current = name
+                started = time.perf_counter()
+                try:
+                    step()
+                except Exception as e:
+                    print(f"❌ Warm-up step {name} failed: {e}")
+                    with self._lock:
+                        self._state, self._error, self._current = "failed", f"{name}: {e}", None
+                        self._finished_at = time.time()
+                    return
+                with self._lock:
+                    self._step_ms[name] = round((time.perf_counter() - started) * 1000, 1)
+        with self._lock:
+            self._state, self._current = "ready", None
+            self._finished_at = time.time()
+        print(f"✅ Warm-up finished: {self._step_ms}")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the warm-up is over; True if it finished successfully"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.ready
+
+    @property
+    def ready(self) -> bool:
+        return self._state == "ready"
+
+    def status(self) -> Dict:
+        with self._lock:
+            finished = self._finished_at or time.time()
+            return {
+                "status": self._state,
+                "current_step": self._current,
+                "steps_ms": dict(self._step_ms),
+                "error": self._error,
+                "elapsed_s": round(finished - self._started_at, 1) if self._started_at else None,
+            }